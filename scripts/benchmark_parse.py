@@ -0,0 +1,461 @@
+"""
+Офлайн-бенчмарк парсингу на збережених HTML-фікстурах (tests/fixtures/<supplier>/)
+
+Проганяє callback'и кожного паука (категорія → товар UA → товар RU) та повний
+SuppliersPipeline без мережі, рахує items/s і час по функціях (callback'и та
+етапи pipeline). Базова лінія зберігається в tests/fixtures/benchmark_baseline.json,
+--compare позначає регресії швидкості та зміни вихідного CSV (селектори/правила маппера).
+Базова лінія знімається на data/ репозиторію (SUPPLIERS_DATA_DIR / SUPPLIERS_ROOT не задані):
+від неї залежать категорії пауків, маппер характеристик і ключові слова.
+Зберігайте й порівнюйте з тим самим --repeat (час — найкращий із прогонів).
+
+Використання:
+  python scripts/benchmark_parse.py                          # всі пауки
+  python scripts/benchmark_parse.py viatec_retail secur_retail
+  python scripts/benchmark_parse.py --repeat 20
+  python scripts/benchmark_parse.py --save-baseline
+  python scripts/benchmark_parse.py --compare [--threshold 0.25]
+  python scripts/benchmark_parse.py --profile                # топ функцій cProfile
+  python scripts/benchmark_parse.py --backend lexbor --compare   # екстрактори на selectolax
+  python scripts/benchmark_parse.py --records                # пам'ять/CPU на item: dict vs ProductRecord
+"""
+import argparse
+import cProfile
+import gc
+import hashlib
+import importlib
+import io
+import json
+import logging
+import os
+import pstats
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+FIXTURES_DIR = PROJECT_ROOT / "tests" / "fixtures"
+BASELINE_PATH = FIXTURES_DIR / "benchmark_baseline.json"
+# Дані, на яких знята базова лінія (категорії, маппінги, ключові слова)
+BASELINE_DATA_DIR = PROJECT_ROOT / "data"
+
+# Мінімальний абсолютний приріст (мс), нижче якого різниця вважається шумом
+NOISE_FLOOR_MS = 0.05
+
+# --records: копій кожного item для заміру пам'яті та мінімум обробок item для заміру CPU
+RECORD_COPIES = 1000
+RECORD_CALLS = 2000
+
+# Сценарії: паук, стартова категорія та фікстура для кожного callback'а
+SCENARIOS = {
+    "viatec_retail": {
+        "spider": "suppliers.spiders.viatec.retail.ViatecRetailSpider",
+        "fixtures_dir": "viatec",
+        "category_url": "https://viatec.ua/catalog/cameras/0:0",
+        "fixtures": {
+            "parse_category": "category.html",
+            "parse_product": "product_ua.html",
+            "parse_product_ru": "product_ru.html",
+        },
+    },
+    "viatec_dealer": {
+        "spider": "suppliers.spiders.viatec.dealer.ViatecDealerSpider",
+        "fixtures_dir": "viatec",
+        "category_url": "https://viatec.ua/catalog/cameras/0:0",
+        "fixtures": {
+            "parse_category": "category.html",
+            "parse_product": "product_ua.html",
+            "parse_product_ru": "product_ru.html",
+        },
+    },
+    "eserver_retail": {
+        "spider": "suppliers.spiders.eserver.retail.EserverRetailSpider",
+        "fixtures_dir": "eserver",
+        "category_url": "https://e-server.com.ua/uk/serverni-shafi/only-inStock",
+        "fixtures": {
+            "parse_category": "category.html",
+            "parse_product": "product_ua.html",
+            "parse_product_ua": "product_ua.html",
+            "parse_product_ru": "product_ru.html",
+        },
+    },
+    "secur_retail": {
+        "spider": "suppliers.spiders.secur.retail.SecurRetailSpider",
+        "fixtures_dir": "secur",
+        "category_url": "https://secur.ua/ajax/startovye-komplekty/status=1",
+        "fixtures": {
+            "parse_category": "category.html",
+            "parse_product_ua": "product_ua.html",
+            "parse_product_ru": "product_ru.html",
+        },
+    },
+    "lun_retail": {
+        "spider": "suppliers.spiders.lun.retail.LunRetailSpider",
+        "fixtures_dir": "lun",
+        "category_url": "https://lun.ua/catalog",
+        "fixtures": {
+            "parse_category": "category.html",
+            "parse_product": "product.html",
+        },
+    },
+    "neolight_retail": {
+        "spider": "suppliers.spiders.neolight.retail.NeolightRetailSpider",
+        "fixtures_dir": "neolight",
+        "category_url": "https://neolight.com.ua/catalog",
+        "fixtures": {
+            "parse_category": "category.html",
+            "parse_product": "product.html",
+        },
+    },
+}
+
+
+class ErrorCounter(logging.Handler):
+    """Рахує ERROR-записи лога (пауки ловлять винятки та пишуть їх у лог)"""
+
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+
+
+def _load_spider_class(path):
+    module_name, class_name = path.rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _read_fixture(scenario, name, cache):
+    key = (scenario["fixtures_dir"], name)
+    if key not in cache:
+        cache[key] = (FIXTURES_DIR / scenario["fixtures_dir"] / name).read_bytes()
+    return cache[key]
+
+
+def _fixture_for(scenario, request):
+    """Фікстура для запиту: за іменем callback'а; сторінки пагінації > 1 — порожня категорія"""
+    callback_name = getattr(request.callback, "__name__", "parse")
+    if callback_name == "parse_category" and request.meta.get("page_number", 1) > 1:
+        empty = FIXTURES_DIR / scenario["fixtures_dir"] / "category_empty.html"
+        return "category_empty.html" if empty.exists() else None
+    return scenario["fixtures"].get(callback_name)
+
+
+def run_scenario(name, scenario, max_requests=500, backend="lxml", captured=None):
+    """Один прогін сценарію: паук + SuppliersPipeline на фікстурах; captured — список для копій items паука"""
+    from scrapy import Request
+    from scrapy.exceptions import DropItem
+    from scrapy.http import HtmlResponse
+    from itemadapter import is_item
+    from suppliers.metrics import CallbackTimingMiddleware, get_stage_timer
+    from suppliers.pipelines import SuppliersPipeline
+
+    spider = _load_spider_class(scenario["spider"])()
+    if spider.extractor_class is not None:
+        # Без crawler немає settings — бекенд (EXTRACTOR_BACKEND) задаємо напряму
+        spider._extractor = spider.extractor_class(backend)
+    timer = get_stage_timer(spider)
+    timing_mw = CallbackTimingMiddleware()
+
+    pipeline = SuppliersPipeline()
+    output_dir = Path(tempfile.mkdtemp(prefix=f"bench_{name}_"))
+    pipeline.output_dir = output_dir
+    pipeline.data_dir = BASELINE_DATA_DIR
+    pipeline.open_spider(spider)
+
+    fixtures_cache = {}
+    queue = deque([
+        Request(
+            url=scenario["category_url"],
+            callback=spider.parse_category,
+            meta={"category_url": scenario["category_url"], "category_index": 0, "page_number": 1},
+            dont_filter=True,
+        )
+    ])
+    result = {"requests": 0, "items": 0, "dropped": 0, "unrouted": 0}
+
+    started = time.perf_counter()
+    while queue and result["requests"] < max_requests:
+        request = queue.popleft()
+        fixture = _fixture_for(scenario, request)
+        if fixture is None:
+            result["unrouted"] += 1
+            continue
+
+        result["requests"] += 1
+        response = HtmlResponse(
+            url=request.url,
+            body=_read_fixture(scenario, fixture, fixtures_cache),
+            encoding="utf-8",
+            request=request,
+        )
+        callback_output = request.callback(response) or ()
+        for output in timing_mw.process_spider_output(response, callback_output, spider):
+            if isinstance(output, Request):
+                queue.append(output)
+            elif is_item(output):
+                if captured is not None:
+                    captured.append(output.copy())
+                try:
+                    with timer.measure("pipeline:total"):
+                        pipeline.process_item(output, spider)
+                    result["items"] += 1
+                except DropItem:
+                    result["dropped"] += 1
+    elapsed = time.perf_counter() - started
+    pipeline.close_spider(spider)
+
+    output_file = output_dir / getattr(spider, "output_filename", f"{spider.name}.csv")
+    digest = hashlib.sha256(output_file.read_bytes()).hexdigest() if output_file.exists() else ""
+
+    result["elapsed_s"] = elapsed
+    result["output_sha256"] = digest
+    result["stages"] = timer.report()
+    return result
+
+
+def benchmark(names, repeat, backend="lxml"):
+    """Проганяє сценарії repeat разів; час — найкращий прогін, етапи — середнє по всіх"""
+    report = {}
+    for name in names:
+        scenario = SCENARIOS[name]
+        errors = ErrorCounter()
+        logging.getLogger().addHandler(errors)
+        runs = [run_scenario(name, scenario, backend=backend) for _ in range(repeat)]
+        logging.getLogger().removeHandler(errors)
+
+        best = min(runs, key=lambda r: r["elapsed_s"])
+        stages = {}
+        for run in runs:
+            for stage, data in run["stages"].items():
+                entry = stages.setdefault(stage, {"calls": 0, "total_s": 0.0})
+                entry["calls"] += data["calls"]
+                entry["total_s"] += data["total_s"]
+
+        report[name] = {
+            "requests": best["requests"],
+            "items": best["items"],
+            "dropped": best["dropped"],
+            "errors_logged": errors.count // repeat,
+            "best_elapsed_s": round(best["elapsed_s"], 5),
+            "items_per_s": round(best["items"] / best["elapsed_s"], 1) if best["elapsed_s"] else 0.0,
+            "output_sha256": best["output_sha256"],
+            "stages": {
+                stage: {
+                    "calls_per_run": data["calls"] // repeat,
+                    "avg_ms": round(data["total_s"] / data["calls"] * 1000, 4) if data["calls"] else 0.0,
+                }
+                for stage, data in sorted(stages.items())
+            },
+        }
+    return report
+
+
+def _allocated_bytes(build):
+    """Байти, що лишаються зайнятими після build() (tracemalloc)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        kept = build()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+
+def _clean_and_write_us(pipeline, items, as_adapter):
+    """Середній час (мкс) очищення item та формування рядка CSV у SuppliersPipeline"""
+    rounds = max(1, RECORD_CALLS // len(items))
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for item in items:
+            cleaned = pipeline._clean_item(as_adapter(item), None)
+            pipeline._write_row("records.csv", cleaned, item.get("specifications_list") or [])
+    return (time.perf_counter() - started) / (rounds * len(items)) * 1e6
+
+
+def compare_records(names, backend="lxml"):
+    """Пам'ять і CPU на item: ті самі items паука як dict і як ProductRecord"""
+    from itemadapter import ItemAdapter
+    from suppliers.items import ProductRecord
+    from suppliers.pipelines import SuppliersPipeline
+
+    report = {}
+    for name in names:
+        records = []
+        run_scenario(name, SCENARIOS[name], backend=backend, captured=records)
+        records = [item if isinstance(item, ProductRecord) else ProductRecord(item) for item in records]
+        if not records:
+            continue
+        dicts = [dict(record) for record in records]
+
+        pipeline = SuppliersPipeline()
+        pipeline.files = {"records.csv": io.StringIO()}
+        copies = RECORD_COPIES * len(records)
+        cleaned = [pipeline._clean_item(record, None) for record in records]
+
+        # Копії ділять рядки-значення з оригіналом, тож заміряється лише сам контейнер item
+        report[name] = {
+            "items": len(records),
+            "dict": {
+                "item_bytes": round(_allocated_bytes(
+                    lambda: [dict(item) for _ in range(RECORD_COPIES) for item in dicts]) / copies),
+                "cleaned_bytes": round(_allocated_bytes(
+                    lambda: [dict(item) for _ in range(RECORD_COPIES) for item in cleaned]) / copies),
+                "clean_write_us": round(_clean_and_write_us(pipeline, dicts, ItemAdapter), 2),
+            },
+            "ProductRecord": {
+                "item_bytes": round(_allocated_bytes(
+                    lambda: [item.copy() for _ in range(RECORD_COPIES) for item in records]) / copies),
+                "cleaned_bytes": round(_allocated_bytes(
+                    lambda: [item.copy() for _ in range(RECORD_COPIES) for item in cleaned]) / copies),
+                "clean_write_us": round(_clean_and_write_us(pipeline, records, lambda item: item), 2),
+            },
+        }
+    return report
+
+
+def print_records_report(report):
+    print("\n" + "=" * 80)
+    print("📦 ПАМ'ЯТЬ І CPU НА ITEM: dict vs ProductRecord")
+    print("=" * 80)
+    for name, data in report.items():
+        print(f"\n🕷️  {name}: {data['items']} items")
+        for kind in ("dict", "ProductRecord"):
+            row = data[kind]
+            print(f"   {kind:<14} item {row['item_bytes']:>6} Б   очищений {row['cleaned_bytes']:>6} Б   "
+                  f"очищення + рядок CSV {row['clean_write_us']:>8.2f} мкс")
+    print("\n" + "=" * 80)
+
+
+def print_report(report):
+    print("\n" + "=" * 80)
+    print("📊 ОФЛАЙН-БЕНЧМАРК ПАРСИНГУ")
+    print("=" * 80)
+    for name, data in report.items():
+        print(f"\n🕷️  {name}: {data['items']} items / {data['requests']} запитів "
+              f"за {data['best_elapsed_s'] * 1000:.1f} мс → {data['items_per_s']} items/s "
+              f"(відкинуто: {data['dropped']}, помилок у лозі: {data['errors_logged']})")
+        for stage, stage_data in data["stages"].items():
+            print(f"   {stage:<36} {stage_data['avg_ms']:>10.4f} мс × {stage_data['calls_per_run']}")
+    print("\n" + "=" * 80)
+
+
+def compare(report, baseline, threshold):
+    """Повертає список регресій відносно базової лінії"""
+    problems = []
+    for name, data in report.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+
+        if data["output_sha256"] != base["output_sha256"]:
+            problems.append(f"{name}: вихідний CSV змінився (селектори або правила маппера)")
+        if data["items"] != base["items"]:
+            problems.append(f"{name}: кількість items {base['items']} → {data['items']}")
+        if data["errors_logged"] > base["errors_logged"]:
+            problems.append(f"{name}: помилок у лозі {base['errors_logged']} → {data['errors_logged']}")
+
+        if base["items_per_s"] and data["items_per_s"] < base["items_per_s"] * (1 - threshold):
+            problems.append(f"{name}: items/s {base['items_per_s']} → {data['items_per_s']}")
+
+        for stage, stage_data in data["stages"].items():
+            base_stage = base["stages"].get(stage)
+            if not base_stage:
+                continue
+            before, after = base_stage["avg_ms"], stage_data["avg_ms"]
+            if after - before > NOISE_FLOOR_MS and after > before * (1 + threshold):
+                problems.append(f"{name}: {stage} {before:.4f} → {after:.4f} мс")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Офлайн-бенчмарк парсингу на HTML-фікстурах")
+    parser.add_argument("spiders", nargs="*", help="Імена пауків (за замовчуванням — всі)")
+    parser.add_argument("--repeat", type=int, default=5, help="Кількість прогонів кожного сценарію")
+    parser.add_argument("--save-baseline", action="store_true", help="Зберегти результат як базову лінію")
+    parser.add_argument("--compare", action="store_true", help="Порівняти з базовою лінією")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Допустиме сповільнення (частка)")
+    parser.add_argument("--profile", action="store_true", help="Показати топ функцій за cProfile")
+    parser.add_argument("--verbose", action="store_true", help="Логи пауків рівня INFO")
+    parser.add_argument("--backend", default="lxml", choices=["lxml", "lexbor"],
+                        help="HTML-бекенд екстракторів (EXTRACTOR_BACKEND)")
+    parser.add_argument("--records", action="store_true",
+                        help="Порівняти пам'ять і CPU на item: dict vs ProductRecord")
+    args = parser.parse_args()
+
+    names = args.spiders or list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        print(f"❌ Невідомі пауки: {', '.join(unknown)}. Доступні: {', '.join(SCENARIOS)}")
+        sys.exit(2)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(asctime)s [%(name)s] %(levelname)s: %(message)s")
+    warnings_filter = os.environ.get("PYTHONWARNINGS")
+    if not warnings_filter:
+        import warnings
+        warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+    # Дилерський паук вимагає облікові дані при створенні — для офлайн-прогону достатньо заглушок
+    os.environ.setdefault("VIATEC_EMAIL", "benchmark@example.com")
+    os.environ.setdefault("VIATEC_PASSWORD", "benchmark")
+
+    if args.records:
+        print_records_report(compare_records(names, args.backend))
+        return
+
+    if args.compare or args.save_baseline:
+        from suppliers.paths import DATA_DIR
+        if DATA_DIR.resolve() != BASELINE_DATA_DIR.resolve():
+            print(f"⚠️ Дані з {DATA_DIR}, а базова лінія — на {BASELINE_DATA_DIR}: "
+                  f"кількість запитів, час і CSV не порівнювані (приберіть SUPPLIERS_DATA_DIR / SUPPLIERS_ROOT)")
+
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        report = benchmark(names, args.repeat, args.backend)
+        profiler.disable()
+    else:
+        report = benchmark(names, args.repeat, args.backend)
+
+    print_report(report)
+
+    if args.profile:
+        print("\n🔬 ТОП-25 функцій (cumulative):")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(r"suppliers|keywords", 25)
+
+    if args.save_baseline:
+        baseline = {}
+        if BASELINE_PATH.exists():
+            baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+        baseline.update(report)
+        BASELINE_PATH.write_text(json.dumps(baseline, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"💾 Базову лінію збережено: {BASELINE_PATH}")
+
+    if args.compare:
+        if not BASELINE_PATH.exists():
+            print(f"❌ Базова лінія не знайдена: {BASELINE_PATH} (запустіть з --save-baseline)")
+            sys.exit(2)
+        baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+        problems = compare(report, baseline, args.threshold)
+        if problems:
+            print("\n⚠️ РЕГРЕСІЇ ВІДНОСНО БАЗОВОЇ ЛІНІЇ:")
+            for problem in problems:
+                print(f"  - {problem}")
+            sys.exit(1)
+        print("\n✅ Регресій відносно базової лінії не знайдено")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Порівняння звітів метрик двох прогонів (<spider>_metrics.json, suppliers/metrics.py)
+
+Напр. HTTP/2 проти більшої конкурентності на домен:
+  python scripts/ultra_clean_run.py viatec_retail -s HTTP2_ENABLED=1 -s METRICS_OUTPUT_DIR=output/metrics_h2
+  python scripts/ultra_clean_run.py viatec_retail -s CONCURRENT_REQUESTS_PER_DOMAIN=8 -s METRICS_OUTPUT_DIR=output/metrics_c8
+  python scripts/compare_metrics.py output/metrics_h2/viatec_retail_metrics.json output/metrics_c8/viatec_retail_metrics.json
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def summary(report):
+    """Основні показники прогону + з'єднання по доменах"""
+    rows = {
+        "engine": report.get("engine", "scrapy"),
+        "responses_per_s": report.get("responses_per_s"),
+        "items_per_s": report.get("items_per_s"),
+        "elapsed_s": report.get("elapsed_s"),
+        "cpu_ms_per_item": report.get("cpu_ms_per_item"),
+        "responses": report.get("responses"),
+    }
+    for host, domain in report.get("domains", {}).items():
+        rows[f"{host}: avg latency s"] = domain.get("download_latency", {}).get("avg_s")
+        connections = domain.get("connections")
+        if connections:
+            rows[f"{host}: connections"] = connections["opened"]
+            rows[f"{host}: responses/connection"] = connections["responses_per_connection"]
+            rows[f"{host}: protocols"] = ", ".join(f"{k}={v}" for k, v in connections["protocols"].items())
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Порівняння звітів метрик двох прогонів")
+    parser.add_argument("first", type=Path)
+    parser.add_argument("second", type=Path)
+    args = parser.parse_args()
+
+    first, second = summary(load(args.first)), summary(load(args.second))
+    width = max(len(key) for key in {**first, **second})
+    print(f"{'':<{width}}  {args.first.parent.name or args.first.name:>20}  {args.second.parent.name or args.second.name:>20}")
+    for key in {**first, **second}:
+        a, b = first.get(key, "—"), second.get(key, "—")
+        change = ""
+        if isinstance(a, (int, float)) and isinstance(b, (int, float)) and a:
+            change = f"  {(b - a) / a:+.1%}"
+        print(f"{key:<{width}}  {a!s:>20}  {b!s:>20}{change}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Нічний прогін кількох постачальників у спільному бюджеті часу (вікно перед імпортом у PROM)
+
+Постачальники запускаються по черзі (scripts/ultra_clean_run.py --deadline); кожен отримує
+частку залишку бюджету, пропорційну тривалості його минулого прогону
+(<METRICS_OUTPUT_DIR>/<spider>_metrics.json, elapsed_s), невикористаний час переходить
+наступним. Всередині прогону бюджет ділиться між категоріями (suppliers/deadline.py).
+
+Використання:
+  python scripts/nightly_run.py --deadline 45m viatec_retail viatec_dealer eserver_retail
+  python scripts/nightly_run.py --deadline 2h viatec_combined secur_retail -s DOWNLOAD_DELAY=1   (аргументи → кожен паук)
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+os.environ['SCRAPY_SETTINGS_MODULE'] = 'suppliers.settings'
+
+from suppliers.deadline import format_duration, parse_duration
+from suppliers.paths import OUTPUT_DIR
+
+# Менше — постачальник пропускається (не встигне навіть пагінацію)
+MIN_SUPPLIER_SECONDS = 60
+
+
+def previous_elapsed(spider_name):
+    """Тривалість минулого прогону паука з його звіту метрик (None якщо звіту немає)"""
+    from scrapy.utils.project import get_project_settings
+
+    metrics_dir = Path(get_project_settings().get("METRICS_OUTPUT_DIR", OUTPUT_DIR))
+    try:
+        with open(metrics_dir / f"{spider_name}_metrics.json", encoding="utf-8") as f:
+            return json.load(f).get("elapsed_s") or None
+    except (OSError, ValueError):
+        return None
+
+
+def supplier_weights(spiders):
+    """Вага постачальника — тривалість минулого прогону; без звіту — середня серед відомих"""
+    elapsed = {spider: previous_elapsed(spider) for spider in spiders}
+    known = [value for value in elapsed.values() if value]
+    default = sum(known) / len(known) if known else 1.0
+    return {spider: value or default for spider, value in elapsed.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нічний прогін постачальників у спільному бюджеті часу")
+    parser.add_argument("spiders", nargs="+", help="Пауки по черзі (viatec_retail eserver_retail ...)")
+    parser.add_argument("--deadline", required=True, help="Бюджет на всіх: 45m, 1h30m, 2700")
+    args, extra_args = parser.parse_known_args()
+
+    budget = parse_duration(args.deadline)
+    deadline = time.monotonic() + budget
+    weights = supplier_weights(args.spiders)
+
+    print("\n" + "=" * 80)
+    print(f"🌙 НІЧНИЙ ПРОГІН: {', '.join(args.spiders)} — бюджет {format_duration(budget)}")
+    print("=" * 80 + "\n")
+
+    results = {}
+    for position, spider_name in enumerate(args.spiders):
+        remaining = deadline - time.monotonic()
+        left = args.spiders[position:]
+        share = remaining * weights[spider_name] / sum(weights[spider] for spider in left)
+        if share < MIN_SUPPLIER_SECONDS:
+            print(f"⏰ {spider_name}: пропущено — частка бюджету {format_duration(share)}")
+            results[spider_name] = "skipped"
+            continue
+
+        print(f"⏰ {spider_name}: бюджет {format_duration(share)} (залишок {format_duration(remaining)})")
+        command = [
+            sys.executable, str(PROJECT_ROOT / "scripts" / "ultra_clean_run.py"), spider_name,
+            "--deadline", f"{int(share)}s", *extra_args,
+        ]
+        started = time.monotonic()
+        code = subprocess.run(command, cwd=str(PROJECT_ROOT)).returncode
+        results[spider_name] = "ok" if code == 0 else f"exit {code}"
+        print(f"{'✅' if code == 0 else '❌'} {spider_name}: {format_duration(time.monotonic() - started)}")
+
+    print("\n" + "=" * 80)
+    for spider_name, result in results.items():
+        print(f"  {spider_name}: {result}")
+    print(f"🌙 Залишок бюджету: {format_duration(deadline - time.monotonic())}")
+    print("=" * 80 + "\n")
+    return 0 if all(result == "ok" for result in results.values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""
+План прогону (dry-run): оцінка запитів, обсягу та часу по постачальниках без мережі
+
+Джерела оцінки:
+- категорії паука (data/<supplier>/*_category_*.csv — як у самого паука)
+- товари по категоріях з минулих прогонів (SEEN_STORE_PATH); категорії без історії —
+  середнє по відомих (або --products-per-category)
+- запитів на товар (з пагінацією), середній розмір сторінки та затримка відповіді —
+  з останнього звіту метрик <METRICS_OUTPUT_DIR>/<spider>_metrics.json
+- конкурентність: PRODUCT_LANES паралельних ланцюгів, DOWNLOAD_DELAY на домен
+  (налаштування проекту + custom_settings паука + -s NAME=VALUE)
+
+Економія режимів: кеш контенту (друга мовна сторінка, CONTENT_CACHE_PATH),
+інкрементальний -a skip_seen_hours=N (товари, завантажені за останні N годин),
+очікувана кількість змінених товарів за частотою змін (VOLATILITY_STORE_PATH).
+
+Використання:
+  python scripts/plan_crawl.py                                   # всі пауки
+  python scripts/plan_crawl.py viatec_retail viatec_dealer --seen-hours 24
+  python scripts/plan_crawl.py eserver_retail -s PRODUCT_LANES=4 -s DOWNLOAD_DELAY=0.5
+  python scripts/plan_crawl.py --json > output/plan.json
+"""
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+os.environ['SCRAPY_SETTINGS_MODULE'] = 'suppliers.settings'
+
+from suppliers.deadline import format_duration
+from suppliers.paths import OUTPUT_DIR
+
+
+# Без звіту метрик: запитів на товар (дві мовні сторінки + частка пагінації),
+# розмір сторінки та затримка відповіді
+DEFAULT_REQUESTS_PER_PRODUCT = 2.2
+DEFAULT_PAGE_BYTES = 150_000
+DEFAULT_LATENCY_S = 0.8
+
+
+def load_metrics(settings, spider_name):
+    path = Path(settings.get("METRICS_OUTPUT_DIR", OUTPUT_DIR)) / f"{spider_name}_metrics.json"
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def page_profile(metrics):
+    """(запитів на товар, байт на сторінку, затримка с, джерело)"""
+    if not metrics or not metrics.get("responses"):
+        return DEFAULT_REQUESTS_PER_PRODUCT, DEFAULT_PAGE_BYTES, DEFAULT_LATENCY_S, "за замовчуванням"
+    products = (metrics.get("items_scraped") or 0) + (metrics.get("items_dropped") or 0)
+    responses = metrics["responses"]
+    latencies = [
+        domain["download_latency"]["avg_s"]
+        for domain in metrics.get("domains", {}).values()
+        if domain.get("download_latency", {}).get("avg_s") is not None
+    ]
+    return (
+        responses / products if products else DEFAULT_REQUESTS_PER_PRODUCT,
+        metrics.get("bytes", 0) / responses or DEFAULT_PAGE_BYTES,
+        sum(latencies) / len(latencies) if latencies else DEFAULT_LATENCY_S,
+        f"метрики {metrics.get('finished_at', '')}".strip(),
+    )
+
+
+def open_store(path, query, params):
+    """Рядки з SQLite-сховища (порожньо, якщо сховища ще немає)"""
+    if not Path(path).exists():
+        return []
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return connection.execute(query, params).fetchall()
+    except sqlite3.Error:
+        return []
+    finally:
+        connection.close()
+
+
+def category_history(settings, spider_name):
+    """category_url → кількість товарів з SeenStore та час останнього завантаження по відбитку"""
+    namespace = settings.get("SEEN_NAMESPACE") or spider_name
+    rows = open_store(
+        settings.get("SEEN_STORE_PATH", OUTPUT_DIR / "seen_products.sqlite"),
+        "SELECT category_url, seen_at FROM seen WHERE namespace = ?", (namespace,),
+    )
+    counts = {}
+    for category_url, _seen_at in rows:
+        counts[category_url] = counts.get(category_url, 0) + 1
+    return counts, [seen_at for _category_url, seen_at in rows]
+
+
+def cached_content_products(settings, supplier_id):
+    """Артикули з контентом обох мов у кеші контенту постачальника"""
+    rows = open_store(
+        settings.get("CONTENT_CACHE_PATH", OUTPUT_DIR / "content_cache.sqlite"),
+        "SELECT COUNT(*) FROM (SELECT sku FROM content WHERE supplier = ? GROUP BY sku HAVING COUNT(*) > 1)",
+        (supplier_id,),
+    )
+    return rows[0][0] if rows else 0
+
+
+def expected_changes(settings, spider_name):
+    """Очікувана кількість змінених товарів (сума рангів частоти змін)"""
+    if not settings.getbool("VOLATILITY_ENABLED", True):
+        return None
+    path = settings.get("VOLATILITY_STORE_PATH", OUTPUT_DIR / "volatility.sqlite")
+    if not Path(path).exists():
+        return None
+    from suppliers.volatility import VolatilityStore
+
+    store = VolatilityStore(path, spider_name)
+    try:
+        products, _categories = store.rates()
+    finally:
+        store.close()
+    return round(sum(products.values())) if products else None
+
+
+def crawl_time(requests, latency, settings):
+    """Ланцюги товарів послідовні: час = запити × затримка / ланцюги, не менше запити × DOWNLOAD_DELAY"""
+    lanes = max(1, settings.getint("PRODUCT_LANES", 1))
+    concurrency = max(
+        settings.getint("CONCURRENT_REQUESTS_PER_DOMAIN", 1),
+        settings.getint("ADAPTIVE_THROTTLE_MAX_CONCURRENCY", 0) if settings.getbool("ADAPTIVE_THROTTLE_ENABLED", True) else 0,
+    )
+    parallel = max(1, min(lanes, concurrency))
+    return max(requests * latency / parallel, requests * settings.getfloat("DOWNLOAD_DELAY", 0))
+
+
+def plan_spider(spider_name, overrides, seen_hours, default_products):
+    from suppliers.engine import load_settings
+
+    spider_cls, settings = load_settings(spider_name, overrides)
+    spider = spider_cls()
+    categories = list(spider.category_urls)
+
+    counts, seen_times = category_history(settings, spider_name)
+    known = [counts[url] for url in categories if url in counts]
+    fallback = default_products or (sum(known) / len(known) if known else 30)
+    products = round(sum(counts.get(url, fallback) for url in categories))
+
+    requests_per_product, page_bytes, latency, source = page_profile(load_metrics(settings, spider_name))
+    requests = round(products * requests_per_product)
+
+    plan = {
+        "spider": spider_name,
+        "categories": len(categories),
+        "categories_with_history": len(known),
+        "products": products,
+        "requests": requests,
+        "mb": round(requests * page_bytes / 1048576, 1),
+        "time_s": round(crawl_time(requests, latency, settings)),
+        "profile": {
+            "requests_per_product": round(requests_per_product, 2),
+            "page_kb": round(page_bytes / 1024, 1),
+            "latency_s": round(latency, 3),
+            "product_lanes": settings.getint("PRODUCT_LANES", 1),
+            "download_delay_s": settings.getfloat("DOWNLOAD_DELAY", 0),
+            "source": source,
+        },
+        "savings": {},
+    }
+
+    # Кеш контенту: друга мовна сторінка не завантажується для незмінених товарів
+    supplier_id = getattr(spider, "supplier_id", "")
+    if settings.getbool("CONTENT_CACHE_ENABLED", True) and supplier_id:
+        cached = min(products, cached_content_products(settings, supplier_id))
+        if cached:
+            plan["savings"]["content_cache"] = cached
+
+    # Інкрементальний режим: товари, завантажені за останні seen_hours годин
+    if seen_hours:
+        since = time.time() - seen_hours * 3600
+        recent = min(products, sum(1 for seen_at in seen_times if seen_at >= since))
+        if recent:
+            plan["savings"][f"skip_seen_hours={seen_hours:g}"] = round(recent * requests_per_product)
+
+    for mode, saved in list(plan["savings"].items()):
+        plan["savings"][mode] = {
+            "requests": saved,
+            "time_s": round(crawl_time(saved, latency, settings)),
+        }
+
+    changes = expected_changes(settings, spider_name)
+    if changes is not None:
+        plan["expected_changed_products"] = changes
+    return plan
+
+
+def print_table(plans):
+    header = f"{'Паук':<18} {'Кат.':>5} {'Товарів':>8} {'Запитів':>8} {'МБ':>8} {'Час':>12}  Профіль"
+    print(header)
+    print("-" * len(header))
+    for plan in plans:
+        if "error" in plan:
+            print(f"{plan['spider']:<18} ❌ {plan['error']}")
+            continue
+        profile = plan["profile"]
+        print(
+            f"{plan['spider']:<18} {plan['categories']:>5} {plan['products']:>8} {plan['requests']:>8} "
+            f"{plan['mb']:>8} {format_duration(plan['time_s']):>12}  "
+            f"{profile['requests_per_product']} запит./товар, {profile['page_kb']} КБ, {profile['latency_s']} с, "
+            f"ланцюгів {profile['product_lanes']}, delay {profile['download_delay_s']:g} ({profile['source']})"
+        )
+        for mode, saved in plan["savings"].items():
+            print(f"{'':<18} {'':>5} {'':>8} {-saved['requests']:>8} {'':>8} {'-' + format_duration(saved['time_s']):>12}  {mode}")
+        if plan["categories_with_history"] < plan["categories"]:
+            print(f"{'':<18} ⚠️ товарів без історії: {plan['categories'] - plan['categories_with_history']} категорій (оцінка)")
+        if "expected_changed_products" in plan:
+            print(f"{'':<18} 📈 очікувано змінених товарів: {plan['expected_changed_products']}")
+
+    valid = [plan for plan in plans if "error" not in plan]
+    print("-" * len(header))
+    print(
+        f"{'Разом':<18} {sum(p['categories'] for p in valid):>5} {sum(p['products'] for p in valid):>8} "
+        f"{sum(p['requests'] for p in valid):>8} {round(sum(p['mb'] for p in valid), 1):>8} "
+        f"{format_duration(sum(p['time_s'] for p in valid)):>12}  (постачальники по черзі, scripts/nightly_run.py)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Оцінка запитів, обсягу та часу прогону без мережі")
+    parser.add_argument("spiders", nargs="*", help="Пауки (за замовчуванням — всі)")
+    parser.add_argument("-s", dest="settings", action="append", default=[], metavar="NAME=VALUE",
+                        help="Налаштування, як у scrapy crawl")
+    parser.add_argument("--seen-hours", type=float, default=24, help="Оцінка економії -a skip_seen_hours=N (0 — не показувати)")
+    parser.add_argument("--products-per-category", type=float, default=0, help="Товарів у категорії без історії")
+    parser.add_argument("--json", action="store_true", help="JSON замість таблиці")
+    args = parser.parse_args()
+
+    # Пауки створюються лише для читання категорій: без логіну та мережі
+    os.environ.setdefault("VIATEC_EMAIL", "plan@example.com")
+    os.environ.setdefault("VIATEC_PASSWORD", "plan")
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s: %(message)s")
+
+    overrides = dict(pair.split("=", 1) for pair in args.settings)
+    spiders = args.spiders
+    if not spiders:
+        from scrapy.spiderloader import SpiderLoader
+        from scrapy.utils.project import get_project_settings
+        spiders = sorted(SpiderLoader.from_settings(get_project_settings()).list())
+
+    plans = []
+    for spider_name in spiders:
+        try:
+            plans.append(plan_spider(spider_name, overrides, args.seen_hours, args.products_per_category))
+        except Exception as e:
+            plans.append({"spider": spider_name, "error": str(e)})
+
+    if args.json:
+        print(json.dumps(plans, ensure_ascii=False, indent=2))
+    else:
+        print_table(plans)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Шардований прогін постачальника: N воркерів (процесів) паралельно, далі злиття CSV
+
+Кожен воркер — звичайний scrapy crawl з -a shard=i/N -a run_id=<спільний id>:
+бере свою частину категорій, товари з кількох шардів завантажує лише один
+(SHARD_STORE, suppliers/sharding.py), пише <spider>.shard<i>of<N>.csv.
+Коди товарів видає спільний лічильник (PRODUCT_CODES_PATH) — без колізій.
+
+Використання:
+  python scripts/shard_run.py viatec_retail --shards 4
+  python scripts/shard_run.py viatec_retail --shards 4 -s DOWNLOAD_DELAY=1   (аргументи → scrapy crawl)
+
+Кілька машин (спільний SHARD_STORE=redis://... та однаковий --run-id):
+  машина A: python scripts/shard_run.py viatec_retail --shards 4 --shard 0 --run-id 20260101 -s SHARD_STORE=redis://host:6379/0
+  машина B: python scripts/shard_run.py viatec_retail --shards 4 --shard 1 --run-id 20260101 -s SHARD_STORE=redis://host:6379/0
+  ...
+  після копіювання файлів шардів в один output/:
+            python scripts/shard_run.py viatec_retail --shards 4 --merge
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+os.environ['SCRAPY_SETTINGS_MODULE'] = 'suppliers.settings'
+
+from suppliers.paths import OUTPUT_DIR
+from suppliers.sharding import merge_shards
+
+
+def spider_output_files(spider_name):
+    """Вихідні файли паука (як SuppliersPipeline._output_files, але без створення паука)"""
+    from scrapy.spiderloader import SpiderLoader
+    from scrapy.utils.project import get_project_settings
+
+    spider_cls = SpiderLoader.from_settings(get_project_settings()).load(spider_name)
+    return list(getattr(spider_cls, "output_filenames", None) or [getattr(spider_cls, "output_filename", None) or f"{spider_name}.csv"])
+
+
+def run_workers(spider_name, shards, count, run_id, extra_args):
+    """Запускає воркери паралельно; True якщо всі завершились успішно"""
+    worker_script = PROJECT_ROOT / "scripts" / "ultra_clean_run.py"
+    workers = []
+    for index in shards:
+        command = [
+            sys.executable, str(worker_script), spider_name, "--no-transform",
+            "-a", f"shard={index}/{count}", "-a", f"run_id={run_id}", *extra_args,
+        ]
+        print(f"🧩 Шард {index + 1}/{count}: {' '.join(command[2:])}")
+        workers.append((index, subprocess.Popen(command, cwd=str(PROJECT_ROOT))))
+
+    failed = []
+    for index, process in workers:
+        if process.wait() != 0:
+            failed.append(index)
+
+    if failed:
+        print(f"❌ Шарди з помилками: {', '.join(str(i) for i in failed)} "
+              f"(продовження: той самий --run-id та -a resume=1)")
+        return False
+    return True
+
+
+def merge(spider_name, count):
+    for filename in spider_output_files(spider_name):
+        rows, duplicates = merge_shards(OUTPUT_DIR, filename, count)
+        print(f"✅ {OUTPUT_DIR / filename}: {rows} товарів з {count} шардів (дублікатів пропущено: {duplicates})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Шардований прогін паука та злиття CSV")
+    parser.add_argument("spider", help="Ім'я паука (viatec_retail, viatec_combined, ...)")
+    parser.add_argument("--shards", type=int, required=True, help="Кількість шардів N")
+    parser.add_argument("--shard", type=int, action="append", help="Запустити лише шард(и) i (інші — на інших машинах)")
+    parser.add_argument("--run-id", default="", help="Спільний id прогону для всіх шардів (за замовчуванням — час запуску)")
+    parser.add_argument("--merge", action="store_true", help="Лише злити файли шардів")
+    args, extra_args = parser.parse_known_args()
+
+    if args.shards < 1:
+        parser.error("--shards має бути >= 1")
+
+    if args.merge:
+        merge(args.spider, args.shards)
+        return 0
+
+    run_id = args.run_id or time.strftime("%Y%m%d%H%M%S")
+    shards = args.shard or list(range(args.shards))
+    if any(not 0 <= index < args.shards for index in shards):
+        parser.error(f"--shard має бути в межах 0..{args.shards - 1}")
+
+    print("\n" + "=" * 80)
+    print(f"🚀 ШАРДОВАНИЙ ПРОГІН: {args.spider}, шардів {len(shards)}/{args.shards}, run_id={run_id}")
+    print("=" * 80 + "\n")
+
+    if not run_workers(args.spider, shards, args.shards, run_id, extra_args):
+        return 1
+
+    # Частина шардів на інших машинах — злиття після збору всіх файлів (--merge)
+    if len(shards) < args.shards:
+        print(f"✅ Шарди {', '.join(str(i) for i in shards)} завершено. Злиття: --merge після решти шардів")
+        return 0
+
+    merge(args.spider, args.shards)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
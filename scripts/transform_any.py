@@ -13,6 +13,15 @@ import csv
 from collections import OrderedDict
 import sys
 import os
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from suppliers.paths import data_path
+
 
 def transform_csv(input_file, output_file=None):
     """
@@ -97,7 +106,7 @@ if __name__ == "__main__":
         output_file = sys.argv[2] if len(sys.argv) > 2 else None
     else:
         # За замовчуванням
-        input_file = r"C:\FullStack\Scrapy\data\viatec\data\data.csv"
-        output_file = r"C:\FullStack\Scrapy\data\viatec\data\data_transformed.csv"
+        input_file = data_path("viatec", "data", "data.csv")
+        output_file = data_path("viatec", "data", "data_transformed.csv")
     
     transform_csv(input_file, output_file)
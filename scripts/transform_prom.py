@@ -8,10 +8,19 @@
 Результат: data_prom_transformed.csv
 """
 import csv
+import sys
 from collections import OrderedDict
+from pathlib import Path
 
-input_file = r"C:\FullStack\Scrapy\data\viatec\data\data_prom.csv"
-output_file = r"C:\FullStack\Scrapy\data\viatec\data\data_prom_transformed.csv"
+
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from suppliers.paths import data_path
+
+input_file = data_path("viatec", "data", "data_prom.csv")
+output_file = data_path("viatec", "data", "data_prom_transformed.csv")
 
 # Читаємо вхідний файл
 with open(input_file, 'r', encoding='utf-8-sig') as f:
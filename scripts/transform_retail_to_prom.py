@@ -7,6 +7,13 @@ from pathlib import Path
 from decimal import Decimal, InvalidOperation
 
 
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from suppliers.paths import data_path, OUTPUT_DIR
+
+
 def normalize_price(price_str: str) -> str:
     """Нормалізує ціну: замінює кому на крапку"""
     return price_str.replace(",", ".").replace(" ", "").strip()
@@ -128,9 +135,8 @@ def main():
     print("🔄 ТРАНСФОРМАЦІЯ: RETAIL → PROM")
     print("=" * 80)
     
-    base_dir = Path(r"C:\FullStack\Scrapy")
-    data_dir = base_dir / "data" / "eserver"
-    output_dir = base_dir / "output"
+    data_dir = data_path("eserver")
+    output_dir = OUTPUT_DIR
     
     input_file = output_dir / "eserver_retail.csv"
     output_file = output_dir / "eserver_prom.csv"
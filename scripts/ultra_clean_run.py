@@ -3,6 +3,9 @@
 Використання: 
   python scripts/ultra_clean_run.py eserver_retail
   python scripts/ultra_clean_run.py eserver_retail --no-transform  (без трансформації)
+  python scripts/ultra_clean_run.py viatec_dealer -s REPLAY_MODE=replay  (додаткові аргументи → scrapy crawl)
+  python scripts/ultra_clean_run.py lun_retail --engine asyncio  (asyncio-рушій, suppliers/engine.py)
+  python scripts/ultra_clean_run.py viatec_retail --deadline 45m  (бюджет часу, suppliers/deadline.py)
 """
 import sys
 import os
@@ -90,6 +93,24 @@ def run_transformation():
         return False
 
 
+def run_asyncio_engine(spider_name, extra_args):
+    """Запуск паука asyncio-рушієм: -s NAME=VALUE → налаштування, -a name=value → аргументи паука"""
+    from suppliers.engine import crawl
+    
+    settings_overrides, spider_kwargs = {}, {}
+    for flag, pair in zip(extra_args[::2], extra_args[1::2]):
+        name, _, value = pair.partition("=")
+        if flag == "-s":
+            settings_overrides[name] = value
+        elif flag == "-a":
+            spider_kwargs[name] = value
+        else:
+            raise ValueError(f"Невідомий аргумент для asyncio-рушія: {flag} {pair}")
+    
+    silent_configure_logging()
+    return crawl(spider_name, settings_overrides, spider_kwargs)
+
+
 if __name__ == '__main__':
     if len(sys.argv) < 2:
         print("❌ Використання: python scripts/ultra_clean_run.py <spider_name> [--no-transform]")
@@ -113,12 +134,29 @@ if __name__ == '__main__':
         print("📦 Режим: Без трансформації")
     print("="*80 + "\n")
     
-    # Запускаємо spider
-    sys.argv = ['scrapy', 'crawl', spider_name]
+    # Додаткові аргументи (-s NAME=VALUE, -a name=value) передаються в scrapy crawl
+    extra_args = [arg for arg in sys.argv[2:] if arg != "--no-transform"]
+    engine = "scrapy"
+    if "--engine" in extra_args:
+        position = extra_args.index("--engine")
+        engine = extra_args[position + 1] if position + 1 < len(extra_args) else ""
+        del extra_args[position:position + 2]
+    if "--deadline" in extra_args:
+        position = extra_args.index("--deadline")
+        deadline = extra_args[position + 1] if position + 1 < len(extra_args) else ""
+        extra_args[position:position + 2] = ["-s", f"CRAWL_DEADLINE={deadline}"]
     
+    # Запускаємо spider
     try:
-        execute()
-        spider_success = True
+        if engine == "asyncio":
+            spider_success = run_asyncio_engine(spider_name, extra_args)
+        elif engine == "scrapy":
+            sys.argv = ['scrapy', 'crawl', spider_name, *extra_args]
+            execute()
+            spider_success = True
+        else:
+            print(f"❌ Невідомий рушій: {engine} (очікується scrapy або asyncio)")
+            spider_success = False
     except SystemExit as e:
         spider_success = (e.code == 0)
     except Exception as e:
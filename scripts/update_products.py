@@ -10,9 +10,17 @@
 import csv
 import os
 import sys
+from pathlib import Path
 from typing import Dict, List, Set
 
 
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from suppliers.paths import data_path, output_path
+
+
 SUPPLIERS = ['viatec', 'secur', 'neolight', 'lun', 'eserver']
 TYPES = ['dealer', 'retail']
 
@@ -154,12 +162,10 @@ def process_supplier(supplier: str, product_type: str) -> None:
     print(f"🔄 {supplier.upper()} - {product_type.upper()}")
     print(f"{'='*60}")
     
-    base_path = r"C:\FullStack\Scrapy"
-    
     # Шляхи до файлів
-    export_file = os.path.join(base_path, "data", supplier, "export-products.csv")
-    new_file = os.path.join(base_path, "output", f"{supplier}_{product_type}.csv")
-    import_file = os.path.join(base_path, "data", supplier, "import_products.csv")
+    export_file = str(data_path(supplier, "export-products.csv"))
+    new_file = str(output_path(f"{supplier}_{product_type}.csv"))
+    import_file = str(data_path(supplier, "import_products.csv"))
     
     # Перевіряємо існування файлів
     if not os.path.exists(export_file):
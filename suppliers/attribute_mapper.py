@@ -11,8 +11,8 @@
 """
 import re
 import csv
-from pathlib import Path
 from typing import List, Dict, Optional
+from suppliers.paths import data_path
 
 
 class AttributeMapper:
@@ -485,7 +485,7 @@ def test_mapper():
         {'name': 'Довжина кабеля', 'unit': '', 'value': '305 м'},
     ]
     
-    rules_path = r"C:\FullStack\Scrapy\data\viatec\viatec_mapping_rules.csv"
+    rules_path = data_path("viatec", "viatec_mapping_rules.csv")
     mapper = AttributeMapper(rules_path, logger)
     
     result = mapper.map_attributes(test_specs, category_id="301105")
@@ -0,0 +1,209 @@
+"""
+Зворотний тиск (backpressure) між завантажувачем, пауком та pipeline.
+
+З паралельними ланцюгами товарів (PRODUCT_LANES) відповіді, meta з контентом
+першої мовної сторінки та item можуть накопичуватись швидше, ніж SuppliersPipeline
+(mapper + keywords) їх обробляє. BackpressureExtension раз на BACKPRESSURE_INTERVAL
+знімає RSS процесу та глибину черг:
+- scheduler           — запити, що чекають завантаження
+- downloader_active   — запити в завантажувачі (в т.ч. в черзі слотів)
+- scraper_responses   — відповіді в черзі/обробці callback'ів паука
+- pipeline_items      — item в pipeline
+
+Якщо RSS > BACKPRESSURE_MAX_RSS_MB, відповідей > BACKPRESSURE_MAX_RESPONSES або
+item > BACKPRESSURE_MAX_ITEMS — engine.pause(): нові запити не йдуть у завантажувач,
+поточні завершуються, черги спорожнюються. Продовження — коли всі показники нижче
+BACKPRESSURE_RESUME_RATIO від межі. Python не завжди повертає пам'ять ОС: якщо черги
+вже порожні, а RSS не знизився після gc.collect(), обхід продовжується з попередженням,
+а межа RSS піднімається на 25% над досягнутим рівнем (пам'ять зайнята не чергами —
+пауза її не звільнить).
+
+Паузи, їх тривалість та піки показників — у звіті метрик (backpressure).
+asyncio-рушій (suppliers/engine.py) використовує той самий BackpressureController.
+"""
+import gc
+import logging
+import os
+import sys
+import time
+from typing import Dict, Optional
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+from twisted.internet import task
+
+
+logger = logging.getLogger(__name__)
+
+
+def current_rss_mb() -> Optional[float]:
+    """Поточний RSS процесу в МБ (psutil, /proc або пік через resource); None якщо недоступно"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1048576
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1048576
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux — КБ, macOS — байти
+        return peak / 1048576 if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        return None
+
+
+class BackpressureController:
+    """Рішення пауза/продовження за RSS та глибиною черг (з гістерезисом)"""
+
+    def __init__(self, max_rss_mb: float = 0, limits: Dict[str, int] = None, resume_ratio: float = 0.8):
+        self.max_rss_mb = max_rss_mb
+        # Межа RSS з урахуванням пам'яті, яку пауза не звільняє
+        self.rss_limit_mb = max_rss_mb
+        # Показник черги → межа (0 — без межі)
+        self.limits = {name: limit for name, limit in (limits or {}).items() if limit}
+        self.resume_ratio = resume_ratio
+        self.paused = False
+        self.reason = ""
+        self.paused_at = None
+        self.pauses = 0
+        self.paused_s = 0.0
+        self.rss_releases = 0
+        self.peaks = {"rss_mb": 0.0}
+
+    def _over(self, rss_mb, depths, ratio) -> str:
+        """Перший показник вище ratio × межа (порожній рядок — все в межах)"""
+        if self.rss_limit_mb and rss_mb is not None and rss_mb > self.rss_limit_mb * ratio:
+            return f"RSS {rss_mb:.0f} МБ"
+        for name, limit in self.limits.items():
+            if depths.get(name, 0) > limit * ratio:
+                return f"{name} {depths[name]}"
+        return ""
+
+    def update(self, rss_mb: Optional[float], depths: Dict[str, int], drained: bool) -> bool:
+        """Новий замір; повертає True якщо обхід має стояти на паузі
+
+        drained — черги між завантажувачем і pipeline порожні (чекати нічого).
+        """
+        if rss_mb is not None:
+            self.peaks["rss_mb"] = max(self.peaks["rss_mb"], round(rss_mb, 1))
+        for name, value in depths.items():
+            self.peaks[name] = max(self.peaks.get(name, 0), value)
+
+        if not self.paused:
+            reason = self._over(rss_mb, depths, 1.0)
+            if reason:
+                self.paused, self.reason, self.paused_at = True, reason, time.monotonic()
+                self.pauses += 1
+            return self.paused
+
+        if self._over(rss_mb, depths, self.resume_ratio):
+            if not drained or not self.reason.startswith("RSS"):
+                return True
+            # Черги порожні, а пам'ять не звільнилась — чекати нічого
+            gc.collect()
+            rss_mb = current_rss_mb()
+            if self._over(rss_mb, depths, self.resume_ratio):
+                self.rss_releases += 1
+                self.rss_limit_mb = max(self.rss_limit_mb, (rss_mb or 0) * 1.25)
+                logger.warning(
+                    f"⚠️ RSS {rss_mb or 0:.0f} МБ не знижується при порожніх чергах — продовжую обхід, "
+                    f"межа RSS тепер {self.rss_limit_mb:.0f} МБ (BACKPRESSURE_MAX_RSS_MB={self.max_rss_mb:g})"
+                )
+        self.paused = False
+        self.paused_s += time.monotonic() - self.paused_at
+        return False
+
+    def report(self) -> Dict:
+        paused_s = self.paused_s + (time.monotonic() - self.paused_at if self.paused else 0.0)
+        return {
+            "max_rss_mb": self.max_rss_mb or None,
+            "rss_limit_mb": round(self.rss_limit_mb, 1) or None,
+            "limits": dict(self.limits),
+            "pauses": self.pauses,
+            "paused_s": round(paused_s, 1),
+            "rss_not_released": self.rss_releases,
+            "peaks": dict(self.peaks),
+        }
+
+
+class BackpressureExtension:
+    """Розширення Scrapy: engine.pause()/unpause() за RSS та глибиною черг"""
+
+    def __init__(self, crawler, controller, interval):
+        self.crawler = crawler
+        self.controller = controller
+        self.interval = interval
+        self.loop = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        if not settings.getbool("BACKPRESSURE_ENABLED", True):
+            raise NotConfigured
+        controller = BackpressureController(
+            max_rss_mb=settings.getfloat("BACKPRESSURE_MAX_RSS_MB", 0),
+            limits={
+                "scraper_responses": settings.getint("BACKPRESSURE_MAX_RESPONSES", 0),
+                "pipeline_items": settings.getint("BACKPRESSURE_MAX_ITEMS", 0),
+            },
+            resume_ratio=settings.getfloat("BACKPRESSURE_RESUME_RATIO", 0.8),
+        )
+        if not controller.max_rss_mb and not controller.limits:
+            raise NotConfigured
+        ext = cls(crawler, controller, settings.getfloat("BACKPRESSURE_INTERVAL", 1.0))
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        return ext
+
+    def spider_opened(self, spider):
+        spider.backpressure = self.controller
+        self.loop = task.LoopingCall(self._tick, spider)
+        self.loop.start(self.interval, now=False)
+
+    def depths(self) -> Dict[str, int]:
+        engine = self.crawler.engine
+        downloader = engine.downloader
+        scraper_slot = getattr(engine.scraper, "slot", None)
+        engine_slot = getattr(engine, "_slot", None)
+        return {
+            "scheduler": len(engine_slot.scheduler) if engine_slot is not None and hasattr(engine_slot.scheduler, "__len__") else 0,
+            "downloader_active": len(downloader.active),
+            "scraper_responses": len(scraper_slot.queue) + len(scraper_slot.active) if scraper_slot is not None else 0,
+            "pipeline_items": scraper_slot.itemproc_size if scraper_slot is not None else 0,
+        }
+
+    def _tick(self, spider):
+        engine = self.crawler.engine
+        depths = self.depths()
+        drained = not (depths["downloader_active"] or depths["scraper_responses"] or depths["pipeline_items"])
+        was_paused = self.controller.paused
+        paused = self.controller.update(current_rss_mb(), depths, drained)
+        if paused and not was_paused:
+            engine.pause()
+            spider.logger.warning(
+                f"🚦 Пауза нових запитів: {self.controller.reason} "
+                f"(у завантажувачі {depths['downloader_active']}, відповідей {depths['scraper_responses']}, "
+                f"item у pipeline {depths['pipeline_items']}, у черзі {depths['scheduler']})"
+            )
+        elif was_paused and not paused:
+            engine.unpause()
+            # Рушій перевіряє чергу за heartbeat (5 с) — будимо одразу
+            engine_slot = getattr(engine, "_slot", None)
+            if engine_slot is not None:
+                engine_slot.nextcall.schedule()
+            spider.logger.info("🚦 Продовження запитів")
+
+    def spider_closed(self, spider, reason):
+        if self.loop is not None and self.loop.running:
+            self.loop.stop()
+        report = self.controller.report()
+        if report["pauses"]:
+            spider.logger.info(
+                f"🚦 Backpressure: пауз {report['pauses']}, загалом {report['paused_s']}с, "
+                f"пік RSS {report['peaks']['rss_mb']} МБ"
+            )
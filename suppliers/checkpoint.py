@@ -0,0 +1,148 @@
+"""
+Checkpoint та продовження перерваних обходів постачальників.
+
+Прогрес обходу живе не в черзі Scrapy (JOBDIR не допомагає), а в ланцюгу
+category_index → product_frontier та у відкритому CSV pipeline. Тому стан
+збирається з «провайдерів», які реєструються в Checkpoint паука:
+- spider   — поточна категорія, фаза (пагінація/товари), товари що лишились,
+             оброблені URL, товари з помилками (BaseSupplierSpider.checkpoint_state)
+- pipeline — зсув кінця останнього повного рядка у вихідному файлі, наступний
+             код товару, кількість записаних товарів (SuppliersPipeline.checkpoint_state)
+
+CheckpointExtension періодично (CHECKPOINT_INTERVAL) атомарно пише JSON у
+<CHECKPOINT_DIR>/<spider>_checkpoint.json — лише коли scraper не обробляє
+відповідь чи item, щоб стан паука й pipeline був узгоджений.
+Успішне завершення (finished) видаляє checkpoint, будь-яке інше — зберігає.
+
+Продовження: scrapy crawl viatec_dealer -a resume=1
+"""
+import json
+import os
+import time
+from pathlib import Path
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+from twisted.internet import task
+from suppliers.paths import output_path
+
+
+class Checkpoint:
+    """Стан одного прогону: провайдери стану та збережений checkpoint"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.providers = {}
+        self._saved = None
+
+    def register(self, name, provider):
+        """provider() повертає JSON-серіалізований стан компонента"""
+        self.providers[name] = provider
+
+    def restored(self, name):
+        """Стан компонента з checkpoint попереднього прогону (None якщо немає)"""
+        if self._saved is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._saved = json.load(f)
+            except FileNotFoundError:
+                self._saved = {}
+        return self._saved.get("state", {}).get(name)
+
+    def exists(self):
+        return self.path.exists()
+
+    def save(self):
+        """Атомарний запис: тимчасовий файл + os.replace"""
+        data = {
+            "saved_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "state": {name: provider() for name, provider in self.providers.items()},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def discard(self):
+        if self.path.exists():
+            self.path.unlink()
+
+
+def get_checkpoint(spider) -> Checkpoint:
+    """Повертає Checkpoint паука (створює при першому зверненні)
+
+    Спільна точка для паука, pipeline та розширення — як get_stage_timer.
+    """
+    checkpoint = getattr(spider, "checkpoint", None)
+    if checkpoint is None:
+        checkpoint_dir = spider.settings.get("CHECKPOINT_DIR", output_path("checkpoints"))
+        checkpoint = Checkpoint(Path(checkpoint_dir) / f"{getattr(spider, 'run_name', spider.name)}_checkpoint.json")
+        spider.checkpoint = checkpoint
+    return checkpoint
+
+
+class CheckpointExtension:
+    """Розширення Scrapy: періодичне збереження checkpoint та фінальне при закритті"""
+
+    def __init__(self, crawler, interval):
+        self.crawler = crawler
+        self.interval = interval
+        self.loop = None
+        self.saves = 0
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("CHECKPOINT_ENABLED", True):
+            raise NotConfigured
+        ext = cls(crawler, crawler.settings.getfloat("CHECKPOINT_INTERVAL", 30.0))
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        return ext
+
+    def spider_opened(self, spider):
+        get_checkpoint(spider)
+        self.loop = task.LoopingCall(self._tick, spider)
+        self.loop.start(self.interval, now=False)
+
+    def _scraper_busy(self):
+        slot = getattr(self.crawler.engine.scraper, "slot", None)
+        return slot is not None and bool(slot.queue or slot.active or slot.itemproc_size)
+
+    def _tick(self, spider):
+        if self._scraper_busy():
+            spider.logger.debug("💾 Checkpoint відкладено: scraper обробляє відповідь")
+            return
+        self._save(spider)
+
+    def _save(self, spider):
+        checkpoint = get_checkpoint(spider)
+        try:
+            checkpoint.save()
+            self.saves += 1
+        except (OSError, TypeError, ValueError) as e:
+            spider.logger.warning(f"⚠️ Не вдалося зберегти checkpoint {checkpoint.path}: {e}")
+
+    def spider_closed(self, spider, reason):
+        if self.loop is not None and self.loop.running:
+            self.loop.stop()
+
+        checkpoint = get_checkpoint(spider)
+        if reason == "finished":
+            checkpoint.discard()
+            return
+
+        self._save(spider)
+        spider.logger.info(
+            f"💾 Checkpoint збережено: {checkpoint.path} (причина: {reason}). "
+            f"Продовження: scrapy crawl {spider.name}{self._shard_args(spider)} -a resume=1"
+        )
+
+    @staticmethod
+    def _shard_args(spider):
+        shard = getattr(spider, "shard", None)
+        if not shard:
+            return ""
+        return f" -a shard={shard[0]}/{shard[1]} -a run_id={spider.run_id}"
@@ -0,0 +1,177 @@
+"""
+Пули з'єднань до сайтів постачальників та метрики повторного використання з'єднань.
+
+Кожен постачальник — один хост, тому майже весь трафік іде на одне з'єднання/пул:
+- PooledHTTP11DownloadHandler (CONNECTION_POOL_ENABLED = True) — HTTP/1.1 keep-alive, пул на хост
+  розміром з верхню межу адаптивної конкурентності (ADAPTIVE_THROTTLE_MAX_CONCURRENCY),
+  а не стартове CONCURRENT_REQUESTS_PER_DOMAIN — інакше зайві з'єднання закриваються
+  після кожного запиту
+- Http2DownloadHandler (HTTP2_ENABLED = True) — HTTP/2 з мультиплексуванням запитів
+  в одному з'єднанні, якщо сервер погоджує h2 (ALPN), інакше HTTP/1.1 keep-alive;
+  потребує pip install "httpx2[http2]"
+
+Обидва рахують відкриті з'єднання та протоколи відповідей по хостах —
+CrawlMetrics додає їх у звіт (<spider>_metrics.json, domains.<host>.connections).
+
+Обробник ставить ConnectionPoolAddon, якщо паук не задав власний DOWNLOAD_HANDLERS
+(Playwright у secur) і не увімкнено REPLAY_MODE=replay.
+"""
+import logging
+import weakref
+
+from scrapy.core.downloader.handlers.http11 import HTTP11DownloadHandler
+from scrapy.utils.httpobj import urlparse_cached
+
+
+logger = logging.getLogger(__name__)
+
+POOLED_HTTP11_HANDLER = "suppliers.connections.PooledHTTP11DownloadHandler"
+HTTP2_HANDLER = "suppliers.connections.Http2DownloadHandler"
+
+
+class ConnectionStats:
+    """Відкриті з'єднання та протоколи відповідей по хостах"""
+
+    __slots__ = ("hosts",)
+
+    def __init__(self):
+        # host -> {"connections": int, "protocols": {protocol: responses}}
+        self.hosts = {}
+
+    def _host(self, host):
+        stats = self.hosts.get(host)
+        if stats is None:
+            stats = self.hosts[host] = {"connections": 0, "protocols": {}}
+        return stats
+
+    def connection_opened(self, host):
+        self._host(host)["connections"] += 1
+
+    def response(self, host, protocol):
+        protocols = self._host(host)["protocols"]
+        protocols[protocol] = protocols.get(protocol, 0) + 1
+
+    def report(self, host):
+        stats = self.hosts.get(host)
+        if stats is None:
+            return None
+        responses = sum(stats["protocols"].values())
+        connections = stats["connections"]
+        return {
+            "opened": connections,
+            "protocols": dict(sorted(stats["protocols"].items())),
+            # Скільки відповідей припало на одне з'єднання (1.0 — без повторного використання)
+            "responses_per_connection": round(responses / connections, 2) if connections else None,
+        }
+
+
+def get_connection_stats(spider) -> ConnectionStats:
+    """Повертає ConnectionStats паука (створює при першому зверненні), як get_stage_timer"""
+    stats = getattr(spider, "connection_stats", None)
+    if stats is None:
+        stats = ConnectionStats()
+        spider.connection_stats = stats
+    return stats
+
+
+def pool_size_per_host(settings):
+    """Пул на хост не менший за верхню межу адаптивної конкурентності"""
+    size = settings.getint("CONNECTION_POOL_PER_HOST", 0)
+    if size:
+        return size
+    return max(
+        settings.getint("CONCURRENT_REQUESTS_PER_DOMAIN"),
+        settings.getint("ADAPTIVE_THROTTLE_MAX_CONCURRENCY", 0),
+    )
+
+
+def _request_host(request):
+    return urlparse_cached(request).hostname or ""
+
+
+def _host_from_pool_key(key):
+    # Ключ пулу Twisted: (scheme, host, port[, ...]) або (b"http-proxy", host, port)
+    host = key[1] if isinstance(key, tuple) and len(key) > 1 else key
+    return host.decode("ascii", "replace") if isinstance(host, bytes) else str(host)
+
+
+class PooledHTTP11DownloadHandler(HTTP11DownloadHandler):
+    """HTTP/1.1 keep-alive з пулом на хост під адаптивну конкурентність та лічильником з'єднань"""
+
+    def __init__(self, crawler):
+        super().__init__(crawler)
+        self._pool.maxPersistentPerHost = pool_size_per_host(crawler.settings)
+        new_connection = self._pool._newConnection
+
+        def counted_new_connection(key, endpoint):
+            if crawler.spider is not None:
+                get_connection_stats(crawler.spider).connection_opened(_host_from_pool_key(key))
+            return new_connection(key, endpoint)
+
+        self._pool._newConnection = counted_new_connection
+
+    async def download_request(self, request):
+        response = await super().download_request(request)
+        if self._crawler.spider is not None:
+            get_connection_stats(self._crawler.spider).response(_request_host(request), response.protocol or "HTTP/1.1")
+        return response
+
+
+try:
+    # Обробник httpx з'явився в Scrapy 2.15 (експериментальний); без httpx2 він не вмикається
+    from scrapy.core.downloader.handlers._httpx import HAS_HTTP2, HttpxDownloadHandler, httpx
+except ImportError:  # pragma: no cover
+    HAS_HTTP2, HttpxDownloadHandler, httpx = False, None, None
+
+
+def http2_available():
+    return HttpxDownloadHandler is not None and httpx is not None and HAS_HTTP2
+
+
+if HttpxDownloadHandler is not None:
+
+    class Http2DownloadHandler(HttpxDownloadHandler):
+        """HTTP/2 (ALPN h2) з переходом на HTTP/1.1 keep-alive, якщо сервер h2 не підтримує"""
+
+        def __init__(self, crawler):
+            super().__init__(crawler)
+            # Мережеві потоки, вже пораховані як з'єднання (слабкі посилання — потоки пулу не утримуються)
+            self._seen_streams = weakref.WeakSet()
+
+        def _build_base_response_args(self, response, request, headers):
+            args = HttpxDownloadHandler._build_base_response_args(response, request, headers)
+            if self.crawler.spider is not None:
+                stats = get_connection_stats(self.crawler.spider)
+                host = _request_host(request)
+                network_stream = response.extensions.get("network_stream")
+                if network_stream is not None and network_stream not in self._seen_streams:
+                    self._seen_streams.add(network_stream)
+                    stats.connection_opened(host)
+                stats.response(host, args.get("protocol") or "HTTP/1.1")
+            return args
+
+
+class ConnectionPoolAddon:
+    """Ставить обробник завантаження з пулом з'єднань (CONNECTION_POOL_ENABLED; HTTP2_ENABLED — HTTP/2)
+
+    Власні DOWNLOAD_HANDLERS паука та REPLAY_MODE=replay (ReplayAddon, пріоритет cmdline)
+    не перекриваються.
+    """
+
+    def update_settings(self, settings):
+        if not settings.getbool("CONNECTION_POOL_ENABLED", False) and not settings.getbool("HTTP2_ENABLED", False):
+            return
+
+        handler = POOLED_HTTP11_HANDLER
+        if settings.getbool("HTTP2_ENABLED", False):
+            if http2_available():
+                handler = HTTP2_HANDLER
+                settings.set("HTTPX_HTTP2_ENABLED", True, priority="cmdline")
+            else:
+                logger.warning('⚠️ HTTP2_ENABLED потребує pip install "httpx2[http2]" — працюю через HTTP/1.1 keep-alive')
+
+        handlers = settings.getdict("DOWNLOAD_HANDLERS")
+        for scheme in ("http", "https"):
+            if scheme not in handlers:
+                handlers[scheme] = handler
+        settings.set("DOWNLOAD_HANDLERS", handlers, priority=settings.getpriority("DOWNLOAD_HANDLERS") or "project")
@@ -0,0 +1,108 @@
+"""
+Кеш контенту товарів за артикулом постачальника між прогонами.
+
+Назва, опис і характеристики товару з тим самим артикулом майже не змінюються,
+а кожен прогін завантажував обидві мовні сторінки. ContentCache зберігає
+в SQLite <CONTENT_CACHE_PATH> контент кожної мови разом з хешем:
+
+    (supplier, sku, lang) → name, description, specs, content_hash
+
+Паук завантажує одну мовну сторінку (ціна, наявність) і рахує хеш її контенту;
+якщо він збігся з хешем у кеші — контент другої мови береться з кешу,
+інакше друга сторінка завантажується і кеш оновлюється.
+"""
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS content (
+    supplier TEXT NOT NULL,
+    sku TEXT NOT NULL,
+    lang TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    specs TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (supplier, sku, lang)
+) WITHOUT ROWID;
+"""
+
+
+def content_hash(name: str, description: str, specs: List) -> str:
+    """Хеш контенту мовної сторінки (назва + опис + характеристики)"""
+    payload = json.dumps([name, description, specs], ensure_ascii=False, sort_keys=True)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ContentCache:
+    """SQLite кеш контенту товарів одного постачальника"""
+
+    def __init__(self, path, supplier: str, batch_size: int = 200):
+        self.path = Path(path)
+        self.supplier = supplier
+        self.batch_size = batch_size
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.path))
+        self.connection.executescript(SCHEMA)
+        self.pending = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, sku: str, lang: str) -> Optional[Dict]:
+        """Контент мови: {"name", "description", "specs", "content_hash"} або None"""
+        if (sku, lang) in self.pending:
+            return self.pending[(sku, lang)]
+        row = self.connection.execute(
+            "SELECT name, description, specs, content_hash FROM content WHERE supplier = ? AND sku = ? AND lang = ?",
+            (self.supplier, sku, lang),
+        ).fetchone()
+        if row is None:
+            return None
+        name, description, specs, digest = row
+        return {"name": name, "description": description, "specs": json.loads(specs), "content_hash": digest}
+
+    def lookup(self, sku: str, lang: str, digest: str, other_lang: str) -> Optional[Dict]:
+        """Контент other_lang, якщо контент lang не змінився з моменту кешування"""
+        cached = self.get(sku, lang)
+        other = self.get(sku, other_lang) if cached and cached["content_hash"] == digest else None
+        if other is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return other
+
+    def put(self, sku: str, lang: str, name: str, description: str, specs: List, digest: Optional[str] = None):
+        self.pending[(sku, lang)] = {
+            "name": name,
+            "description": description,
+            "specs": specs,
+            "content_hash": digest or content_hash(name, description, specs),
+        }
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        now = time.time()
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO content (supplier, sku, lang, name, description, specs, content_hash, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (self.supplier, sku, lang, entry["name"], entry["description"],
+                     json.dumps(entry["specs"], ensure_ascii=False), entry["content_hash"], now)
+                    for (sku, lang), entry in self.pending.items()
+                ),
+            )
+        self.pending.clear()
+
+    def close(self):
+        self.flush()
+        self.connection.close()
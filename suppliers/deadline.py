@@ -0,0 +1,107 @@
+"""
+Бюджет часу прогону: нічне вікно перед імпортом у PROM.
+
+CRAWL_DEADLINE = "45m" (або --deadline 45m у scripts/ultra_clean_run.py):
+- CrawlBudget рахує вартість товару з живих даних (ковзне середнє часу від запиту
+  товару до переходу до наступного, в межах одного ланцюга)
+- кожна категорія на старті ланцюга товарів отримує частку залишку бюджету:
+  залишок / категорій що лишились; якщо наступний товар у частку не вміщується —
+  решта товарів категорії пропускається (вони в кінці черги — найменш мінливі,
+  suppliers/volatility.py), невикористана частка переходить наступним категоріям
+- якщо наступний товар не вміщується в загальний дедлайн — нові запити не
+  ставляться, поточні завершуються, паук закривається з причиною "deadline":
+  pipeline дописує CSV, пишуться метрики та checkpoint (-a resume=1)
+
+DeadlineAddon ставить CLOSESPIDER_TIMEOUT = дедлайн + DEADLINE_GRACE — жорстка межа,
+якщо поточні запити не встигли завершитись (закриття теж штатне, без обриву запису).
+
+Бюджет на кількох постачальників ділить scripts/nightly_run.py.
+"""
+import re
+import time
+from typing import Dict, Optional
+
+
+DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*([hms]?)")
+DURATION_UNITS = {"h": 3600, "m": 60, "s": 1, "": 1}
+
+# Вага нового виміру в ковзному середньому вартості товару
+COST_SMOOTHING = 0.2
+
+
+def parse_duration(value) -> float:
+    """"45m", "1h30m", "90s", "2700" → секунди; "" / None → 0"""
+    if value is None or isinstance(value, (int, float)):
+        return float(value or 0)
+    text = str(value).strip().lower()
+    if not text:
+        return 0.0
+    position, seconds = 0, 0.0
+    for match in DURATION_PATTERN.finditer(text):
+        if match.start() != position:
+            break
+        seconds += float(match.group(1)) * DURATION_UNITS[match.group(2)]
+        position = match.end()
+    if position != len(text):
+        raise ValueError(f"❌ Невірна тривалість: {value} (приклади: 45m, 1h30m, 2700)")
+    return seconds
+
+
+def format_duration(seconds: float) -> str:
+    minutes, secs = divmod(int(max(0.0, seconds)), 60)
+    return f"{minutes} хв {secs:02d} с" if minutes else f"{secs} с"
+
+
+class CrawlBudget:
+    """Дедлайн прогону та оцінка вартості одного товару"""
+
+    def __init__(self, seconds: float, clock=time.monotonic):
+        self.clock = clock
+        self.seconds = seconds
+        self.deadline = clock() + seconds
+        self.product_cost = None
+        self.products_measured = 0
+        self.skipped_products = 0
+        self.skipped_categories = 0
+
+    def remaining(self) -> float:
+        return self.deadline - self.clock()
+
+    def observe_product(self, seconds: float):
+        self.products_measured += 1
+        if self.product_cost is None:
+            self.product_cost = seconds
+        else:
+            self.product_cost += COST_SMOOTHING * (seconds - self.product_cost)
+
+    def fits(self, until: Optional[float] = None) -> bool:
+        """Чи встигне ще один товар до until (за замовчуванням — до дедлайну)"""
+        until = self.deadline if until is None else min(until, self.deadline)
+        return self.clock() + (self.product_cost or 0.0) <= until
+
+    def category_until(self, remaining_categories: int) -> float:
+        """Межа часу категорії: рівна частка залишку серед категорій, що лишились"""
+        return self.clock() + max(0.0, self.remaining()) / max(1, remaining_categories)
+
+    def report(self) -> Dict:
+        return {
+            "budget_s": round(self.seconds, 1),
+            "remaining_s": round(self.remaining(), 1),
+            "product_cost_s": round(self.product_cost, 3) if self.product_cost is not None else None,
+            "skipped_products": self.skipped_products,
+            "skipped_categories": self.skipped_categories,
+        }
+
+
+class DeadlineAddon:
+    """CRAWL_DEADLINE → CLOSESPIDER_TIMEOUT = дедлайн + DEADLINE_GRACE (якщо не задано явно)"""
+
+    def update_settings(self, settings):
+        seconds = parse_duration(settings.get("CRAWL_DEADLINE"))
+        if not seconds or settings.getfloat("CLOSESPIDER_TIMEOUT", 0):
+            return
+        settings.set(
+            "CLOSESPIDER_TIMEOUT",
+            seconds + settings.getfloat("DEADLINE_GRACE", 120),
+            priority=settings.getpriority("CRAWL_DEADLINE"),
+        )
@@ -0,0 +1,171 @@
+"""
+Опис товару у форматі PROM (HTML з переносами <br>), спільний для екстракторів і pipeline.
+
+Екстрактор передає HTML блоку опису постачальника, sanitize() за один прохід по
+дереву блоку будує рядок опису у форматі постачальника:
+
+    "items" — viatec: пункти <ul> з «●», інакше внутрішній HTML абзаців <p>
+    "html"  — secur: внутрішній HTML блоку без style і пробілів між тегами
+    "text"  — eserver: текст абзаців <p>, інакше весь текст блоку
+
+Товари однієї серії часто мають однаковий опис, тож результат кешується за
+хешем вихідного HTML (і формату). Дерево будується з HTML блоку lxml-парсером,
+тому результат не залежить від EXTRACTOR_BACKEND.
+
+clean_description() — фінальна нормалізація в SuppliersPipeline для всіх постачальників.
+"""
+import hashlib
+import re
+from collections import OrderedDict
+from copy import deepcopy
+from html import escape
+
+from lxml import etree
+from lxml.html import fragments_fromstring
+
+
+# Абзац-посилання viatec «Є товари з аналогічними характеристиками →»
+ANALOG_LINK_CLASS = "card-header__analog-link"
+BULLET = "●"
+# Межа довжини HTML-опису secur (обрізаний абзац закривається)
+MAX_HTML_LENGTH = 10000
+
+ANALOG_PHRASE = re.compile(
+    r"Є товари з аналогічними характеристиками\s*→|Есть товары с аналогичными характеристиками\s*→",
+    re.IGNORECASE,
+)
+SPACES = re.compile(r" +")
+
+
+def _tostring(element) -> str:
+    return etree.tostring(element, method="html", encoding="unicode", with_tail=False)
+
+
+def _inner_html(element) -> str:
+    """Внутрішній HTML елемента (без власних тегів і хвостового тексту)"""
+    parts = [escape(element.text, quote=False)] if element.text else []
+    for child in element:
+        parts.append(_tostring(child))
+        if child.tail:
+            parts.append(escape(child.tail, quote=False))
+    return "".join(parts)
+
+
+def _own_text(element) -> list:
+    """Текстові вузли — прямі нащадки елемента (XPath text())"""
+    texts = [element.text] if element.text is not None else []
+    texts.extend(child.tail for child in element if child.tail is not None)
+    return texts
+
+
+def _first_class(element):
+    """Перший атрибут class у піддереві (як ::attr(class) ... .get())"""
+    for node in element.iter(etree.Element):
+        value = node.get("class")
+        if value is not None:
+            return value
+    return None
+
+
+def _items(blocks) -> str:
+    """Пункти <ul> з «●», інакше абзаци <p> без абзацу-посилання на аналоги"""
+    lists, paragraphs = [], []
+    for block in blocks:
+        for element in block.iter("ul", "p"):
+            (lists if element.tag == "ul" else paragraphs).append(element)
+
+    if lists:
+        parts = []
+        for item in (li for ul in lists for li in ul.iter("li")):
+            if item.find(".//li") is not None:
+                # Вкладений список: теги <li> прибираються, вміст лишається
+                item = deepcopy(item)
+                etree.strip_tags(item, "li")
+            content = _inner_html(item).strip()
+            parts.append(content if content.startswith(BULLET) else f"{BULLET} {content}")
+        return "<br>".join(parts)
+
+    parts = []
+    for paragraph in paragraphs:
+        if _first_class(paragraph) == ANALOG_LINK_CLASS:
+            continue
+        content = _inner_html(paragraph).strip()
+        if content:
+            parts.append(content)
+    return "<br>".join(parts)
+
+
+def _html(blocks) -> str:
+    """Внутрішній HTML першого блоку без style та пробільних вузлів між тегами"""
+    if not blocks:
+        return ""
+    block = blocks[0]
+    for element in block.iter():
+        if element.text is not None and not element.text.strip():
+            element.text = None
+        if element.tail is not None and not element.tail.strip():
+            element.tail = None
+        if isinstance(element.tag, str) and "style" in element.attrib:
+            del element.attrib["style"]
+
+    description = _inner_html(block).strip()
+    if len(description) > MAX_HTML_LENGTH:
+        description = description[:MAX_HTML_LENGTH] + '...</p>'
+    return description.strip()
+
+
+def _text(blocks) -> str:
+    """Текст абзаців <p> (по рядку <br> на абзац), інакше весь текст блоків"""
+    paragraphs = [text for block in blocks for p in block.iter("p") for text in _own_text(p)]
+    if paragraphs:
+        return "<br>".join(p.strip() for p in paragraphs if p.strip())
+    return " ".join(t.strip() for block in blocks for t in block.itertext() if t.strip())
+
+
+FORMATTERS = {"items": _items, "html": _html, "text": _text}
+
+
+class DescriptionSanitizer:
+    """Форматування опису з кешем за хешем вихідного HTML (найстаріші записи витісняються)"""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def sanitize(self, source_html: str, style: str) -> str:
+        """HTML блоку (або кількох блоків) опису → опис PROM у форматі постачальника"""
+        if not source_html:
+            return ""
+        key = (style, hashlib.blake2b(source_html.encode("utf-8"), digest_size=16).digest())
+        description = self._cache.get(key)
+        if description is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return description
+
+        self.misses += 1
+        blocks = [node for node in fragments_fromstring(source_html) if not isinstance(node, str)]
+        description = FORMATTERS[style](blocks)
+        self._cache[key] = description
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return description
+
+
+_sanitizer = DescriptionSanitizer()
+
+
+def sanitize(source_html: str, style: str) -> str:
+    """Опис PROM з HTML блоку опису (спільний кеш процесу)"""
+    return _sanitizer.sanitize(source_html, style)
+
+
+def clean_description(description: str) -> str:
+    """Фінальне очищення опису в pipeline: посилання на аналоги, переноси → <br>, пробіли"""
+    if not description:
+        return ""
+    description = ANALOG_PHRASE.sub("", description)
+    description = SPACES.sub(" ", description.replace("\n", "<br>"))
+    return description.strip()
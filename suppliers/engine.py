@@ -0,0 +1,428 @@
+"""
+Легкий asyncio-рушій для простих статичних постачальників (без логіну та JS).
+
+Ті самі пауки (callback'и, хелпери витягування) та SuppliersPipeline без змін,
+але замість Scrapy/Twisted та ланцюжка middleware:
+- один aiohttp.ClientSession з пулом keep-alive з'єднань на хост
+- ENGINE_CONCURRENCY воркерів asyncio; товари категорії обробляються
+  паралельними ланцюгами (PRODUCT_LANES = ENGINE_CONCURRENCY)
+- ENGINE_UVLOOP — цикл подій uvloop, якщо встановлено (pip install uvloop)
+
+Що залишається від Scrapy: DEFAULT_REQUEST_HEADERS/USER_AGENT, DOWNLOAD_DELAY на хост,
+RETRY_TIMES/RETRY_HTTP_CODES, robots.txt, фільтр дублікатів, HttpError → errback,
+відкладені повтори товарів, CRAWL_DEADLINE (suppliers/deadline.py), пауза за
+BACKPRESSURE_MAX_RSS_MB (suppliers/backpressure.py; pipeline тут синхронний — черг між
+ним і пауком немає). Немає: checkpoint (-a resume), адаптивного throttle, replay.
+
+Звіт метрик у форматі CrawlMetrics (<METRICS_OUTPUT_DIR>/<spider>_metrics.json, "engine": "asyncio")
+з часом CPU на товар — для порівняння з Scrapy (scripts/compare_metrics.py).
+
+Запуск (потрібен pip install aiohttp):
+  python scripts/ultra_clean_run.py lun_retail --engine asyncio
+  python scripts/ultra_clean_run.py eserver_retail --engine asyncio -s ENGINE_CONCURRENCY=8
+"""
+import asyncio
+import itertools
+import json
+import logging
+import random
+import time
+from pathlib import Path
+
+from itemadapter import is_item
+from scrapy import Request
+from scrapy.exceptions import DropItem
+from scrapy.http import Headers, HtmlResponse
+from scrapy.spidermiddlewares.httperror import HttpError
+from scrapy.utils.httpobj import urlparse_cached
+from scrapy.utils.misc import load_object
+from twisted.python.failure import Failure
+
+from suppliers.backpressure import BackpressureController, current_rss_mb
+from suppliers.deadline import parse_duration
+from suppliers.metrics import CallbackTimingMiddleware, get_stage_timer
+from suppliers.paths import OUTPUT_DIR
+
+
+logger = logging.getLogger(__name__)
+
+# Заголовки, які aiohttp виставляє сам (Accept-Encoding — лише підтримувані кодування)
+SKIPPED_DEFAULT_HEADERS = {"accept-encoding", "connection"}
+
+
+def load_settings(spider_name, overrides=None):
+    """Налаштування проекту + custom_settings паука + -s NAME=VALUE"""
+    from scrapy.spiderloader import SpiderLoader
+    from scrapy.utils.project import get_project_settings
+
+    settings = get_project_settings()
+    spider_cls = SpiderLoader.from_settings(settings).load(spider_name)
+    spider_cls.update_settings(settings)
+    for name, value in (overrides or {}).items():
+        settings.set(name, value, priority="cmdline")
+    return spider_cls, settings
+
+
+class AsyncioEngine:
+    """Обхід одного паука: черга запитів з пріоритетами, N воркерів, pipeline в тому ж циклі"""
+
+    def __init__(self, spider, settings):
+        self.spider = spider
+        self.settings = settings
+        self.concurrency = settings.getint("ENGINE_CONCURRENCY") or settings.getint("CONCURRENT_REQUESTS_PER_DOMAIN", 4)
+        self.delay = settings.getfloat("DOWNLOAD_DELAY", 0)
+        self.randomize_delay = settings.getbool("RANDOMIZE_DOWNLOAD_DELAY", True)
+        self.timeout = settings.getfloat("DOWNLOAD_TIMEOUT", 30)
+        self.retry_times = settings.getint("RETRY_TIMES", 2) if settings.getbool("RETRY_ENABLED", True) else 0
+        self.retry_codes = {int(code) for code in settings.getlist("RETRY_HTTP_CODES")}
+        self.obey_robots = settings.getbool("ROBOTSTXT_OBEY", False)
+
+        headers = {k: v for k, v in settings.getdict("DEFAULT_REQUEST_HEADERS").items() if k.lower() not in SKIPPED_DEFAULT_HEADERS}
+        headers["User-Agent"] = settings.get("USER_AGENT")
+        self.default_headers = headers
+
+        self.queue = asyncio.PriorityQueue()
+        self._sequence = itertools.count()
+        self.seen_requests = set()
+        self.robots = {}
+        self.next_slot = {}
+        self.host_locks = {}
+        self.session = None
+
+        self.pipelines = [load_object(path)() for path, _order in sorted(
+            settings.getdict("ITEM_PIPELINES").items(), key=lambda entry: entry[1]
+        ) if _order is not None]
+        self.timing = CallbackTimingMiddleware()
+        self.timer = get_stage_timer(spider)
+        self.stats = {"requests": 0, "responses": 0, "bytes": 0, "retries": 0, "errors": 0,
+                      "robots_forbidden": 0, "items_scraped": 0, "items_dropped": 0, "statuses": {}}
+
+        # Пауза воркерів за RSS (BackpressureController, як BackpressureExtension у Scrapy)
+        self.backpressure = None
+        self.in_flight = 0
+        self.resumed = asyncio.Event()
+        self.resumed.set()
+        if settings.getbool("BACKPRESSURE_ENABLED", True) and settings.getfloat("BACKPRESSURE_MAX_RSS_MB", 0):
+            self.backpressure = BackpressureController(
+                max_rss_mb=settings.getfloat("BACKPRESSURE_MAX_RSS_MB"),
+                resume_ratio=settings.getfloat("BACKPRESSURE_RESUME_RATIO", 0.8),
+            )
+            spider.backpressure = self.backpressure
+
+    # ------------------------------------------------------------------
+    # ЧЕРГА
+    # ------------------------------------------------------------------
+
+    def schedule(self, request):
+        if not request.dont_filter:
+            key = (request.method, request.url, request.body)
+            if key in self.seen_requests:
+                return
+            self.seen_requests.add(key)
+        # PriorityQueue: менше значення — раніше; у Scrapy більший priority — раніше
+        self.queue.put_nowait((-request.priority, next(self._sequence), request))
+
+    async def run(self):
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.concurrency, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=self.default_headers) as session:
+            self.session = session
+            for pipeline in self.pipelines:
+                pipeline.open_spider(self.spider)
+            for request in self.spider.start_requests():
+                self.schedule(request)
+
+            workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+            if self.backpressure is not None:
+                workers.append(asyncio.create_task(self._backpressure_monitor()))
+            try:
+                while True:
+                    await self.queue.join()
+                    if not await self._schedule_deferred_retries():
+                        break
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _schedule_deferred_retries(self):
+        """Черга порожня — чекаємо найближчий відкладений повтор (як spider_idle у Scrapy)"""
+        if self.spider._deadline_stops_retries():
+            return False
+        pending = self.spider.deferred_retry_queue
+        if not pending:
+            return False
+        await asyncio.sleep(max(0.0, min(when for when, _entry in pending) - time.monotonic()))
+        for request in self.spider._due_deferred_retries():
+            self.schedule(request)
+        return True
+
+    async def _worker(self):
+        while True:
+            _priority, _sequence, request = await self.queue.get()
+            try:
+                await self.resumed.wait()
+                self.in_flight += 1
+                try:
+                    await self._process(request)
+                finally:
+                    self.in_flight -= 1
+            except Exception:
+                logger.exception(f"❌ Помилка обробки {request.url}")
+            finally:
+                self.queue.task_done()
+
+    async def _backpressure_monitor(self):
+        interval = self.settings.getfloat("BACKPRESSURE_INTERVAL", 1.0)
+        while True:
+            await asyncio.sleep(interval)
+            depths = {"queue": self.queue.qsize(), "in_flight": self.in_flight}
+            was_paused = self.backpressure.paused
+            paused = self.backpressure.update(current_rss_mb(), depths, drained=not self.in_flight)
+            if paused and not was_paused:
+                self.resumed.clear()
+                logger.warning(f"🚦 Пауза нових запитів: {self.backpressure.reason} (в роботі {self.in_flight}, у черзі {depths['queue']})")
+            elif was_paused and not paused:
+                self.resumed.set()
+                logger.info("🚦 Продовження запитів")
+
+    # ------------------------------------------------------------------
+    # ЗАВАНТАЖЕННЯ
+    # ------------------------------------------------------------------
+
+    async def _process(self, request):
+        if self.obey_robots and not await self._allowed_by_robots(request):
+            self.stats["robots_forbidden"] += 1
+            logger.debug(f"🚫 Заборонено robots.txt: {request.url}")
+            return
+
+        attempt = 0
+        while True:
+            try:
+                response = await self._fetch(request)
+            except Exception as e:
+                if attempt < self.retry_times:
+                    attempt += 1
+                    self.stats["retries"] += 1
+                    continue
+                self.stats["errors"] += 1
+                self._run_errback(request, e)
+                return
+            if response.status in self.retry_codes and attempt < self.retry_times:
+                attempt += 1
+                self.stats["retries"] += 1
+                continue
+            break
+
+        if not 200 <= response.status < 300:
+            self._run_errback(request, HttpError(response, f"Ignoring non-200 response ({response.status})"))
+            return
+        self._run_callback(request.callback or self.spider.parse, response)
+
+    async def _fetch(self, request):
+        host = urlparse_cached(request).hostname or ""
+        await self._wait_slot(host)
+
+        headers = {k.decode(): b", ".join(v).decode("latin-1") for k, v in request.headers.items()}
+        self.stats["requests"] += 1
+        started = time.monotonic()
+        async with self.session.request(request.method, request.url, data=request.body or None, headers=headers) as raw:
+            body = await raw.read()
+            request.meta["download_latency"] = time.monotonic() - started
+            response = HtmlResponse(
+                url=str(raw.url),
+                status=raw.status,
+                headers=Headers({k: v for k, v in raw.headers.items()}),
+                body=body,
+                request=request,
+                protocol=f"HTTP/{raw.version.major}.{raw.version.minor}",
+            )
+        self.stats["responses"] += 1
+        self.stats["bytes"] += len(body)
+        self.stats["statuses"][response.status] = self.stats["statuses"].get(response.status, 0) + 1
+        return response
+
+    async def _wait_slot(self, host):
+        """DOWNLOAD_DELAY між стартами запитів до хоста (з розкидом 0.5–1.5, як у Scrapy)"""
+        if not self.delay:
+            return
+        lock = self.host_locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            wait = self.next_slot.get(host, now) - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+            delay = self.delay * random.uniform(0.5, 1.5) if self.randomize_delay else self.delay
+            self.next_slot[host] = time.monotonic() + delay
+
+    async def _allowed_by_robots(self, request):
+        parsed = urlparse_cached(request)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        # Один запит robots.txt на хост, решта воркерів чекають його результат
+        if origin not in self.robots:
+            self.robots[origin] = asyncio.ensure_future(self._load_robots(origin))
+        robots = await self.robots[origin]
+        return robots is None or robots.can_fetch(request.url, self.settings.get("USER_AGENT"))
+
+    async def _load_robots(self, origin):
+        from protego import Protego
+
+        try:
+            async with self.session.get(f"{origin}/robots.txt") as raw:
+                body = await raw.text(errors="replace") if raw.status == 200 else ""
+            return Protego.parse(body)
+        except Exception as e:
+            logger.warning(f"⚠️ robots.txt {origin} недоступний: {e}")
+            return None
+
+    # ------------------------------------------------------------------
+    # CALLBACK'И ТА PIPELINE
+    # ------------------------------------------------------------------
+
+    def _run_errback(self, request, exception):
+        if request.errback is None:
+            logger.error(f"❌ {request.url}: {exception}")
+            return
+        failure = Failure(exception)
+        failure.request = request
+        self._consume(request.errback(failure), None)
+
+    def _run_callback(self, callback, response):
+        self._consume(callback(response), response)
+
+    def _consume(self, output, response):
+        if output is None:
+            return
+        if response is not None:
+            output = self.timing.process_spider_output(response, output, self.spider)
+        for result in output:
+            if isinstance(result, Request):
+                self.schedule(result)
+            elif is_item(result):
+                self._process_item(result, response)
+
+    def _process_item(self, item, response):
+        try:
+            with self.timer.measure("pipeline:total"):
+                for pipeline in self.pipelines:
+                    item = pipeline.process_item(item, self.spider)
+            self.stats["items_scraped"] += 1
+        except DropItem:
+            self.stats["items_dropped"] += 1
+        except Exception:
+            # Як у Scrapy (item_error): помилка одного item не зупиняє решту виводу callback'а
+            logger.exception(f"❌ Помилка pipeline для item з {response.url if response is not None else 'errback'}")
+            self.stats["errors"] += 1
+            return
+        self.spider._on_item_scraped(item, response, self.spider)
+
+    # ------------------------------------------------------------------
+    # ЗАВЕРШЕННЯ
+    # ------------------------------------------------------------------
+
+    def close(self, reason, elapsed, cpu):
+        for pipeline in self.pipelines:
+            pipeline.close_spider(self.spider)
+        self.spider.closed(reason)
+        self._write_report(reason, elapsed, cpu)
+
+    def _write_report(self, reason, elapsed, cpu):
+        stats = self.stats
+        items = stats["items_scraped"]
+        report = {
+            "spider": self.spider.name,
+            "engine": "asyncio",
+            "finish_reason": reason,
+            "finished_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "elapsed_s": round(elapsed, 3),
+            "cpu_s": round(cpu, 3),
+            "cpu_ms_per_item": round(cpu / items * 1000, 3) if items else None,
+            "responses": stats["responses"],
+            "responses_per_s": round(stats["responses"] / elapsed, 3) if elapsed > 0 else 0.0,
+            "bytes": stats["bytes"],
+            "items_scraped": items,
+            "items_dropped": stats["items_dropped"],
+            "items_per_s": round(items / elapsed, 3) if elapsed > 0 else 0.0,
+            "engine_stats": {
+                "concurrency": self.concurrency,
+                "requests": stats["requests"],
+                "retries": stats["retries"],
+                "errors": stats["errors"],
+                "robots_forbidden": stats["robots_forbidden"],
+                "statuses": {str(k): v for k, v in sorted(stats["statuses"].items())},
+            },
+            "stages": self.timer.report(),
+        }
+        deadline = self.spider.deadline_report()
+        if deadline is not None:
+            report["deadline"] = deadline
+        if self.backpressure is not None:
+            report["backpressure"] = self.backpressure.report()
+        output_dir = Path(self.settings.get("METRICS_OUTPUT_DIR", OUTPUT_DIR))
+        report_path = output_dir / f"{getattr(self.spider, 'run_name', self.spider.name)}_metrics.json"
+        try:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            with open(report_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            logger.info(f"📈 Звіт метрик: {report_path}")
+        except OSError as e:
+            logger.warning(f"⚠️ Не вдалося записати звіт метрик {report_path}: {e}")
+
+
+def crawl(spider_name, settings_overrides=None, spider_kwargs=None):
+    """Запуск паука asyncio-рушієм; True якщо обхід завершився без винятку"""
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        raise ImportError("❌ --engine asyncio потребує пакет aiohttp: pip install aiohttp")
+
+    spider_cls, settings = load_settings(spider_name, settings_overrides)
+    if not getattr(spider_cls, "asyncio_engine", False):
+        raise ValueError(f"❌ {spider_name} не підтримує --engine asyncio (логін, JS або Playwright) — запускайте через Scrapy")
+    if settings.get("REPLAY_MODE"):
+        raise ValueError("❌ REPLAY_MODE підтримується лише рушієм Scrapy")
+
+    # Паралельні ланцюги товарів під кількість воркерів
+    concurrency = settings.getint("ENGINE_CONCURRENCY") or settings.getint("CONCURRENT_REQUESTS_PER_DOMAIN", 4)
+    if "PRODUCT_LANES" not in (settings_overrides or {}):
+        settings.set("PRODUCT_LANES", concurrency, priority="cmdline")
+
+    spider = spider_cls(**(spider_kwargs or {}))
+    spider.settings = settings
+    if spider.extractor_class is not None:
+        logger.info(f"🧩 HTML-бекенд екстрактора: {spider.extractor.backend.name}")
+    engine = AsyncioEngine(spider, settings)
+
+    runner_kwargs = {}
+    if settings.getbool("ENGINE_UVLOOP", True):
+        try:
+            import uvloop
+            runner_kwargs["loop_factory"] = uvloop.new_event_loop
+        except ImportError:
+            pass
+    logger.info(
+        f"⚡ asyncio-рушій: {spider_name}, воркерів {engine.concurrency}, "
+        f"цикл {'uvloop' if runner_kwargs else 'asyncio'}"
+    )
+
+    # Жорстка межа як CLOSESPIDER_TIMEOUT у Scrapy (CRAWL_DEADLINE + DEADLINE_GRACE)
+    hard_timeout = settings.getfloat("CLOSESPIDER_TIMEOUT") or parse_duration(settings.get("CRAWL_DEADLINE"))
+    if hard_timeout and not settings.getfloat("CLOSESPIDER_TIMEOUT"):
+        hard_timeout += settings.getfloat("DEADLINE_GRACE", 120)
+
+    reason = "finished"
+    started, cpu_started = time.monotonic(), time.process_time()
+    try:
+        with asyncio.Runner(**runner_kwargs) as runner:
+            runner.run(asyncio.wait_for(engine.run(), hard_timeout or None))
+        if spider.deadline_reached:
+            reason = "deadline"
+    except TimeoutError:
+        reason = "closespider_timeout"
+    except KeyboardInterrupt:
+        reason = "shutdown"
+    finally:
+        engine.close(reason, time.monotonic() - started, time.process_time() - cpu_started)
+    return reason in ("finished", "deadline")
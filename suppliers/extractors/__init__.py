@@ -0,0 +1,13 @@
+"""
+Екстрактори сторінок постачальників: селектори скомпільовані при імпорті,
+одна функція на сторінку → типізований запис (CategoryPage / ProductPage).
+"""
+from suppliers.extractors.base import CategoryPage, PageExtractor, ProductPage
+from suppliers.extractors.eserver import EserverExtractor
+from suppliers.extractors.secur import SecurExtractor
+from suppliers.extractors.viatec import ViatecExtractor
+
+__all__ = [
+    'CategoryPage', 'PageExtractor', 'ProductPage',
+    'EserverExtractor', 'SecurExtractor', 'ViatecExtractor',
+]
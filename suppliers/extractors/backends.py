@@ -0,0 +1,237 @@
+"""
+HTML-бекенди екстракторів: дерево сторінки та виконання селекторів.
+
+Екстрактори описують селектори як CSS (з ::text / ::attr(), як response.css) і
+працюють лише через операції бекенда, тож той самий код розбору виконується на
+різних парсерах:
+
+    lxml   — дерево parsel/lxml відповіді (response.selector), CSS → XPath;
+    lexbor — selectolax (LexborHTMLParser), швидший розбір HTML5 і нативний CSS.
+
+Бекенд обирається налаштуванням EXTRACTOR_BACKEND (для паука — custom_settings
+або -s EXTRACTOR_BACKEND=lexbor). selectolax — необов'язкова залежність:
+pip install selectolax. Рівність записів обох бекендів на фікстурах перевіряє
+tests/test_extractor_backends.py.
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+from cssselect.xpath import GenericTranslator
+from lxml import etree
+from parsel.csstranslator import HTMLTranslator
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+
+_translator = HTMLTranslator()
+_PSEUDO = re.compile(r'::(text|attr\(([^)]+)\))$')
+
+
+class Query:
+    """Селектор екстрактора: CSS з ::text / ::attr(); компілюється кожним бекендом один раз"""
+
+    __slots__ = ("query", "contains", "compiled")
+
+    def __init__(self, query: str, contains: Optional[str] = None):
+        self.query = query
+        # Лише елементи, перший власний текст яких містить рядок (XPath contains(text(), …))
+        self.contains = contains
+        self.compiled = {}
+
+    def __repr__(self):
+        return f"css({self.query!r})" if self.contains is None else f"css({self.query!r}, contains={self.contains!r})"
+
+
+def css(query: str, contains: Optional[str] = None) -> Query:
+    """Селектор з семантикою response.css(query); lxml-варіант компілюється одразу при імпорті"""
+    selector = Query(query, contains)
+    LXML.compile(selector)
+    return selector
+
+
+def _split_groups(query: str) -> List[str]:
+    """Групи селектора через кому (поза [] та ())"""
+    groups, depth, start = [], 0, 0
+    for i, char in enumerate(query):
+        if char in "[(":
+            depth += 1
+        elif char in "])":
+            depth -= 1
+        elif char == "," and depth == 0:
+            groups.append(query[start:i].strip())
+            start = i + 1
+    groups.append(query[start:].strip())
+    return groups
+
+
+def parse_query(query: str) -> Tuple[str, Optional[str], Optional[str]]:
+    """CSS → (селектор елементів, псевдоелемент text/attr або None, ім'я атрибута)"""
+    parsed = set()
+    selectors = []
+    for group in _split_groups(query):
+        match = _PSEUDO.search(group)
+        if match:
+            pseudo = "text" if match.group(1) == "text" else "attr"
+            parsed.add((pseudo, match.group(2)))
+            group = group[:match.start()].strip()
+        else:
+            parsed.add((None, None))
+        selectors.append(group)
+    if len(parsed) > 1:
+        raise ValueError(f"❌ Різні псевдоелементи в групах селектора: {query!r}")
+    pseudo, argument = parsed.pop()
+    return ", ".join(selectors), pseudo, argument
+
+
+class HtmlBackend:
+    """Дерево сторінки та операції над ним, з яких складаються екстрактори"""
+
+    name = ""
+
+    def compile(self, query: Query):
+        compiled = query.compiled.get(self.name)
+        if compiled is None:
+            compiled = query.compiled[self.name] = self._compile(query)
+        return compiled
+
+    def _compile(self, query: Query):
+        raise NotImplementedError
+
+    def root(self, response):
+        """Корінь дерева відповіді (елемент <html>)"""
+        raise NotImplementedError
+
+    def select(self, node, query: Query) -> list:
+        """Результати селектора від вузла (сам вузол і нащадки): рядки ::text/::attr() або елементи"""
+        raise NotImplementedError
+
+    def html(self, node) -> str:
+        """HTML елемента без хвостового тексту (як Selector.get())"""
+        raise NotImplementedError
+
+    def own_text(self, node) -> List[str]:
+        """Текстові вузли — прямі нащадки елемента (XPath text())"""
+        raise NotImplementedError
+
+    def parent(self, node):
+        raise NotImplementedError
+
+
+class LxmlBackend(HtmlBackend):
+    """Дерево parsel/lxml: будується один раз і кешується в response.selector"""
+
+    name = "lxml"
+    _own_text = etree.XPath("text()", smart_strings=False)
+
+    def _compile(self, query: Query):
+        path = _translator.css_to_xpath(query.query)
+        if query.contains is not None:
+            if parse_query(query.query)[1] is not None or len(_split_groups(query.query)) > 1:
+                raise ValueError(f"❌ contains= лише для одного селектора елементів: {query!r}")
+            path += f"[contains(text(), {GenericTranslator.xpath_literal(query.contains)})]"
+        return etree.XPath(path, smart_strings=False)
+
+    def root(self, response):
+        return response.selector.root
+
+    def select(self, node, query: Query) -> list:
+        return query.compiled["lxml"](node)
+
+    def html(self, node) -> str:
+        return etree.tostring(node, method="html", encoding="unicode", with_tail=False)
+
+    def own_text(self, node) -> List[str]:
+        return self._own_text(node)
+
+    def parent(self, node):
+        return node.getparent()
+
+
+class LexborBackend(HtmlBackend):
+    """Дерево selectolax/lexbor: розбір response.text без побудови lxml-дерева"""
+
+    name = "lexbor"
+
+    def __init__(self):
+        if LexborHTMLParser is None:
+            raise ValueError("❌ EXTRACTOR_BACKEND=lexbor потребує selectolax: pip install selectolax")
+
+    def _compile(self, query: Query):
+        selector, pseudo, argument = parse_query(query.query)
+        if query.contains is not None and (pseudo is not None or "," in selector):
+            raise ValueError(f"❌ contains= лише для одного селектора елементів: {query!r}")
+        # "" та "*" — сам вузол і всі нащадки (descendant-or-self::*)
+        return (selector if selector not in ("", "*") else None), pseudo, argument, "," in selector
+
+    def root(self, response):
+        return LexborHTMLParser(response.text).root
+
+    def select(self, node, query: Query) -> list:
+        selector, pseudo, argument, grouped = self.compile(query)
+
+        if pseudo == "text" and selector is None:
+            return [n.text_content for n in node.traverse(include_text=True) if n.tag == "-text"]
+
+        elements = node.css(selector) if selector is not None else list(node.traverse())
+        if grouped:
+            # Елемент, що підходить під кілька груп, lexbor повертає кілька разів; XPath union — раз
+            unique = {}
+            for element in elements:
+                unique.setdefault(element.mem_id, element)
+            elements = list(unique.values())
+
+        if pseudo == "text":
+            return [
+                n.text_content
+                for element in elements
+                for n in element.iter(include_text=True) if n.tag == "-text"
+            ]
+
+        if pseudo == "attr":
+            values = []
+            for element in elements:
+                attributes = element.attributes
+                if argument in attributes:
+                    value = attributes[argument]
+                    # Атрибут без значення (<input disabled>): lxml повертає його ім'я
+                    values.append(argument if value is None else value)
+            return values
+
+        if query.contains is not None:
+            elements = [e for e in elements if self._first_text_contains(e, query.contains)]
+        return elements
+
+    def _first_text_contains(self, node, needle: str) -> bool:
+        for n in node.iter(include_text=True):
+            if n.tag == "-text":
+                return needle in n.text_content
+        return False
+
+    def html(self, node) -> str:
+        # lexbor серіалізує U+00A0 як &nbsp;, lxml — символом
+        return node.html.replace("&nbsp;", "\u00a0")
+
+    def own_text(self, node) -> List[str]:
+        return [n.text_content for n in node.iter(include_text=True) if n.tag == "-text"]
+
+    def parent(self, node):
+        return node.parent
+
+
+LXML = LxmlBackend()
+
+BACKENDS = {"lxml": LxmlBackend, "lexbor": LexborBackend}
+_instances: Dict[str, HtmlBackend] = {"lxml": LXML}
+
+
+def get_backend(name: str) -> HtmlBackend:
+    """Бекенд за ім'ям (EXTRACTOR_BACKEND); ValueError для невідомого або без selectolax"""
+    backend = _instances.get(name)
+    if backend is None:
+        if name not in BACKENDS:
+            raise ValueError(f"❌ Невідомий EXTRACTOR_BACKEND={name!r}, доступні: {', '.join(BACKENDS)}")
+        backend = _instances[name] = BACKENDS[name]()
+    return backend
@@ -0,0 +1,74 @@
+"""
+Спільне для екстракторів сторінок постачальників.
+
+Селектори кожного постачальника оголошуються при імпорті модуля як css() з
+семантикою response.css (::text, ::attr()) і компілюються HTML-бекендом
+(suppliers/extractors/backends.py: lxml за замовчуванням, lexbor через
+EXTRACTOR_BACKEND). Екстрактор за один виклик повертає запис сторінки — callback'и
+паука, ранні фільтри та кеш контенту беруть поля з нього, а не шукають їх у дереві
+повторно.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from suppliers.extractors.backends import Query, css, get_backend
+
+@dataclass
+class CategoryPage:
+    """Сторінка категорії"""
+    product_links: List[str] = field(default_factory=list)
+    # (статус, посилання) карток товарів — для раннього фільтра наявності
+    cards: List[Tuple[Optional[str], List[str]]] = field(default_factory=list)
+    next_page: Optional[str] = None
+
+
+@dataclass
+class ProductPage:
+    """Сторінка товару: значення з розмітки, нормалізація (ціна, наявність) — в пауку"""
+    name: Optional[str] = None
+    description: str = ""
+    specifications: List[Dict[str, str]] = field(default_factory=list)
+    sku: Optional[str] = None
+    price: Optional[str] = None
+    availability: Optional[str] = None
+    images: List[str] = field(default_factory=list)
+    manufacturer: str = ""
+    # Посилання перемикача мов: {"ua": ..., "ru": ...}
+    links: Dict[str, Optional[str]] = field(default_factory=dict)
+    # Сирі блоки JSON-LD (розбираються лише коли полів немає в розмітці)
+    json_ld: List[str] = field(default_factory=list)
+
+
+class PageExtractor:
+    """Екстрактор сторінок одного постачальника на обраному HTML-бекенді"""
+
+    supplier_id = ""
+
+    def __init__(self, backend: str = "lxml"):
+        self.backend = get_backend(backend)
+
+    def root(self, response):
+        """Корінь дерева відповіді (lxml — кешується в response.selector)"""
+        return self.backend.root(response)
+
+    def select(self, nodes, query: Query) -> list:
+        """Результати query для вузла або списку вузлів (як .css() на SelectorList)"""
+        if not isinstance(nodes, list):
+            return self.backend.select(nodes, query)
+        results = []
+        for node in nodes:
+            results.extend(self.backend.select(node, query))
+        return results
+
+    def first(self, nodes, query: Query) -> Optional[str]:
+        """Перший результат (як .get()): рядок ::text / ::attr() або HTML елемента"""
+        results = self.select(nodes, query)
+        if not results:
+            return None
+        return results[0] if isinstance(results[0], str) else self.backend.html(results[0])
+
+    def category(self, response) -> CategoryPage:
+        raise NotImplementedError
+
+    def product(self, response) -> ProductPage:
+        raise NotImplementedError
@@ -0,0 +1,157 @@
+"""
+Екстрактор сторінок e-server.com.ua
+"""
+import logging
+import re
+from typing import Dict, List
+
+from suppliers.descriptions import sanitize
+from suppliers.extractors.base import CategoryPage, PageExtractor, ProductPage, css
+
+
+logger = logging.getLogger(__name__)
+
+# Категорія: сайт використовує різні URL структури карток (з -detail та без)
+PRODUCT_LINKS = css("div[class*='card'] a[href*='/uk/']::attr(href)")
+NEXT_PAGE = css("li.next a::attr(href)")
+
+# Товар
+NAME = css("h1.es-h1::text")
+NAME_FALLBACK = css("h1::text")
+PRICE = css("div.flex.items-end.font-bold.text-23px::text")
+PRICE_FALLBACK = css("div[class*='price']::text")
+
+# Перемикач мов: <a href="/uk/..."><div>Укр</div></a>, <a href="/servernye-shkafy/..."><div>Рус</div></a>
+LANG_UA = css("div.langs_langs__QyR6J a[href*='/uk/']::attr(href)")
+LANG_RU = css("div.langs_langs__QyR6J a:not([href*='/uk/'])::attr(href)")
+
+AVAILABILITY = css("div.product_ag-sts__x60QA")
+TEXT = css("::text")
+ALL_TEXT = css("*::text")
+STATUS_BLOCKS = css("div[class*='status'], div[class*='stock'], div[class*='available']")
+PRODUCT_BLOCK = css("div[class*='product']")
+DEFAULT_AVAILABILITY = "В наявності"
+
+IMAGE_SRCSET = css("img[alt*='фото']::attr(srcset)")
+IMAGE_SRC = css("img[alt*='фото']::attr(src)")
+IMAGE_STORAGE = css("img[src*='storage']::attr(src)")
+SRCSET_URL = re.compile(r'(https?://[^\s]+)\s+\d+w')
+
+MANUFACTURER_UA = css("div", contains="Виробник")
+MANUFACTURER_RU = css("div", contains="Производитель")
+LINK_TEXT = css("a::text")
+
+SPEC_CONTAINER = css("div.bg-white")
+SPEC_ROWS = css("div.flex.justify-between.mx-3")
+SPEC_NAME = css("div.font-semibold::text")
+SPEC_VALUE = css("div.text-right::text, div.whitespace-pre-line::text")
+SPEC_VALUE_FALLBACK = css("div.font-medium::text")
+
+DESCRIPTION = css("div.product_pg-dsc__h3fai")
+
+
+class EserverExtractor(PageExtractor):
+    supplier_id = "eserver"
+
+    def category(self, response) -> CategoryPage:
+        root = self.root(response)
+        return CategoryPage(
+            product_links=self.select(root, PRODUCT_LINKS),
+            next_page=self.first(root, NEXT_PAGE),
+        )
+
+    def product(self, response) -> ProductPage:
+        root = self.root(response)
+        name = self.first(root, NAME) or self.first(root, NAME_FALLBACK)
+        image = self._image(root, response)
+        return ProductPage(
+            name=name.strip() if name else "",
+            description=self._description(root),
+            specifications=self._specifications(root, response.url),
+            price=self.first(root, PRICE) or self.first(root, PRICE_FALLBACK),
+            availability=self._availability(root, response.url),
+            images=[image] if image else [],
+            manufacturer=self._manufacturer(root),
+            links={"ua": self.first(root, LANG_UA), "ru": self.first(root, LANG_RU)},
+        )
+
+    def _availability(self, root, url) -> str:
+        """Наявність: блок статусу → будь-який текст про наявність → блоки status/stock/available"""
+        availability_raw = ""
+
+        element = self.select(root, AVAILABILITY)
+        if element:
+            availability_raw = " ".join(t.strip() for t in self.select(element, TEXT) if t.strip())
+            logger.info(f"📦 Наявність (селектор 1): '{availability_raw}'")
+
+        if not availability_raw:
+            for text in self.select(root, ALL_TEXT):
+                text_lower = text.lower().strip()
+                if "наявност" in text_lower or "налич" in text_lower:
+                    availability_raw = text.strip()
+                    logger.info(f"📦 Наявність (селектор 2 - пошук): '{availability_raw}'")
+                    break
+
+        if not availability_raw:
+            for block in self.select(root, STATUS_BLOCKS):
+                text = " ".join(self.select(block, TEXT)).strip()
+                if text:
+                    availability_raw = text
+                    logger.info(f"📦 Наявність (селектор 3 - div): '{availability_raw}'")
+                    break
+
+        if not availability_raw:
+            logger.warning(f"⚠️ НЕ ЗНАЙДЕНО наявності для: {url}")
+            product_section = self.first(root, PRODUCT_BLOCK)
+            if product_section:
+                logger.warning(f"HTML фрагмент: {product_section[:500]}...")
+            # За замовчуванням вважаємо В НАЯВНОСТІ (бо в категорії фільтр only-inStock)
+            availability_raw = DEFAULT_AVAILABILITY
+
+        return availability_raw
+
+    def _manufacturer(self, root) -> str:
+        """Виробник з блоку «Виробник: <a>EServer™</a>» (RU — «Производитель»)"""
+        blocks = self.select(root, MANUFACTURER_UA) or self.select(root, MANUFACTURER_RU)
+        if blocks:
+            manufacturer = self.first(blocks[0], LINK_TEXT)
+            if manufacturer:
+                return manufacturer.strip().replace("™", "").strip()
+        return ""
+
+    def _image(self, root, response) -> str:
+        """Найбільше зображення з srcset, інакше src"""
+        srcset = self.first(root, IMAGE_SRCSET)
+        if srcset:
+            urls = SRCSET_URL.findall(srcset)
+            if urls:
+                return urls[-1]
+
+        image_url = self.first(root, IMAGE_SRC) or self.first(root, IMAGE_STORAGE)
+        if image_url and not image_url.startswith('http'):
+            image_url = response.urljoin(image_url)
+        return image_url or ""
+
+    def _specifications(self, root, url) -> List[Dict[str, str]]:
+        """Характеристики: рядки «назва — значення» (багаторядкові значення через <br>)"""
+        specs = []
+        container = self.select(root, SPEC_CONTAINER)
+        if not container:
+            logger.warning(f"⚠️ Не знайдено контейнер характеристик: {url}")
+            return specs
+
+        for row in self.select(container, SPEC_ROWS):
+            name = self.first(row, SPEC_NAME)
+            name = name.strip() if name else ""
+            value_elements = self.select(row, SPEC_VALUE) or self.select(row, SPEC_VALUE_FALLBACK)
+            value = "<br>".join(v.strip() for v in value_elements if v.strip())
+            if name and value:
+                specs.append({"name": name, "unit": "", "value": value})
+        return specs
+
+    def _description(self, root) -> str:
+        """Текст опису: абзаци через <br>, інакше весь текст блоку (suppliers/descriptions.py)"""
+        container = self.select(root, DESCRIPTION)
+        if not container:
+            return ""
+        return sanitize("".join(self.backend.html(node) for node in container), "text")
@@ -0,0 +1,94 @@
+"""
+Екстрактор сторінок secur.ua (HTTP-версія та відрендерена Playwright — однакова розмітка)
+"""
+import logging
+from typing import Dict, List
+
+from suppliers.descriptions import sanitize
+from suppliers.extractors.base import CategoryPage, PageExtractor, ProductPage, css
+
+
+logger = logging.getLogger(__name__)
+
+# Категорія
+PRODUCT_LINKS = css("div.productsCardsSlider a::attr(href)")
+NEXT_PAGE = css("a.next-button::attr(href)")
+
+# Товар
+NAME = css("h1.title::text")
+PRICE = css("div.currentPrice span.bold::text")
+IMAGES = css("div.productsCardsSlider a img::attr(src)")
+CODE = css("div.productsCardsCode span::text")
+STATUS = css("div.statusWrap::text")
+DESCRIPTION = css("div.content.descr div.item")
+JSON_LD = css('script[type="application/ld+json"]::text')
+
+# Характеристики: <div class="item"><div class="subtitle">Назва</div><div class="inner">…<p>Значення</p>…</div></div>
+# (можуть бути в різних контейнерах — шукаємо глобально)
+SPEC_ITEMS = css('div[class="item"]:has(div[class="subtitle"])')
+SPEC_NAME = css('div[class="subtitle"]::text')
+SPEC_INNER = css('div[class="inner"]')
+TEXT = css("::text")
+
+# Бренд: <div class="subtitle">Бренд</div> поруч з <div class="inner">…<p>Ajax</p>…</div>
+SUBTITLES = css('div[class="subtitle"]')
+BRAND_SUBTITLE = "Бренд"
+INNER_PARAGRAPH_TEXT = css('div[class="inner"] p::text')
+
+
+class SecurExtractor(PageExtractor):
+    supplier_id = "secur"
+
+    def category(self, response) -> CategoryPage:
+        root = self.root(response)
+        return CategoryPage(
+            product_links=self.select(root, PRODUCT_LINKS),
+            next_page=self.first(root, NEXT_PAGE),
+        )
+
+    def product(self, response) -> ProductPage:
+        root = self.root(response)
+        brand = self._brand(root)
+        return ProductPage(
+            name=self.first(root, NAME),
+            description=self._description(root),
+            specifications=self._specifications(root),
+            sku=self.first(root, CODE),
+            price=self.first(root, PRICE),
+            availability=self.first(root, STATUS),
+            images=self.select(root, IMAGES),
+            manufacturer=brand.strip() if brand else "",
+            json_ld=self.select(root, JSON_LD),
+        )
+
+    def _description(self, root) -> str:
+        """HTML опису без style та пробілів між тегами (suppliers/descriptions.py)"""
+        item = self.first(root, DESCRIPTION)
+        return sanitize(item, "html") if item else ""
+
+    def _brand(self, root):
+        """Перший абзац блоку .inner поруч із підзаголовком «Бренд»"""
+        for subtitle in self.select(root, SUBTITLES):
+            if BRAND_SUBTITLE in self.backend.own_text(subtitle):
+                brand = self.first(self.backend.parent(subtitle), INNER_PARAGRAPH_TEXT)
+                if brand is not None:
+                    return brand
+        return None
+
+    def _specifications(self, root) -> List[Dict[str, str]]:
+        specs_list = []
+        items = self.select(root, SPEC_ITEMS)
+        logger.info(f"🔍 Знайдено {len(items)} елементів div.item з характеристиками")
+
+        for item in items:
+            characteristic = self.first(item, SPEC_NAME)
+            if not characteristic:
+                continue
+            value = ' '.join(t.strip() for t in self.select(self.select(item, SPEC_INNER), TEXT) if t.strip())
+            if value:
+                specs_list.append({
+                    "name": characteristic.strip(),
+                    "unit": "",
+                    "value": value.replace('\u00a0', ' ').strip(),
+                })
+        return specs_list
@@ -0,0 +1,115 @@
+"""
+Екстрактор сторінок viatec.ua (retail, dealer, combined — однакова розмітка)
+"""
+import logging
+from typing import Dict, List
+
+from suppliers.descriptions import sanitize
+from suppliers.extractors.base import CategoryPage, PageExtractor, ProductPage, css
+
+
+logger = logging.getLogger(__name__)
+
+# Категорія
+PRODUCT_LINKS = css("a[href*='/product/']::attr(href)")
+CARDS = css("div.catalog-card")
+CARD_STATUS = css(".catalog-card__status::text")
+NEXT_PAGE = css("a.paggination__next::attr(href)")
+PAGE_LINKS = css("a.paggination__page::attr(href)")
+PAGES = css("a.paggination__page")
+ACTIVE_PAGE = css("a.paggination__page--active")
+TEXT = css("::text")
+
+# Товар
+NAME = css("h1::text")
+PRICE = css("div.card-header__card-price-new::text")
+STATUS = css("div.card-header__card-status-badge::text")
+SKU = css("span.card-header__card-articul-text-value::text")
+GALLERY = css('a[data-fancybox*="gallery"]::attr(href)')
+GALLERY_FALLBACK = css("img.card-header__card-images-image::attr(src)")
+
+DESCRIPTION = css("div.card-header__card-info-text")
+
+# Таблиця характеристик: активна вкладка → будь-яка вкладка → будь-яка таблиця вкладок
+SPEC_ROWS = (
+    css("li.card-tabs__item.active div.card-tabs__characteristic-content table tr"),
+    css("div.card-tabs__characteristic-content table tr"),
+    css("ul.card-tabs__list table tr"),
+)
+SPEC_NAME = css("th::text")
+SPEC_VALUE = css("td::text")
+MAX_SPECS = 60
+
+
+class ViatecExtractor(PageExtractor):
+    supplier_id = "viatec"
+
+    def category(self, response) -> CategoryPage:
+        root = self.root(response)
+        return CategoryPage(
+            product_links=self.select(root, PRODUCT_LINKS),
+            cards=[
+                (self.first(card, CARD_STATUS), self.select(card, PRODUCT_LINKS))
+                for card in self.select(root, CARDS)
+            ],
+            next_page=self._next_page(root),
+        )
+
+    def _next_page(self, root):
+        """Посилання «далі», або сторінка після активної в переліку сторінок"""
+        next_page = self.first(root, NEXT_PAGE)
+        if next_page:
+            return next_page
+        all_pages = self.select(root, PAGE_LINKS)
+        active_pages = self.select(root, ACTIVE_PAGE)
+        if all_pages and active_pages:
+            try:
+                active_text = self.first(active_pages[0], TEXT)
+                page_texts = [self.first(page, TEXT) for page in self.select(root, PAGES)]
+                current_idx = page_texts.index(active_text)
+                if current_idx >= 0 and current_idx + 1 < len(all_pages):
+                    return all_pages[current_idx + 1]
+            except (ValueError, IndexError):
+                pass
+        return None
+
+    def product(self, response) -> ProductPage:
+        root = self.root(response)
+        name = self.first(root, NAME)
+        return ProductPage(
+            name=name.strip() if name else "",
+            description=self._description(root, response.url),
+            specifications=self._specifications(root),
+            sku=(self.first(root, SKU) or "").strip(),
+            price=self.first(root, PRICE),
+            availability=self.first(root, STATUS),
+            images=self.select(root, GALLERY) or self.select(root, GALLERY_FALLBACK),
+        )
+
+    def _description(self, root, url) -> str:
+        """Опис зі збереженням переносів <br>: пункти <ul> з «●» або абзаци <p> (suppliers/descriptions.py)"""
+        container = self.select(root, DESCRIPTION)
+        if not container:
+            logger.warning(f"Не знайдено контейнер опису на {url}")
+            return ""
+
+        description = sanitize("".join(self.backend.html(node) for node in container), "items")
+        if not description:
+            logger.warning(f"В контейнері опису не знайдено ні <ul>, ні <p> на {url}")
+        return description
+
+    def _specifications(self, root) -> List[Dict[str, str]]:
+        """Характеристики з таблиці (українські назви на UA сторінці)"""
+        rows = []
+        for query in SPEC_ROWS:
+            rows = self.select(root, query)
+            if rows:
+                break
+
+        specs_list = []
+        for row in rows[:MAX_SPECS]:
+            name = self.first(row, SPEC_NAME)
+            value = self.first(row, SPEC_VALUE)
+            if name and value:
+                specs_list.append({"name": name.strip(), "value": value.strip(), "unit": ""})
+        return specs_list
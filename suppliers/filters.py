@@ -0,0 +1,49 @@
+"""
+Фільтри товарів, спільні для SuppliersPipeline та пауків.
+
+Pipeline відкидає товари без ціни та не в наявності. Пауки перевіряють те саме
+на першій завантаженій сторінці (і на картках категорії), щоб товари, які
+pipeline все одно відкине, не коштували другого запиту, парсингу
+характеристик та маппінгу.
+"""
+from typing import Optional
+
+
+OUT_OF_STOCK_KEYWORDS = (
+    "немає", "немає в наявності", "нет в наличии", "нет на складе",
+    "відсутній", "відсутня", "закінчився", "закінчилась",
+    "out of stock", "unavailable", "под заказ", "під замовлення",
+)
+
+# Причина → ключ статистики pipeline
+NO_PRICE = "filtered_no_price"
+NO_STOCK = "filtered_no_stock"
+
+
+def is_valid_price(price) -> bool:
+    """Ціна є і більша за нуль"""
+    if not price:
+        return False
+    try:
+        price_float = float(str(price).replace(",", ".").replace(" ", ""))
+        return price_float > 0
+    except (ValueError, TypeError):
+        return False
+
+
+def is_in_stock(availability) -> bool:
+    """Порожня наявність вважається «в наявності»"""
+    if not availability:
+        return True
+
+    availability_lower = str(availability).lower().strip()
+    return not any(keyword in availability_lower for keyword in OUT_OF_STOCK_KEYWORDS)
+
+
+def drop_reason(price=None, availability=None) -> Optional[str]:
+    """NO_PRICE / NO_STOCK якщо товар буде відкинуто; None — не перевіряти це поле"""
+    if price is not None and not is_valid_price(price):
+        return NO_PRICE
+    if availability is not None and not is_in_stock(availability):
+        return NO_STOCK
+    return None
@@ -0,0 +1,146 @@
+"""
+Відбитки URL товарів для дедуплікації: в межах прогону, між пауками та між прогонами.
+
+- canonical_url()    — канонічна форма URL: схема/хост у нижньому регістрі, без www,
+                       фрагмента, трекінгових параметрів та мовних префіксів (/ru/)
+- url_fingerprint()  — 64-бітний відбиток канонічного URL (blake2b, знакове int для SQLite)
+- FingerprintSet     — множина відбитків замість множини рядків (processed_products)
+- SeenStore          — SQLite <SEEN_STORE_PATH>: коли товар востаннє був завантажений і з
+                       якої категорії; інкрементальний режим -a skip_seen_hours=N пропускає
+                       свіжі товари, -a discovery=sitemap порівнює з <lastmod>
+
+Простір імен SeenStore за замовчуванням — ім'я паука; viatec_retail та viatec_dealer
+дають однакові відбитки (той самий канонічний URL), тож спільний простір
+(-s SEEN_NAMESPACE=viatec) дедуплікує і між ними.
+"""
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+# Параметри запиту, що не змінюють товар
+TRACKING_PARAMS = {"gclid", "fbclid", "yclid", "_openstat", "ref"}
+TRACKING_PREFIXES = ("utm_",)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (
+    namespace TEXT NOT NULL,
+    fingerprint INTEGER NOT NULL,
+    seen_at REAL NOT NULL,
+    category_url TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (namespace, fingerprint)
+) WITHOUT ROWID;
+"""
+
+
+def strip_url_prefixes(url: str, prefixes: Sequence[str] = ()) -> str:
+    """https://viatec.ua/ru/product/x → https://viatec.ua/product/x (для prefixes=("/ru/",))"""
+    for prefix in prefixes:
+        if prefix in url:
+            return url.replace(prefix, "/", 1)
+    return url
+
+
+def canonical_url(url: str, strip_prefixes: Sequence[str] = ()) -> str:
+    """Канонічна форма URL товару для порівняння (не для завантаження)"""
+    parts = urlsplit(strip_url_prefixes(url.strip(), strip_prefixes))
+    netloc = parts.netloc.lower()
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in TRACKING_PARAMS and not key.startswith(TRACKING_PREFIXES)
+    ))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), netloc, path, query, ""))
+
+
+def url_fingerprint(url: str, strip_prefixes: Sequence[str] = ()) -> int:
+    """64-бітний відбиток канонічного URL (знаковий — вміщується в INTEGER SQLite)"""
+    digest = hashlib.blake2b(canonical_url(url, strip_prefixes).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class FingerprintSet:
+    """Множина товарів за 64-бітними відбитками канонічних URL
+
+    Підтримує той самий інтерфейс, що й set URL (in, add, update, len),
+    тому пауки працюють з нею як з processed_products раніше.
+    """
+
+    def __init__(self, strip_prefixes: Sequence[str] = ()):
+        self.strip_prefixes = tuple(strip_prefixes)
+        self._fingerprints = set()
+
+    def fingerprint(self, url: str) -> int:
+        return url_fingerprint(url, self.strip_prefixes)
+
+    def __contains__(self, url) -> bool:
+        return self._as_fingerprint(url) in self._fingerprints
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def add(self, url):
+        self._fingerprints.add(self._as_fingerprint(url))
+
+    def discard(self, url):
+        self._fingerprints.discard(self._as_fingerprint(url))
+
+    def update(self, urls: Iterable):
+        """URL або готові відбитки (int) — checkpoint зберігає відбитки"""
+        self._fingerprints.update(self._as_fingerprint(url) for url in urls)
+
+    def fingerprints(self) -> set:
+        return set(self._fingerprints)
+
+    def _as_fingerprint(self, url) -> int:
+        return url if isinstance(url, int) else self.fingerprint(url)
+
+
+class SeenStore:
+    """SQLite сховище «товар завантажено в момент t» між прогонами"""
+
+    def __init__(self, path, namespace: str):
+        self.path = Path(path)
+        self.namespace = namespace
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.path))
+        self.connection.executescript(SCHEMA)
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(seen)")}
+        if "category_url" not in columns:
+            self.connection.execute("ALTER TABLE seen ADD COLUMN category_url TEXT NOT NULL DEFAULT ''")
+
+    def recent(self, hours: float) -> Iterator[int]:
+        """Відбитки товарів, завантажених за останні hours годин"""
+        since = time.time() - hours * 3600
+        rows = self.connection.execute(
+            "SELECT fingerprint FROM seen WHERE namespace = ? AND seen_at >= ?",
+            (self.namespace, since),
+        )
+        for (fingerprint,) in rows:
+            yield fingerprint
+
+    def index(self) -> Dict[int, Tuple[float, str]]:
+        """Усі товари простору імен: відбиток → (seen_at, category_url)"""
+        rows = self.connection.execute(
+            "SELECT fingerprint, seen_at, category_url FROM seen WHERE namespace = ?", (self.namespace,)
+        )
+        return {fingerprint: (seen_at, category_url) for fingerprint, seen_at, category_url in rows}
+
+    def mark(self, fingerprints: Dict[int, str], seen_at: float = None):
+        """fingerprints: відбиток → category_url товару"""
+        seen_at = time.time() if seen_at is None else seen_at
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO seen (namespace, fingerprint, seen_at, category_url) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (namespace, fingerprint) DO UPDATE SET "
+                "seen_at = excluded.seen_at, category_url = excluded.category_url",
+                ((self.namespace, fingerprint, seen_at, category_url) for fingerprint, category_url in fingerprints.items()),
+            )
+
+    def close(self):
+        self.connection.close()
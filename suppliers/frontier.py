@@ -0,0 +1,182 @@
+"""
+Черга товарів категорії (frontier) з вивантаженням на диск.
+
+Раніше весь список товарів категорії їхав у meta кожного запиту товару
+(remaining_products), а secur ще й копіював його на кожному кроці — пам'ять
+і копіювання росли з розміром категорії. Тепер список живе в ProductFrontier
+паука, а запит товару несе лише frontier_key.
+
+- push()  — товар з пагінації (url + meta категорії) стає в кінець черги
+- pop()   — наступний товар ланцюга; він «в роботі», доки не викликано done()
+- перші FRONTIER_MEMORY_ITEMS товарів тримаються в пам'яті, решта — в SQLite
+  <FRONTIER_DIR>/<spider>_frontier.sqlite (файл видаляється при закритті)
+
+Порядок FIFO зберігається: після першого вивантаження нові товари йдуть
+на диск, доки диск не спорожніє. push(..., rank) + prioritize() після пагінації
+ставлять товари з більшим rank (частота змін, suppliers/volatility.py) першими;
+однаковий rank — FIFO.
+"""
+import json
+import sqlite3
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS frontier (
+    key INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    meta TEXT NOT NULL,
+    rank REAL NOT NULL DEFAULT 0
+);
+"""
+
+
+class ProductFrontier:
+    """FIFO черга товарів: пам'ять + SQLite для надлишку"""
+
+    def __init__(self, path: Optional[Path] = None, memory_items: int = 1000):
+        # Без шляху (офлайн-бенчмарк, тести) — тільки пам'ять
+        self.path = Path(path) if path else None
+        self.memory_items = max(1, memory_items)
+        self.memory = deque()
+        self.in_progress = {}
+        # key → rank товарів у пам'яті з ненульовим rank; ranked — такі товари є (і на диску)
+        self.ranks = {}
+        self.ranked = False
+        self.connection = None
+        self.spilled = 0
+        self.spilled_total = 0
+        self._next_key = 0
+
+    def __len__(self) -> int:
+        """Кількість товарів у черзі (без тих, що в роботі)"""
+        return len(self.memory) + self.spilled
+
+    def push(self, url: str, meta: Dict, rank: float = 0.0) -> int:
+        key = self._next_key
+        self._next_key += 1
+        self.ranked = self.ranked or bool(rank)
+        if self.path is not None and (self.spilled or len(self.memory) >= self.memory_items):
+            self._spill(key, url, meta, rank)
+        else:
+            self.memory.append((key, url, meta))
+            if rank:
+                self.ranks[key] = rank
+        return key
+
+    def prioritize(self):
+        """Впорядковує чергу за rank (спадання), однаковий rank — FIFO
+
+        Викликається після пагінації категорії, перед запуском ланцюга.
+        """
+        if not self.ranked:
+            return
+        if self.spilled:
+            # Порядок тримає ORDER BY на диску — пам'ять переноситься туди ж
+            for key, url, meta in self.memory:
+                self._spill(key, url, meta, self.ranks.get(key, 0.0))
+            self.memory.clear()
+            self.ranks.clear()
+            return
+        self.memory = deque(sorted(self.memory, key=lambda entry: (-self.ranks.get(entry[0], 0.0), entry[0])))
+
+    def pop(self) -> Optional[Tuple[int, str, Dict]]:
+        """Наступний товар (key, url, meta) або None якщо черга порожня"""
+        if not self.memory and self.spilled:
+            self._refill()
+        if not self.memory:
+            return None
+        key, url, meta = self.memory.popleft()
+        self.ranks.pop(key, None)
+        self.in_progress[key] = (url, meta)
+        return key, url, meta
+
+    def get(self, key: int) -> Optional[Tuple[str, Dict]]:
+        """Товар, що зараз в роботі: (url, meta)"""
+        return self.in_progress.get(key)
+
+    def done(self, key: Optional[int]):
+        self.in_progress.pop(key, None)
+
+    def pending(self) -> Iterator[Tuple[str, Dict]]:
+        """Усі незавершені товари по порядку: в роботі, в пам'яті, на диску"""
+        for url, meta in self.in_progress.values():
+            yield url, meta
+        for _key, url, meta in self.memory:
+            yield url, meta
+        if self.spilled:
+            for url, meta in self.connection.execute("SELECT url, meta FROM frontier ORDER BY rank DESC, key"):
+                yield url, json.loads(meta)
+
+    def clear(self):
+        self.memory.clear()
+        self.in_progress.clear()
+        self.ranks.clear()
+        self.ranked = False
+        if self.spilled:
+            self.connection.execute("DELETE FROM frontier")
+            self.spilled = 0
+
+    def discard_queued(self) -> int:
+        """Прибирає товари черги (не ті, що в роботі); повертає їх кількість"""
+        count = len(self)
+        self.memory.clear()
+        self.ranks.clear()
+        if self.spilled:
+            self.connection.execute("DELETE FROM frontier")
+            self.spilled = 0
+        return count
+
+    def close(self):
+        """Видаляє файл вивантаження
+
+        Незавершені товари переносяться в пам'ять — checkpoint при закритті
+        паука зберігається вже після Spider.closed().
+        """
+        if self.spilled:
+            self.memory.extend(
+                (key, url, json.loads(meta))
+                for key, url, meta in self.connection.execute("SELECT key, url, meta FROM frontier ORDER BY rank DESC, key")
+            )
+            self.spilled = 0
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+            self.path.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # SQLite
+    # ------------------------------------------------------------------
+
+    def _connect(self):
+        if self.connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.unlink(missing_ok=True)
+            # Файл тимчасовий: без журналу та fsync, він не переживає процес
+            self.connection = sqlite3.connect(str(self.path), isolation_level=None)
+            self.connection.execute("PRAGMA journal_mode=OFF")
+            self.connection.execute("PRAGMA synchronous=OFF")
+            self.connection.executescript(SCHEMA)
+        return self.connection
+
+    def _spill(self, key, url, meta, rank=0.0):
+        self._connect().execute(
+            "INSERT INTO frontier (key, url, meta, rank) VALUES (?, ?, ?, ?)",
+            (key, url, json.dumps(meta, ensure_ascii=False), rank),
+        )
+        self.spilled += 1
+        self.spilled_total += 1
+
+    def _refill(self):
+        """Підвантажує наступну порцію з диску в пам'ять"""
+        rows = self.connection.execute(
+            "SELECT key, url, meta FROM frontier ORDER BY rank DESC, key LIMIT ?", (self.memory_items,)
+        ).fetchall()
+        if not rows:
+            self.spilled = 0
+            return
+        self.connection.executemany("DELETE FROM frontier WHERE key = ?", ((key,) for key, _url, _meta in rows))
+        self.spilled -= len(rows)
+        self.memory.extend((key, url, json.loads(meta)) for key, url, meta in rows)
@@ -1,4 +1,6 @@
 import scrapy
+from itemadapter import ItemAdapter
+from itemadapter.adapter import AdapterInterface
 
 
 class ViatecProductItem(scrapy.Item):
@@ -61,3 +63,168 @@ class ViatecProductItem(scrapy.Item):
     
     # Динамические характеристики (будут добавлены в паук)
     # Назва_Характеристики_1, Одиниця_виміру_Характеристики_1, Значення_Характеристики_1, ...
+
+
+# ==============================================================================
+# Компактний запис товару: паук → SuppliersPipeline → CSV
+# ==============================================================================
+# Базові колонки CSV у форматі PROM (порядок = порядок колонок файлу)
+PROM_FIELDS = (
+    "Код_товару", "Назва_позиції", "Назва_позиції_укр", "Пошукові_запити", "Пошукові_запити_укр",
+    "Опис", "Опис_укр", "Тип_товару", "Ціна", "Валюта", "Одиниця_виміру",
+    "Мінімальний_обсяг_замовлення", "Оптова_ціна", "Мінімальне_замовлення_опт",
+    "Посилання_зображення", "Наявність", "Кількість", "Номер_групи", "Назва_групи",
+    "Посилання_підрозділу", "Можливість_поставки", "Термін_поставки", "Спосіб_пакування",
+    "Спосіб_пакування_укр", "Унікальний_ідентифікатор", "Ідентифікатор_товару",
+    "Ідентифікатор_підрозділу", "Ідентифікатор_групи", "Виробник", "Країна_виробник", "Знижка",
+    "ID_групи_різновидів", "Особисті_нотатки", "Продукт_на_сайті", "Термін_дії_знижки_від",
+    "Термін_дії_знижки_до", "Ціна_від", "Ярлик", "HTML_заголовок", "HTML_заголовок_укр",
+    "HTML_опис", "HTML_опис_укр", "Код_маркування_(GTIN)", "Номер_пристрою_(MPN)", "Вага,кг",
+    "Ширина,см", "Висота,см", "Довжина,см", "Де_знаходиться_товар",
+)
+
+# Технічні поля (не пишуться в CSV)
+SERVICE_FIELDS = (
+    "Назва_групи_укр", "price_type", "supplier_id", "output_file", "category_url", "specifications_list",
+)
+
+FIELDS = PROM_FIELDS + SERVICE_FIELDS
+FIELD_INDEX = {name: index for index, name in enumerate(FIELDS)}
+
+
+class _Unset:
+    """Позначка незаповненого поля (відрізняє його від явного None / "")"""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "UNSET"
+
+
+UNSET = _Unset()
+
+
+class ProductRecord:
+    """
+    Запис товару фіксованої структури: значення в списку за індексом поля FIELDS.
+
+    Замість dict на ~30 ключів з довгими кириличними ключами — один список
+    значень; pipeline пише рядок CSV прямо з cells() без пошуку по ключах.
+    Інтерфейс словника (item["Ціна"], get, keys, update) та ItemAdapter
+    (ProductRecordAdapter) — для коду, що працює з item як з dict. Поле поза
+    FIELDS — KeyError, як у scrapy.Item.
+    """
+
+    __slots__ = ("_cells",)
+
+    def __init__(self, fields=None):
+        self._cells = [UNSET] * len(FIELDS)
+        if fields:
+            cells = self._cells
+            for name, value in fields.items():
+                cells[FIELD_INDEX[name]] = value
+
+    @classmethod
+    def from_cells(cls, cells: list) -> "ProductRecord":
+        """Запис зі значень за порядком FIELDS (коротший список доповнюється UNSET, не копіюється)"""
+        record = cls.__new__(cls)
+        cells.extend([UNSET] * (len(FIELDS) - len(cells)))
+        record._cells = cells
+        return record
+
+    def cells(self) -> list:
+        """Значення всіх полів за індексом FIELDS, UNSET — незаповнене (без копії)"""
+        return self._cells
+
+    def __getitem__(self, name):
+        value = self._cells[FIELD_INDEX[name]]
+        if value is UNSET:
+            raise KeyError(name)
+        return value
+
+    def __setitem__(self, name, value):
+        self._cells[FIELD_INDEX[name]] = value
+
+    def __delitem__(self, name):
+        index = FIELD_INDEX[name]
+        if self._cells[index] is UNSET:
+            raise KeyError(name)
+        self._cells[index] = UNSET
+
+    def __contains__(self, name):
+        index = FIELD_INDEX.get(name)
+        return index is not None and self._cells[index] is not UNSET
+
+    def __iter__(self):
+        return (name for name, value in zip(FIELDS, self._cells) if value is not UNSET)
+
+    def __len__(self):
+        return sum(1 for value in self._cells if value is not UNSET)
+
+    def __eq__(self, other):
+        if isinstance(other, ProductRecord):
+            return self._cells == other._cells
+        return NotImplemented
+
+    def __repr__(self):
+        return f"ProductRecord({dict(self.items())!r})"
+
+    def get(self, name, default=None):
+        index = FIELD_INDEX.get(name)
+        if index is None:
+            return default
+        value = self._cells[index]
+        return default if value is UNSET else value
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        return [(name, value) for name, value in zip(FIELDS, self._cells) if value is not UNSET]
+
+    def values(self):
+        return [value for value in self._cells if value is not UNSET]
+
+    def update(self, fields):
+        cells = self._cells
+        for name, value in fields.items():
+            cells[FIELD_INDEX[name]] = value
+
+    def copy(self):
+        return ProductRecord.from_cells(self._cells.copy())
+
+    __copy__ = copy
+
+
+class ProductRecordAdapter(AdapterInterface):
+    """ItemAdapter для ProductRecord: is_item() для Scrapy / asyncio-рушія, ItemAdapter(record)"""
+
+    @classmethod
+    def is_item(cls, item) -> bool:
+        return isinstance(item, ProductRecord)
+
+    @classmethod
+    def is_item_class(cls, item_class: type) -> bool:
+        return issubclass(item_class, ProductRecord)
+
+    @classmethod
+    def get_field_names_from_class(cls, item_class: type):
+        return list(FIELDS)
+
+    def __getitem__(self, field_name):
+        return self.item[field_name]
+
+    def __setitem__(self, field_name, value):
+        self.item[field_name] = value
+
+    def __delitem__(self, field_name):
+        del self.item[field_name]
+
+    def __iter__(self):
+        return iter(self.item)
+
+    def __len__(self):
+        return len(self.item)
+
+
+ItemAdapter.ADAPTER_CLASSES.appendleft(ProductRecordAdapter)
@@ -0,0 +1,302 @@
+"""
+Легкі метрики краулу та pipeline з таймінгами по етапах.
+
+Збирає за один прогін:
+- запити/с, відповіді, статуси та байти по кожному домену
+- відкриті з'єднання та протоколи (HTTP/1.1, HTTP/2) по домену (suppliers/connections.py)
+- гістограму затримок завантаження (download_latency)
+- час виконання callback'ів паука (через CallbackTimingMiddleware)
+- час етапів SuppliersPipeline: clean, mapper, postprocess, dimensions, keywords, writer
+- паузи backpressure та бюджет часу (suppliers/backpressure.py, suppliers/deadline.py)
+
+Наприкінці роботи записує JSON-звіт: <METRICS_OUTPUT_DIR>/<spider>_metrics.json
+
+Накладні витрати — кілька perf_counter() та інкрементів dict на запит/item,
+тому розширення можна тримати увімкненим у продакшні (METRICS_ENABLED).
+"""
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from time import perf_counter
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+from scrapy.utils.httpobj import urlparse_cached
+from suppliers.paths import OUTPUT_DIR
+
+
+# Межі кошиків гістограми затримок (секунди); останній кошик — "більше"
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+
+
+class StageTimer:
+    """Накопичує час по етапах: кількість викликів, сумарний та максимальний час"""
+
+    __slots__ = ("stages",)
+
+    def __init__(self):
+        # stage -> [calls, total_seconds, max_seconds]
+        self.stages = {}
+
+    def add(self, stage, elapsed):
+        entry = self.stages.get(stage)
+        if entry is None:
+            self.stages[stage] = [1, elapsed, elapsed]
+            return
+        entry[0] += 1
+        entry[1] += elapsed
+        if elapsed > entry[2]:
+            entry[2] = elapsed
+
+    @contextmanager
+    def measure(self, stage):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, perf_counter() - start)
+
+    def report(self):
+        return {
+            stage: {
+                "calls": calls,
+                "total_s": round(total, 4),
+                "avg_ms": round(total / calls * 1000, 3) if calls else 0.0,
+                "max_ms": round(maximum * 1000, 3),
+            }
+            for stage, (calls, total, maximum) in sorted(self.stages.items())
+        }
+
+
+def get_stage_timer(spider) -> StageTimer:
+    """Повертає StageTimer паука (створює при першому зверненні)
+
+    Спільна точка для pipeline, middleware та розширення метрик —
+    жоден з них не залежить від порядку ініціалізації інших.
+    """
+    timer = getattr(spider, "stage_timer", None)
+    if timer is None:
+        timer = StageTimer()
+        spider.stage_timer = timer
+    return timer
+
+
+class LatencyHistogram:
+    """Гістограма затримок з фіксованими кошиками"""
+
+    __slots__ = ("counts", "total", "count", "maximum")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.maximum = 0.0
+
+    def add(self, value):
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.count += 1
+        if value > self.maximum:
+            self.maximum = value
+
+    def report(self):
+        labels = [f"<={bound}s" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}s"]
+        return {
+            "count": self.count,
+            "avg_s": round(self.total / self.count, 4) if self.count else 0.0,
+            "max_s": round(self.maximum, 4),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class DomainStats:
+    """Лічильники одного домену"""
+
+    __slots__ = ("requests", "responses", "bytes", "statuses", "latency", "first_seen", "last_seen")
+
+    def __init__(self):
+        self.requests = 0
+        self.responses = 0
+        self.bytes = 0
+        self.statuses = {}
+        self.latency = LatencyHistogram()
+        self.first_seen = None
+        self.last_seen = None
+
+    def report(self):
+        active = (self.last_seen - self.first_seen) if self.first_seen is not None else 0.0
+        return {
+            "requests": self.requests,
+            "responses": self.responses,
+            "bytes": self.bytes,
+            "requests_per_s": round(self.responses / active, 3) if active > 0 else 0.0,
+            "bytes_per_s": round(self.bytes / active, 1) if active > 0 else 0.0,
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+            "download_latency": self.latency.report(),
+        }
+
+
+class CrawlMetrics:
+    """Розширення Scrapy: збирає метрики прогону та пише JSON-звіт при закритті паука"""
+
+    def __init__(self, output_dir):
+        self.output_dir = Path(output_dir)
+        self.domains = {}
+        self.items_scraped = 0
+        self.items_dropped = 0
+        self.started_at = None
+        self.cpu_started_at = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("METRICS_ENABLED", True):
+            raise NotConfigured
+        ext = cls(crawler.settings.get("METRICS_OUTPUT_DIR", OUTPUT_DIR))
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(ext.request_reached_downloader, signal=signals.request_reached_downloader)
+        crawler.signals.connect(ext.response_received, signal=signals.response_received)
+        crawler.signals.connect(ext.item_scraped, signal=signals.item_scraped)
+        crawler.signals.connect(ext.item_dropped, signal=signals.item_dropped)
+        return ext
+
+    def _domain(self, request_or_response):
+        host = urlparse_cached(request_or_response).hostname or ""
+        stats = self.domains.get(host)
+        if stats is None:
+            stats = self.domains[host] = DomainStats()
+        return stats
+
+    def spider_opened(self, spider):
+        self.started_at = time.monotonic()
+        self.cpu_started_at = time.process_time()
+        get_stage_timer(spider)
+
+    def request_reached_downloader(self, request, spider):
+        self._domain(request).requests += 1
+
+    def response_received(self, response, request, spider):
+        stats = self._domain(response)
+        now = time.monotonic()
+        if stats.first_seen is None:
+            stats.first_seen = now
+        stats.last_seen = now
+        stats.responses += 1
+        stats.bytes += len(response.body)
+        stats.statuses[response.status] = stats.statuses.get(response.status, 0) + 1
+        latency = request.meta.get("download_latency")
+        if latency is not None:
+            stats.latency.add(latency)
+
+    def item_scraped(self, item, response, spider):
+        self.items_scraped += 1
+
+    def item_dropped(self, item, response, exception, spider):
+        self.items_dropped += 1
+
+    def spider_closed(self, spider, reason):
+        elapsed = time.monotonic() - self.started_at if self.started_at is not None else 0.0
+        cpu = time.process_time() - self.cpu_started_at if self.cpu_started_at is not None else 0.0
+        total_requests = sum(d.responses for d in self.domains.values())
+        report = {
+            "spider": spider.name,
+            "finish_reason": reason,
+            "finished_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "elapsed_s": round(elapsed, 3),
+            # Час CPU процесу (порівняння з asyncio-рушієм, suppliers/engine.py)
+            "cpu_s": round(cpu, 3),
+            "cpu_ms_per_item": round(cpu / self.items_scraped * 1000, 3) if self.items_scraped else None,
+            "responses": total_requests,
+            "responses_per_s": round(total_requests / elapsed, 3) if elapsed > 0 else 0.0,
+            "bytes": sum(d.bytes for d in self.domains.values()),
+            "items_scraped": self.items_scraped,
+            "items_dropped": self.items_dropped,
+            "items_per_s": round(self.items_scraped / elapsed, 3) if elapsed > 0 else 0.0,
+            "domains": {host: self._domain_report(spider, host, stats) for host, stats in sorted(self.domains.items())},
+            "stages": get_stage_timer(spider).report(),
+        }
+        deadline = spider.deadline_report() if hasattr(spider, "deadline_report") else None
+        if deadline is not None:
+            report["deadline"] = deadline
+        # Паузи за пам'яттю/чергами (suppliers/backpressure.py)
+        backpressure = getattr(spider, "backpressure", None)
+        if backpressure is not None:
+            report["backpressure"] = backpressure.report()
+
+        report_path = self.output_dir / f"{getattr(spider, 'run_name', spider.name)}_metrics.json"
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            with open(report_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            spider.logger.info(f"📈 Звіт метрик: {report_path}")
+        except OSError as e:
+            spider.logger.warning(f"⚠️ Не вдалося записати звіт метрик {report_path}: {e}")
+
+    @staticmethod
+    def _domain_report(spider, host, stats):
+        report = stats.report()
+        # Повторне використання з'єднань (suppliers/connections.py)
+        connection_stats = getattr(spider, "connection_stats", None)
+        connections = connection_stats.report(host) if connection_stats is not None else None
+        if connections is not None:
+            report["connections"] = connections
+        return report
+
+
+class CallbackTimingMiddleware:
+    """Spider middleware: вимірює час виконання callback'ів паука
+
+    Callback'и — генератори, тому час рахується під час їх ітерації.
+    Має стояти найближче до паука (найбільший порядковий номер),
+    щоб не враховувати час інших middleware.
+    """
+
+    @staticmethod
+    def _stage_name(response):
+        request = response.request
+        callback = getattr(request, "callback", None) if request is not None else None
+        return f"callback:{getattr(callback, '__name__', 'parse')}"
+
+    def process_spider_output(self, response, result, spider):
+        stage = self._stage_name(response)
+        timer = get_stage_timer(spider)
+
+        iterator = iter(result)
+        elapsed = 0.0
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    output = next(iterator)
+                except StopIteration:
+                    elapsed += perf_counter() - start
+                    break
+                elapsed += perf_counter() - start
+                yield output
+        finally:
+            timer.add(stage, elapsed)
+
+    async def process_spider_output_async(self, response, result, spider):
+        stage = self._stage_name(response)
+        timer = get_stage_timer(spider)
+
+        iterator = result.__aiter__()
+        elapsed = 0.0
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    output = await iterator.__anext__()
+                except StopAsyncIteration:
+                    elapsed += perf_counter() - start
+                    break
+                elapsed += perf_counter() - start
+                yield output
+        finally:
+            timer.add(stage, elapsed)
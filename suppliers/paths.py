@@ -0,0 +1,28 @@
+"""
+Кореневі директорії проекту замість жорстко прописаних C:\\FullStack\\Scrapy\\...
+
+- SUPPLIERS_ROOT        — корінь (data/, output/, suppliers/.env); за замовчуванням
+                          директорія репозиторію (на робочій машині це C:\\FullStack\\Scrapy)
+- SUPPLIERS_DATA_DIR    — data/ (маппінги категорій, ключові слова, лічильники)
+- SUPPLIERS_OUTPUT_DIR  — output/ (CSV, checkpoint, SQLite сховища); окремий для
+                          кожної машини при шардованому прогоні
+
+    from suppliers.paths import data_path, output_path
+    data_path("viatec", "viatec_category_retail.csv")
+    output_path("checkpoints")
+"""
+import os
+from pathlib import Path
+
+
+ROOT = Path(os.environ.get("SUPPLIERS_ROOT") or Path(__file__).resolve().parent.parent)
+DATA_DIR = Path(os.environ.get("SUPPLIERS_DATA_DIR") or ROOT / "data")
+OUTPUT_DIR = Path(os.environ.get("SUPPLIERS_OUTPUT_DIR") or ROOT / "output")
+
+
+def data_path(*parts: str) -> Path:
+    return DATA_DIR.joinpath(*parts)
+
+
+def output_path(*parts: str) -> Path:
+    return OUTPUT_DIR.joinpath(*parts)
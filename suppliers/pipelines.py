@@ -18,15 +18,39 @@
 Формат PROM: повторювані триплети БЕЗ нумерації
 - Назва_Характеристики;Одиниця_виміру_Характеристики;Значення_Характеристики (x160 разів)
 """
+import os
 import re
 import csv
-from pathlib import Path
 from itemadapter import ItemAdapter
 from scrapy.exceptions import DropItem
 from suppliers.attribute_mapper import AttributeMapper
+from suppliers.checkpoint import get_checkpoint
+from suppliers.descriptions import clean_description
+from suppliers.filters import NO_PRICE, NO_STOCK, is_in_stock, is_valid_price
+from suppliers.items import PROM_FIELDS, UNSET, ProductRecord
+from suppliers.metrics import get_stage_timer
+from suppliers.paths import DATA_DIR, OUTPUT_DIR, output_path
+from suppliers.product_codes import ProductCodeAllocator
+from suppliers.sharding import shard_filename
 from keywords.core.generator import ProductKeywordsGenerator
 
 
+# Триплетів характеристик у рядку CSV
+MAX_SPECS = 160
+
+PRICE_INDEX = PROM_FIELDS.index("Ціна")
+CURRENCY_INDEX = PROM_FIELDS.index("Валюта")
+UNIT_INDEX = PROM_FIELDS.index("Одиниця_виміру")
+WEIGHT_INDEX = PROM_FIELDS.index("Вага,кг")
+
+
+def _csv_cell(value) -> str:
+    """Значення комірки CSV: без ; та лапок, переноси → <br>"""
+    if value is UNSET or value == "":
+        return ""
+    return str(value).replace(";", ",").replace('"', '″').replace("\n", "<br>").replace("\r", "")
+
+
 class SuppliersPipeline:
     """Один pipeline для всіх постачальників з підтримкою rule_kind"""
     
@@ -39,72 +63,29 @@ class SuppliersPipeline:
         self.attribute_mapper = None
         self.keywords_generator = None
         
-        # Базові поля CSV згідно формату PROM
-        self.fieldnames_base = [
-            "Код_товару",
-            "Назва_позиції",
-            "Назва_позиції_укр",
-            "Пошукові_запити",
-            "Пошукові_запити_укр",
-            "Опис",
-            "Опис_укр",
-            "Тип_товару",
-            "Ціна",
-            "Валюта",
-            "Одиниця_виміру",
-            "Мінімальний_обсяг_замовлення",
-            "Оптова_ціна",
-            "Мінімальне_замовлення_опт",
-            "Посилання_зображення",
-            "Наявність",
-            "Кількість",
-            "Номер_групи",
-            "Назва_групи",
-            "Посилання_підрозділу",
-            "Можливість_поставки",
-            "Термін_поставки",
-            "Спосіб_пакування",
-            "Спосіб_пакування_укр",
-            "Унікальний_ідентифікатор",
-            "Ідентифікатор_товару",
-            "Ідентифікатор_підрозділу",
-            "Ідентифікатор_групи",
-            "Виробник",
-            "Країна_виробник",
-            "Знижка",
-            "ID_групи_різновидів",
-            "Особисті_нотатки",
-            "Продукт_на_сайті",
-            "Термін_дії_знижки_від",
-            "Термін_дії_знижки_до",
-            "Ціна_від",
-            "Ярлик",
-            "HTML_заголовок",
-            "HTML_заголовок_укр",
-            "HTML_опис",
-            "HTML_опис_укр",
-            "Код_маркування_(GTIN)",
-            "Номер_пристрою_(MPN)",
-            "Вага,кг",
-            "Ширина,см",
-            "Висота,см",
-            "Довжина,см",
-            "Де_знаходиться_товар",
-        ]
+        # Базові поля CSV згідно формату PROM (порядок полів ProductRecord)
+        self.fieldnames_base = list(PROM_FIELDS)
         
-        self.output_dir = Path(r"C:\FullStack\Scrapy\output")
+        self.output_dir = OUTPUT_DIR
+        self.data_dir = DATA_DIR
         self.product_counters = {}
+        self.code_allocator = None
         self.stats = {}
+        self.file_offsets = {}
     
     def open_spider(self, spider):
         """Створюємо директорію output та файл при відкритті паука"""
         self.output_dir.mkdir(parents=True, exist_ok=True)
         spider.logger.info(f"✅ Pipeline відкрито для {spider.name}")
         spider.logger.info(f"📁 Вихідна директорія: {self.output_dir}")
+        if hasattr(spider, "settings"):
+            get_checkpoint(spider).register("pipeline", self.checkpoint_state)
 
-        # Завантаження мапінгу коефіцієнтів (тільки для viatec_dealer)
-        if spider.name == 'viatec_dealer':
-            coefficient_path = r"C:\FullStack\Scrapy\data\viatec\viatec_coefficient_dealer.csv"
+        output_files = self._output_files(spider)
+        
+        # Завантаження мапінгу коефіцієнтів (тільки для viatec_dealer.csv)
+        if 'viatec_dealer.csv' in output_files:
+            coefficient_path = self.data_dir / "viatec" / "viatec_coefficient_dealer.csv"
             try:
                 with open(coefficient_path, 'r', encoding='utf-8-sig') as f:
                     reader = csv.reader(f, delimiter=';')
@@ -133,7 +114,7 @@ class SuppliersPipeline:
 
         # Завантаження особистих нотаток та ярликів
         supplier_name = spider.name.split('_')[0]
-        personal_notes_path = Path(r"C:\FullStack\Scrapy\data") / supplier_name / f"{supplier_name}_personal_notes.csv"
+        personal_notes_path = self.data_dir / supplier_name / f"{supplier_name}_personal_notes.csv"
         
         try:
             with open(personal_notes_path, 'r', encoding='utf-8-sig') as f:
@@ -156,7 +137,7 @@ class SuppliersPipeline:
             spider.logger.error(f"❌ Помилка завантаження мапінгу: {e}")
 
         # Ініціалізація маппера характеристик
-        rules_path = Path(r"C:\FullStack\Scrapy\data") / supplier_name / f"{supplier_name}_mapping_rules.csv"
+        rules_path = self.data_dir / supplier_name / f"{supplier_name}_mapping_rules.csv"
         if rules_path.exists():
             try:
                 self.attribute_mapper = AttributeMapper(str(rules_path), spider.logger)
@@ -169,8 +150,8 @@ class SuppliersPipeline:
             self.attribute_mapper = None
         
         # Ініціалізація генератора ключових слів
-        keywords_path = Path(r"C:\FullStack\Scrapy\data") / supplier_name / f"{supplier_name}_keywords.csv"
-        manufacturers_path = Path(r"C:\FullStack\Scrapy\data") / supplier_name / f"{supplier_name}_manufacturers.csv"
+        keywords_path = self.data_dir / supplier_name / f"{supplier_name}_keywords.csv"
+        manufacturers_path = self.data_dir / supplier_name / f"{supplier_name}_manufacturers.csv"
         
         if keywords_path.exists() and manufacturers_path.exists():
             try:
@@ -191,8 +172,26 @@ class SuppliersPipeline:
             spider.logger.warning(f"⚠️  Генератор ключових слів відключено")
             self.keywords_generator = None
 
-        output_file = getattr(spider, 'output_filename', f"{spider.name}.csv")
-        filepath = self.output_dir / output_file
+        # Коди товарів: спільний лічильник постачальника для всіх пауків і шардів (suppliers/product_codes.py)
+        if hasattr(spider, "settings") and spider.settings.getbool("PRODUCT_CODES_ENABLED", True):
+            self.code_allocator = ProductCodeAllocator(
+                spider.settings.get("PRODUCT_CODES_PATH", output_path("product_codes.sqlite")),
+                supplier_name,
+                self._load_initial_product_code(spider.name, spider.logger),
+                block_size=spider.settings.getint("PRODUCT_CODES_BLOCK", 100),
+            )
+        
+        for output_file in output_files:
+            self._open_output_file(spider, output_file)
+    
+    def _output_files(self, spider):
+        """Вихідні файли паука: output_filenames (кілька, viatec_combined) або output_filename"""
+        return list(getattr(spider, 'output_filenames', None) or [getattr(spider, 'output_filename', f"{spider.name}.csv")])
+    
+    def _open_output_file(self, spider, output_file):
+        """Створення (або продовження за checkpoint) вихідного CSV"""
+        # Шардований прогін: кожен шард пише власний файл, злиття — scripts/shard_run.py
+        filepath = self.output_dir / shard_filename(output_file, getattr(spider, "shard", None))
         
         # Перевірка доступності файлу
         try:
@@ -202,6 +201,18 @@ class SuppliersPipeline:
             spider.logger.error(f"❌ Файл {filepath} відкритий в іншій програмі!")
             raise PermissionError(f"Неможливо записати у файл {filepath}")
         
+        self.stats[output_file] = {
+            "count": 0,
+            "filtered_no_price": 0,
+            "filtered_no_stock": 0,
+        }
+        
+        # Продовження перерваного прогону: дописуємо у файл з checkpoint
+        restored = self._restored_file_state(spider, output_file, filepath)
+        if restored:
+            self._resume_file(output_file, filepath, restored, spider)
+            return
+        
         # Створення файлу
         try:
             self.files[output_file] = open(filepath, "w", encoding="utf-8-sig", newline="", buffering=1)
@@ -211,38 +222,112 @@ class SuppliersPipeline:
             spider.logger.error(f"❌ Помилка створення файлу: {e}")
             raise
         
-        self.product_counters[output_file] = self._load_initial_product_code(spider.name, spider.logger)
-        self.stats[output_file] = {
-            "count": 0,
-            "filtered_no_price": 0,
-            "filtered_no_stock": 0,
+        if self.code_allocator is None:
+            self.product_counters[output_file] = self._load_initial_product_code(spider.name, spider.logger)
+    
+    def _restored_file_state(self, spider, output_file, filepath):
+        """Стан вихідного файлу з checkpoint (тільки при -a resume=1)"""
+        if not getattr(spider, "resume", False) or not hasattr(spider, "settings"):
+            return None
+        state = (get_checkpoint(spider).restored("pipeline") or {}).get(output_file)
+        if not state:
+            spider.logger.warning(f"⚠️ Checkpoint не містить стану для {output_file} — файл буде створено заново")
+            return None
+        if not filepath.exists() or filepath.stat().st_size < state["offset"]:
+            spider.logger.warning(f"⚠️ Файл {filepath} не відповідає checkpoint — файл буде створено заново")
+            return None
+        return state
+    
+    def _resume_file(self, output_file, filepath, state, spider):
+        """Обрізаємо файл до останнього повного рядка з checkpoint та дописуємо далі"""
+        os.truncate(filepath, state["offset"])
+        self.files[output_file] = open(filepath, "a", encoding="utf-8-sig", newline="", buffering=1)
+        # З розподільником кодів продовження бере новий блок — коди не перетинаються з іншими процесами
+        if self.code_allocator is None:
+            self.product_counters[output_file] = state["next_code"]
+        self.stats[output_file]["count"] = state["count"]
+        spider.logger.info(f"♻️ Продовження файлу {filepath}: записано {state['count']} товарів")
+    
+    def checkpoint_state(self):
+        """Стан для checkpoint: кінець записаних рядків, наступний код та кількість"""
+        return {
+            output_file: {
+                "offset": self.file_offsets.get(output_file) or f.tell(),
+                "next_code": self.product_counters.get(output_file),
+                "count": self.stats.get(output_file, {}).get("count", 0),
+            }
+            for output_file, f in self.files.items()
         }
     
     def process_item(self, item, spider):
         """Обробляємо кожен item з ФІЛЬТРАЦІЄЮ"""
-        adapter = ItemAdapter(item)
+        # ProductRecord має інтерфейс словника сам — без обгортки ItemAdapter
+        adapter = item if isinstance(item, ProductRecord) else ItemAdapter(item)
         output_file = adapter.get("output_file") or f"{adapter.get('supplier_id', 'unknown')}.csv"
         
-        # ФІЛЬТР 1: Ціна
+        # ФІЛЬТР 1: Ціна (suppliers/filters.py — ті самі перевірки пауки роблять до другого запиту)
         price = adapter.get("Ціна", "")
-        if not price or not self._is_valid_price(price):
-            self._increment_stat(output_file, "filtered_no_price")
+        if not is_valid_price(price):
+            self._increment_stat(output_file, NO_PRICE)
             product_name = adapter.get('Назва_позиції', 'Невідомий')[:60]
             spider.logger.warning(f"❌ Товар без ціни: {product_name}...")
             raise DropItem("Товар без ціни")
         
         # ФІЛЬТР 2: Наявність
         availability_raw = adapter.get("Наявність", "")
-        if not self._check_availability(availability_raw):
-            self._increment_stat(output_file, "filtered_no_stock")
+        if not is_in_stock(availability_raw):
+            self._increment_stat(output_file, NO_STOCK)
             product_name = adapter.get('Назва_позиції', 'Невідомий')[:60]
             spider.logger.warning(f"❌ Товар не в наявності: {product_name}...")
             raise DropItem("Товар не в наявності")
         
+        timer = get_stage_timer(spider)
+        
+        with timer.measure("pipeline:clean"):
+            cleaned_item = self._prepare_item(adapter, output_file, spider)
+        
+        # Обробка характеристик
+        specs_list_original = adapter.get("specifications_list", [])
+        
+        if self.attribute_mapper:
+            with timer.measure("pipeline:mapper"):
+                specs_list = self._map_specifications(adapter, cleaned_item, specs_list_original)
+            
+            # Постобробка
+            with timer.measure("pipeline:postprocess"):
+                specs_list = self._postprocess_weight_in_specs(specs_list, spider)
+                specs_list = self._postprocess_load_capacity_in_specs(specs_list, spider)
+                specs_list = self._postprocess_hdd_capacity_in_specs(specs_list, spider)
+                specs_list = self._postprocess_battery_capacity_in_specs(specs_list, spider)
+        else:
+            specs_list = specs_list_original
+        
+        # Витягуємо габарити з характеристик для колонок PROM (після всіх постпроцесів)
+        with timer.measure("pipeline:dimensions"):
+            dimensions = self._extract_dimensions_from_specs(specs_list, spider)
+            cleaned_item.update(dimensions)
+        
+        # Генерація ключових слів (якщо генератор доступний)
+        if self.keywords_generator:
+            with timer.measure("pipeline:keywords"):
+                self._generate_keywords(adapter, cleaned_item, specs_list, spider)
+        
+        # Запис у файл
+        if output_file not in self.files:
+            raise ValueError(f"File {output_file} was not initialized")
+        
+        with timer.measure("pipeline:writer"):
+            self._write_row(output_file, cleaned_item, specs_list)
+        self.stats[output_file]["count"] += 1
+        
+        return item
+    
+    def _prepare_item(self, adapter, output_file, spider):
+        """Очищення полів, ціна, код товару, нотатки, опис та зображення"""
         cleaned_item = self._clean_item(adapter, spider)
         
         # Множення ціни для viatec_dealer
-        if spider.name == 'viatec_dealer' and self.viatec_dealer_coefficient_mapping:
+        if output_file == 'viatec_dealer.csv' and self.viatec_dealer_coefficient_mapping:
             category_url = adapter.get('category_url', '')
             coefficient = self.viatec_dealer_coefficient_mapping.get(category_url)
             
@@ -258,11 +343,7 @@ class SuppliersPipeline:
         cleaned_item["Кількість"] = adapter.get("Кількість", "") or "100"
         
         # Генерація коду товару
-        if output_file not in self.product_counters:
-            self.product_counters[output_file] = self._load_initial_product_code(spider.name, spider.logger)
-        
-        cleaned_item["Код_товару"] = str(self.product_counters[output_file])
-        self.product_counters[output_file] += 1
+        cleaned_item["Код_товару"] = str(self._next_product_code(output_file, spider))
         
         cleaned_item["Ідентифікатор_товару"] = adapter.get("Ідентифікатор_товару", "").strip()
         
@@ -272,8 +353,8 @@ class SuppliersPipeline:
         cleaned_item["Ярлик"] = self.label_mapping.get(group_number, "")
         
         # Опис
-        cleaned_item["Опис"] = self._clean_description(cleaned_item.get("Опис", ""))
-        cleaned_item["Опис_укр"] = self._clean_description(cleaned_item.get("Опис_укр", ""))
+        cleaned_item["Опис"] = clean_description(cleaned_item.get("Опис", ""))
+        cleaned_item["Опис_укр"] = clean_description(cleaned_item.get("Опис_укр", ""))
         
         # Санітизація URL зображень
         image_url = cleaned_item.get("Посилання_зображення", "")
@@ -282,117 +363,93 @@ class SuppliersPipeline:
             sanitized_urls = [url.replace(",", "%2C") if ',' in url else url for url in urls]
             cleaned_item["Посилання_зображення"] = ", ".join(sanitized_urls)
         
-        # Обробка характеристик
-        specs_list_original = adapter.get("specifications_list", [])
-        
-        if self.attribute_mapper:
-            category_id = adapter.get("Ідентифікатор_підрозділу", "")
-            product_name = cleaned_item.get('Назва_позиції', '')
-            
-            # Мапінг з назви товару
-            name_mapped = []
-            if product_name:
-                name_mapped = self.attribute_mapper.map_product_name(product_name, category_id)
-            
-            # Мапінг з характеристик
-            mapping_result = {'supplier': [], 'mapped': [], 'unmapped': []}
-            if specs_list_original:
-                mapping_result = self.attribute_mapper.map_attributes(specs_list_original, category_id)
-            
-            # Об'єднання з дедуплікацією
-            specs_dict = {}
-            
-            for spec in mapping_result['supplier']:
-                key = spec['name'].lower().strip()
-                if key not in specs_dict:
-                    specs_dict[key] = {**spec, 'rule_priority': 9999, 'rule_kind': 'supplier'}
-            
-            for spec in mapping_result['mapped']:
-                rule_kind = spec.get('rule_kind', 'extract')
-                if rule_kind == 'skip':
-                    continue
-                
-                key = spec['name'].lower().strip()
-                if key not in specs_dict or self._should_replace_attribute(
-                    rule_kind, spec.get('rule_priority', 999),
-                    specs_dict[key].get('rule_kind', 'extract'),
-                    specs_dict[key].get('rule_priority', 999)
-                ):
-                    specs_dict[key] = spec
-            
-            for spec in name_mapped:
-                rule_kind = spec.get('rule_kind', 'extract')
-                if rule_kind == 'skip':
-                    continue
-                
-                key = spec['name'].lower().strip()
-                if key not in specs_dict or self._should_replace_attribute(
-                    rule_kind, spec.get('rule_priority', 999),
-                    specs_dict[key].get('rule_kind', 'extract'),
-                    specs_dict[key].get('rule_priority', 999)
-                ):
-                    specs_dict[key] = spec
+        return cleaned_item
+    
+    def _map_specifications(self, adapter, cleaned_item, specs_list_original):
+        """Мапінг характеристик з назви товару та таблиці постачальника з урахуванням rule_kind"""
+        category_id = adapter.get("Ідентифікатор_підрозділу", "")
+        product_name = cleaned_item.get('Назва_позиції', '')
+        
+        # Мапінг з назви товару
+        name_mapped = []
+        if product_name:
+            name_mapped = self.attribute_mapper.map_product_name(product_name, category_id)
+        
+        # Мапінг з характеристик
+        mapping_result = {'supplier': [], 'mapped': [], 'unmapped': []}
+        if specs_list_original:
+            mapping_result = self.attribute_mapper.map_attributes(specs_list_original, category_id)
+        
+        # Об'єднання з дедуплікацією
+        specs_dict = {}
+        
+        for spec in mapping_result['supplier']:
+            key = spec['name'].lower().strip()
+            if key not in specs_dict:
+                specs_dict[key] = {**spec, 'rule_priority': 9999, 'rule_kind': 'supplier'}
+        
+        for spec in mapping_result['mapped']:
+            rule_kind = spec.get('rule_kind', 'extract')
+            if rule_kind == 'skip':
+                continue
             
-            specs_list = list(specs_dict.values())
+            key = spec['name'].lower().strip()
+            if key not in specs_dict or self._should_replace_attribute(
+                rule_kind, spec.get('rule_priority', 999),
+                specs_dict[key].get('rule_kind', 'extract'),
+                specs_dict[key].get('rule_priority', 999)
+            ):
+                specs_dict[key] = spec
+        
+        for spec in name_mapped:
+            rule_kind = spec.get('rule_kind', 'extract')
+            if rule_kind == 'skip':
+                continue
             
-            # Постобробка
-            specs_list = self._postprocess_weight_in_specs(specs_list, spider)
-            specs_list = self._postprocess_load_capacity_in_specs(specs_list, spider)
-            specs_list = self._postprocess_hdd_capacity_in_specs(specs_list, spider)
-            specs_list = self._postprocess_battery_capacity_in_specs(specs_list, spider)
-        else:
-            specs_list = specs_list_original
-        
-        # Витягуємо габарити з характеристик для колонок PROM (після всіх постпроцесів)
-        dimensions = self._extract_dimensions_from_specs(specs_list, spider)
-        cleaned_item.update(dimensions)
+            key = spec['name'].lower().strip()
+            if key not in specs_dict or self._should_replace_attribute(
+                rule_kind, spec.get('rule_priority', 999),
+                specs_dict[key].get('rule_kind', 'extract'),
+                specs_dict[key].get('rule_priority', 999)
+            ):
+                specs_dict[key] = spec
+        
+        return list(specs_dict.values())
+    
+    def _generate_keywords(self, adapter, cleaned_item, specs_list, spider):
+        """Генерація пошукових запитів RU/UA через ProductKeywordsGenerator"""
+        category_id = adapter.get("Ідентифікатор_підрозділу", "")
+        product_name_ru = cleaned_item.get('Назва_позиції', '')
+        product_name_ua = cleaned_item.get('Назва_позиції_укр', '')
         
-        # Генерація ключових слів (якщо генератор доступний)
-        if self.keywords_generator:
-            category_id = adapter.get("Ідентифікатор_підрозділу", "")
-            product_name_ru = cleaned_item.get('Назва_позиції', '')
-            product_name_ua = cleaned_item.get('Назва_позиції_укр', '')
+        try:
+            keywords_ru = self.keywords_generator.generate_keywords(
+                product_name_ru, category_id, specs_list, lang='ru'
+            )
+            keywords_ua = self.keywords_generator.generate_keywords(
+                product_name_ua, category_id, specs_list, lang='ua'
+            )
             
-            try:
-                keywords_ru = self.keywords_generator.generate_keywords(
-                    product_name_ru, category_id, specs_list, lang='ru'
-                )
-                keywords_ua = self.keywords_generator.generate_keywords(
-                    product_name_ua, category_id, specs_list, lang='ua'
-                )
-                
-                cleaned_item['Пошукові_запити'] = keywords_ru
-                cleaned_item['Пошукові_запити_укр'] = keywords_ua
-                
-                spider.logger.debug(f"🔑 RU: {keywords_ru[:80]}...")
-                spider.logger.debug(f"🔑 UA: {keywords_ua[:80]}...")
-            except Exception as e:
-                spider.logger.error(f"❌ Помилка генерації ключових слів: {e}")
-        
-        # Запис у файл
-        if output_file not in self.files:
-            raise ValueError(f"File {output_file} was not initialized")
-        
-        row_parts = []
-        for field in self.fieldnames_base:
-            value = cleaned_item.get(field, "")
-            value_str = str(value).replace(";", ",").replace('"', '″').replace("\n", "<br>").replace("\r", "")
-            row_parts.append(value_str)
-        
-        for i in range(160):
-            if i < len(specs_list):
-                spec = specs_list[i]
-                name = str(spec.get("name", "")).replace(";", ",").replace('"', '″').replace("\n", "<br>").replace("\r", "")
-                unit = str(spec.get("unit", "")).replace(";", ",").replace('"', '″').replace("\n", "<br>").replace("\r", "")
-                value = str(spec.get("value", "")).replace(";", ",").replace('"', '″').replace("\n", "<br>").replace("\r", "")
-                row_parts.extend([name, unit, value])
-            else:
-                row_parts.extend(["", "", ""])
-        
-        self.files[output_file].write(";".join(row_parts) + "\n")
-        self.stats[output_file]["count"] += 1
-        
-        return item
+            cleaned_item['Пошукові_запити'] = keywords_ru
+            cleaned_item['Пошукові_запити_укр'] = keywords_ua
+            
+            spider.logger.debug(f"🔑 RU: {keywords_ru[:80]}...")
+            spider.logger.debug(f"🔑 UA: {keywords_ua[:80]}...")
+        except Exception as e:
+            spider.logger.error(f"❌ Помилка генерації ключових слів: {e}")
+    
+    def _write_row(self, output_file, cleaned_item, specs_list):
+        """Формування рядка PROM (базові поля + 160 триплетів характеристик) та запис"""
+        row_parts = [_csv_cell(value) for value in cleaned_item.cells()[:len(self.fieldnames_base)]]
+        
+        specs = specs_list[:MAX_SPECS]
+        for spec in specs:
+            row_parts.append(_csv_cell(spec.get("name", "")))
+            row_parts.append(_csv_cell(spec.get("unit", "")))
+            row_parts.append(_csv_cell(spec.get("value", "")))
+        
+        # Порожні триплети — лише роздільники
+        self.files[output_file].write(";".join(row_parts) + ";" * (3 * (MAX_SPECS - len(specs))) + "\n")
     
     def _should_replace_attribute(self, new_kind, new_priority, current_kind, current_priority):
         """Визначає чи треба замінити характеристику"""
@@ -404,9 +461,15 @@ class SuppliersPipeline:
     
     def close_spider(self, spider):
         """Закриття файлів та статистика"""
-        for f in self.files.values():
+        for output_file, f in self.files.items():
+            # Фінальний зсув потрібен checkpoint, який зберігається після pipeline
+            self.file_offsets[output_file] = f.tell()
             f.close()
         
+        if self.code_allocator is not None:
+            self.code_allocator.close()
+            spider.logger.info(f"🔢 Видано кодів товарів: {self.code_allocator.issued}")
+        
         spider.logger.info("=" * 80)
         spider.logger.info("📊 СТАТИСТИКА PIPELINE")
         spider.logger.info("=" * 80)
@@ -422,7 +485,7 @@ class SuppliersPipeline:
     def _write_header(self, file_obj):
         """Запис заголовку"""
         header_parts = self.fieldnames_base.copy()
-        for _ in range(160):
+        for _ in range(MAX_SPECS):
             header_parts.extend([
                 "Назва_Характеристики",
                 "Одиниця_виміру_Характеристики",
@@ -430,75 +493,33 @@ class SuppliersPipeline:
             ])
         file_obj.write(";".join(header_parts) + "\n")
     
-    def _is_valid_price(self, price):
-        """Перевірка ціни"""
-        if not price:
-            return False
-        try:
-            price_float = float(str(price).replace(",", ".").replace(" ", ""))
-            return price_float > 0
-        except (ValueError, TypeError):
-            return False
-    
-    def _check_availability(self, availability_str):
-        """Перевірка наявності"""
-        if not availability_str:
-            return True
-        
-        availability_lower = str(availability_str).lower().strip()
-        
-        out_of_stock_keywords = [
-            "немає", "немає в наявності", "нет в наличии", "нет на складе",
-            "відсутній", "відсутня", "закінчився", "закінчилась",
-            "out of stock", "unavailable", "под заказ", "під замовлення",
-        ]
-        
-        for keyword in out_of_stock_keywords:
-            if keyword in availability_lower:
-                return False
-        
-        return True
-    
-    def _clean_description(self, description):
-        """Очищення опису"""
-        if not description:
-            return ""
-        
-        patterns_to_remove = [
-            r"Є товари з аналогічними характеристиками\s*→",
-            r"Есть товары с аналогичными характеристиками\s*→",
-        ]
-        
-        for pattern in patterns_to_remove:
-            description = re.sub(pattern, "", description, flags=re.IGNORECASE)
-        
-        description = description.replace("\n", "<br>")
-        description = re.sub(r' +', ' ', description)
-        
-        return description.strip()
-    
     def _clean_item(self, adapter, spider):
-        """Очищення даних"""
-        cleaned = {}
-        
-        for field in self.fieldnames_base:
-            value = adapter.get(field, "")
-            
-            if isinstance(value, str):
+        """Очищення даних у новий ProductRecord (значення за індексом fieldnames_base)"""
+        if isinstance(adapter, ProductRecord):
+            source = adapter.cells()
+        else:
+            source = [adapter.get(field, UNSET) for field in self.fieldnames_base]
+        
+        cells = []
+        for index in range(len(self.fieldnames_base)):
+            value = source[index]
+            if value is UNSET:
+                value = ""
+            elif isinstance(value, str):
                 value = value.strip()
             
-            if field == "Ціна":
+            if index == PRICE_INDEX:
                 value = self._clean_price(value)
-            elif field == "Валюта":
+            elif index == CURRENCY_INDEX:
                 value = value.upper() if value else "UAH"
-            elif field == "Одиниця_виміру":
+            elif index == UNIT_INDEX:
                 value = value if value else "шт."
-            elif field == "Вага,кг":
+            elif index == WEIGHT_INDEX:
                 value = self._convert_weight_to_grams(value)
             
-            cleaned[field] = value
+            cells.append(value)
         
-        return cleaned
+        return ProductRecord.from_cells(cells)
     
     def _clean_price(self, price):
         """Очищення ціни"""
@@ -789,10 +810,22 @@ class SuppliersPipeline:
             }
         self.stats[output_file][stat_key] += 1
 
+    def _next_product_code(self, output_file, spider):
+        """Наступний Код_товару: з розподільника, а без settings (офлайн-бенчмарк) — лічильник у пам'яті"""
+        if self.code_allocator is not None:
+            return self.code_allocator.next()
+        
+        if output_file not in self.product_counters:
+            self.product_counters[output_file] = self._load_initial_product_code(spider.name, spider.logger)
+        
+        code = self.product_counters[output_file]
+        self.product_counters[output_file] += 1
+        return code
+    
     def _load_initial_product_code(self, spider_name, logger):
         """Завантаження початкового коду товару"""
         supplier_prefix = spider_name.split('_')[0]
-        counter_file_path = Path(r"C:\FullStack\Scrapy\data") / supplier_prefix / f"{supplier_prefix}_counter_product_code.csv"
+        counter_file_path = self.data_dir / supplier_prefix / f"{supplier_prefix}_counter_product_code.csv"
         
         try:
             with open(counter_file_path, 'r', encoding='utf-8') as f:
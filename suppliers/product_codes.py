@@ -0,0 +1,122 @@
+"""
+Атомарний розподіл кодів товарів (Код_товару) між прогонами та процесами.
+
+Раніше кожен прогін починав з числа з <supplier>_counter_product_code.csv і
+рахував у пам'яті — два пауки одного постачальника (або кілька шардів)
+видавали однакові коди. ProductCodeAllocator тримає лічильник постачальника
+в SQLite <PRODUCT_CODES_PATH>:
+
+- процес резервує блок з PRODUCT_CODES_BLOCK кодів (BEGIN IMMEDIATE — запис
+  блокує базу для інших процесів на час резервування)
+- коди видаються з блоку в пам'яті, без звернень до бази
+- при закритті невикористаний залишок блоку повертається і буде виданий
+  наступному процесу; лічильник (high-water mark) зберігається між прогонами
+- число з <supplier>_counter_product_code.csv — початкове значення; якщо воно
+  більше за збережений лічильник, лічильник піднімається до нього, а повернуті
+  залишки нижче нього відкидаються (обрізаються)
+"""
+import sqlite3
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS counters (
+    supplier TEXT PRIMARY KEY,
+    next_code INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS free_blocks (
+    supplier TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    PRIMARY KEY (supplier, start)
+);
+"""
+
+
+class ProductCodeAllocator:
+    """Блоки кодів товарів одного постачальника з SQLite"""
+
+    def __init__(self, path, supplier: str, initial_code: int, block_size: int = 100):
+        self.path = Path(path)
+        self.supplier = supplier
+        self.initial_code = initial_code
+        self.block_size = max(1, block_size)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None — транзакції відкриваються явно (BEGIN IMMEDIATE)
+        self.connection = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        self.connection.executescript(SCHEMA)
+        self.current = 0
+        self.end = 0
+        self.issued = 0
+
+    def next(self) -> int:
+        if self.current >= self.end:
+            self.current, self.end = self._reserve()
+        code = self.current
+        self.current += 1
+        self.issued += 1
+        return code
+
+    def close(self):
+        """Повертає невикористаний залишок блоку"""
+        if self.connection is None:
+            return
+        if self.current < self.end:
+            self._transaction(
+                lambda: self.connection.execute(
+                    "INSERT OR REPLACE INTO free_blocks (supplier, start, end) VALUES (?, ?, ?)",
+                    (self.supplier, self.current, self.end),
+                )
+            )
+            self.current = self.end
+        self.connection.close()
+        self.connection = None
+
+    def high_water_mark(self) -> Optional[int]:
+        row = self.connection.execute(
+            "SELECT next_code FROM counters WHERE supplier = ?", (self.supplier,)
+        ).fetchone()
+        return row[0] if row else None
+
+    # ------------------------------------------------------------------
+    # SQLite
+    # ------------------------------------------------------------------
+
+    def _transaction(self, action):
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            result = action()
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
+        return result
+
+    def _reserve(self) -> Tuple[int, int]:
+        """Наступний блок: спочатку повернуті залишки, далі нові коди з лічильника"""
+        return self._transaction(self._reserve_locked)
+
+    def _reserve_locked(self) -> Tuple[int, int]:
+        # Коди нижче початкового числа з CSV могли бути видані поза базою — такі залишки не видаються
+        self.connection.execute(
+            "DELETE FROM free_blocks WHERE supplier = ? AND end <= ?", (self.supplier, self.initial_code)
+        )
+        free = self.connection.execute(
+            "SELECT start, end FROM free_blocks WHERE supplier = ? ORDER BY start LIMIT 1", (self.supplier,)
+        ).fetchone()
+        if free:
+            self.connection.execute(
+                "DELETE FROM free_blocks WHERE supplier = ? AND start = ?", (self.supplier, free[0])
+            )
+            return max(free[0], self.initial_code), free[1]
+
+        stored = self.high_water_mark()
+        start = max(stored or 0, self.initial_code)
+        end = start + self.block_size
+        self.connection.execute(
+            "INSERT INTO counters (supplier, next_code) VALUES (?, ?) "
+            "ON CONFLICT (supplier) DO UPDATE SET next_code = excluded.next_code",
+            (self.supplier, end),
+        )
+        return start, end
@@ -0,0 +1,256 @@
+"""
+Запис і відтворення живих прогонів для детермінованих тестів продуктивності.
+
+REPLAY_MODE = "record"  — ReplayRecorderMiddleware пише кожну пару запит/відповідь
+                          (URL, заголовки, статус, тіло, час завантаження) в архів
+REPLAY_MODE = "replay"  — ReplayDownloadHandler віддає відповіді з архіву замість мережі
+                          з налаштовуваною затримкою; логін viatec_dealer теж відтворюється
+
+Архів — один SQLite файл, тіла стиснуті zlib (зберігаються «сирими», до
+HttpCompression/Redirect, тому редиректи та декомпресія працюють як у живому прогоні).
+Cookie/Authorization запиту та тіла запитів (логін/пароль) не зберігаються,
+значення Set-Cookie маскуються — імена cookie лишаються для перевірки логіну.
+
+Використання:
+  python scripts/ultra_clean_run.py viatec_dealer -s REPLAY_MODE=record
+  python scripts/ultra_clean_run.py viatec_dealer -s REPLAY_MODE=replay -s REPLAY_LATENCY=0.2
+"""
+import json
+import logging
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+from scrapy.http import Headers
+from scrapy.responsetypes import responsetypes
+from scrapy.utils.defer import maybe_deferred_to_future
+from twisted.internet.task import deferLater
+from suppliers.paths import output_path
+
+
+logger = logging.getLogger(__name__)
+
+# Заголовки запиту, які ніколи не потрапляють в архів
+SENSITIVE_REQUEST_HEADERS = {b"cookie", b"authorization", b"proxy-authorization"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS exchanges (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    method TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    request_headers TEXT NOT NULL,
+    response_headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    latency REAL,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS exchanges_key ON exchanges (method, url, id);
+"""
+
+
+def archive_path(settings, spider_name):
+    """Шлях до архіву: REPLAY_ARCHIVE або <REPLAY_DIR>/<spider>.sqlite"""
+    explicit = settings.get("REPLAY_ARCHIVE")
+    if explicit:
+        return Path(explicit)
+    return Path(settings.get("REPLAY_DIR", output_path("replay"))) / f"{spider_name}.sqlite"
+
+
+def _headers_to_json(headers, skip=()):
+    data = {}
+    for name, values in headers.items():
+        if name.lower() in skip:
+            continue
+        data[name.decode("latin-1")] = [v.decode("latin-1") for v in values]
+    return json.dumps(data, ensure_ascii=False)
+
+
+def _mask_set_cookie(value):
+    """viatec_session=abc; path=/ → viatec_session=recorded; path=/"""
+    cookie, sep, attributes = value.partition(b";")
+    name = cookie.split(b"=", 1)[0]
+    return name + b"=recorded" + sep + attributes
+
+
+class ReplayAddon:
+    """Вмикає запис або відтворення за REPLAY_MODE
+
+    Обробник завантаження ставиться з пріоритетом cmdline, щоб перекрити
+    DOWNLOAD_HANDLERS з custom_settings паука (Playwright у secur).
+    """
+
+    def update_settings(self, settings):
+        mode = settings.get("REPLAY_MODE", "")
+        if mode == "record":
+            middlewares = settings.getdict("DOWNLOADER_MIDDLEWARES")
+            middlewares["suppliers.replay.ReplayRecorderMiddleware"] = 950
+            settings.set("DOWNLOADER_MIDDLEWARES", middlewares, priority="cmdline")
+        elif mode == "replay":
+            handlers = settings.getdict("DOWNLOAD_HANDLERS")
+            handlers["http"] = "suppliers.replay.ReplayDownloadHandler"
+            handlers["https"] = "suppliers.replay.ReplayDownloadHandler"
+            settings.set("DOWNLOAD_HANDLERS", handlers, priority="cmdline")
+        elif mode:
+            raise ValueError(f"❌ Невідомий REPLAY_MODE: {mode} (очікується record або replay)")
+
+
+class ReplayRecorderMiddleware:
+    """Downloader middleware: пише кожну пару запит/відповідь в архів
+
+    Стоїть найближче до завантажувача (950), тому бачить відповіді
+    до розпакування та обробки редиректів.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = None
+        self.recorded = 0
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if crawler.settings.get("REPLAY_MODE") != "record":
+            raise NotConfigured
+        mw = cls(archive_path(crawler.settings, crawler.spidercls.name))
+        crawler.signals.connect(mw.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(mw.spider_closed, signal=signals.spider_closed)
+        return mw
+
+    def spider_opened(self, spider):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            self.path.unlink()
+        self.connection = sqlite3.connect(str(self.path))
+        self.connection.executescript(SCHEMA)
+        spider.logger.info(f"🎙️ Запис прогону в архів: {self.path}")
+
+    def spider_closed(self, spider):
+        if self.connection is None:
+            return
+        self.connection.commit()
+        self.connection.close()
+        self.connection = None
+        spider.logger.info(f"🎙️ Записано відповідей: {self.recorded} → {self.path}")
+
+    def process_response(self, request, response, spider):
+        if self.connection is None:
+            return response
+
+        response_headers = Headers(response.headers)
+        cookies = response_headers.getlist(b"Set-Cookie")
+        if cookies:
+            response_headers.setlist(b"Set-Cookie", [_mask_set_cookie(c) for c in cookies])
+
+        self.connection.execute(
+            "INSERT INTO exchanges (method, url, status, request_headers, response_headers, "
+            "body, latency, recorded_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                request.method,
+                request.url,
+                response.status,
+                _headers_to_json(request.headers, SENSITIVE_REQUEST_HEADERS),
+                _headers_to_json(response_headers),
+                zlib.compress(response.body, 6),
+                request.meta.get("download_latency"),
+                time.time(),
+            ),
+        )
+        self.recorded += 1
+        if self.recorded % 100 == 0:
+            self.connection.commit()
+        return response
+
+
+class ReplayDownloadHandler:
+    """Download handler: віддає відповіді з архіву замість мережі
+
+    Ключ — метод + URL; повторні запити того ж ключа отримують записи по черзі
+    (останній повторюється). Запити без запису отримують 404 — для robots.txt
+    це означає «без обмежень», для сторінок — звичайну обробку помилки паука.
+
+    REPLAY_LATENCY: "recorded" — записаний час завантаження, або число секунд
+    REPLAY_LATENCY_SCALE: множник затримки (0 — без затримок)
+    """
+
+    lazy = False
+
+    def __init__(self, path, latency="recorded", scale=1.0):
+        if not path.exists():
+            raise FileNotFoundError(f"❌ Архів відтворення не знайдено: {path}")
+        self.path = path
+        self.fixed_latency = None if str(latency) == "recorded" else float(latency)
+        self.scale = scale
+        self.exchanges = self._load(path)
+        self.positions = {}
+        self.missing = 0
+        logger.info(f"▶️ Відтворення з архіву: {path} ({sum(map(len, self.exchanges.values()))} відповідей)")
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        return cls(
+            archive_path(settings, crawler.spidercls.name),
+            latency=settings.get("REPLAY_LATENCY", "recorded"),
+            scale=settings.getfloat("REPLAY_LATENCY_SCALE", 1.0),
+        )
+
+    @staticmethod
+    def _load(path):
+        exchanges = {}
+        connection = sqlite3.connect(str(path))
+        try:
+            rows = connection.execute(
+                "SELECT method, url, status, response_headers, body, latency FROM exchanges ORDER BY id"
+            )
+            for method, url, status, headers, body, latency in rows:
+                exchanges.setdefault((method, url), []).append((status, headers, body, latency))
+        finally:
+            connection.close()
+        return exchanges
+
+    def _next_exchange(self, request):
+        key = (request.method, request.url)
+        records = self.exchanges.get(key)
+        if not records:
+            return None
+        position = self.positions.get(key, 0)
+        self.positions[key] = position + 1
+        return records[min(position, len(records) - 1)]
+
+    def _build_response(self, request, exchange):
+        if exchange is None:
+            self.missing += 1
+            if not request.url.endswith("/robots.txt"):
+                logger.warning(f"⚠️ Немає запису для {request.method} {request.url} → 404")
+            return responsetypes.from_args(url=request.url, body=b"")(
+                url=request.url, status=404, body=b"", request=request
+            )
+
+        status, headers_json, body, _latency = exchange
+        headers = Headers({k: v for k, v in json.loads(headers_json).items()})
+        body = zlib.decompress(body)
+        respcls = responsetypes.from_args(headers=headers, url=request.url, body=body)
+        return respcls(url=request.url, status=status, headers=headers, body=body, request=request)
+
+    async def download_request(self, request):
+        exchange = self._next_exchange(request)
+        if self.fixed_latency is not None:
+            delay = self.fixed_latency
+        else:
+            delay = (exchange[3] or 0.0) if exchange is not None else 0.0
+        delay *= self.scale
+        # AutoThrottle та метрики бачать затримку так само, як у живому прогоні
+        request.meta["download_latency"] = delay
+
+        if delay > 0:
+            # Реактор імпортується тут, щоб не встановити його раніше за Scrapy
+            from twisted.internet import reactor
+            await maybe_deferred_to_future(deferLater(reactor, delay))
+        return self._build_response(request, exchange)
+
+    async def close(self):
+        if self.missing:
+            logger.info(f"▶️ Запитів без запису в архіві: {self.missing}")
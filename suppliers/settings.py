@@ -7,12 +7,18 @@
 #     https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
 #     https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+from suppliers.paths import OUTPUT_DIR, output_path
+
 BOT_NAME = "suppliers"
 
 SPIDER_MODULES = ["suppliers.spiders"]
 NEWSPIDER_MODULE = "suppliers.spiders"
 
-ADDONS = {}
+ADDONS = {
+    "suppliers.replay.ReplayAddon": 100,
+    "suppliers.connections.ConnectionPoolAddon": 200,
+    "suppliers.deadline.DeadlineAddon": 300,
+}
 
 # ==============================================================================
 # USER-AGENT (Обязательно для избежания блокировок)
@@ -43,22 +49,56 @@ DOWNLOAD_DELAY = 0.5
 DOWNLOAD_TIMEOUT = 30
 
 # ==============================================================================
-# AUTOTHROTTLE (Динамическая регулировка скорости)
+# AUTOTHROTTLE (Замінено адаптивним контролером, див. ADAPTIVE THROTTLE)
 # ==============================================================================
-# Включить автоматическую регулировку на основе нагрузки сервера
-AUTOTHROTTLE_ENABLED = True
+AUTOTHROTTLE_ENABLED = False
 
-# Начальная задержка (секунды) - зменшено для швидкості
-AUTOTHROTTLE_START_DELAY = 0.5
+# ==============================================================================
+# ADAPTIVE THROTTLE (AIMD-керування конкурентністю по доменах)
+# ==============================================================================
+# DOWNLOAD_DELAY та CONCURRENT_REQUESTS_PER_DOMAIN — лише стартові значення,
+# далі контролер підбирає максимальну безпечну швидкість для кожного домену
+# за латентністю, часткою помилок та 429/Retry-After (suppliers/throttle.py)
+ADAPTIVE_THROTTLE_ENABLED = True
+ADAPTIVE_THROTTLE_MIN_CONCURRENCY = 1
+ADAPTIVE_THROTTLE_MAX_CONCURRENCY = 8
+ADAPTIVE_THROTTLE_MIN_DELAY = 0.0
+ADAPTIVE_THROTTLE_MAX_DELAY = 60
+# Кількість відповідей між рішеннями контролера
+ADAPTIVE_THROTTLE_WINDOW = 20
+# Частка помилок у вікні, вище якої швидкість зменшується
+ADAPTIVE_THROTTLE_MAX_ERROR_RATE = 0.05
+# Латентність у N разів гірша за найкращу для домену → зменшуємо швидкість
+ADAPTIVE_THROTTLE_LATENCY_FACTOR = 3.0
+# Верхня межа паузи за Retry-After (секунди)
+ADAPTIVE_THROTTLE_MAX_RETRY_AFTER = 300
 
-# Максимальная задержка при высоких задержках ответа (секунды)
-AUTOTHROTTLE_MAX_DELAY = 5
+DOWNLOADER_MIDDLEWARES = {
+    'suppliers.throttle.AdaptiveConcurrencyMiddleware': 945,
+}
 
-# Целевое количество параллельных запросов на домен
-AUTOTHROTTLE_TARGET_CONCURRENCY = 1.0
+# ==============================================================================
+# CONNECTIONS (Пул з'єднань до хоста постачальника, HTTP/2)
+# ==============================================================================
+# Вимкнено за замовчуванням (стандартний обробник Scrapy), як і HTTP/2.
+# CONNECTION_POOL_ENABLED — HTTP/1.1 keep-alive: пул на хост = CONNECTION_POOL_PER_HOST
+# (0 — верхня межа ADAPTIVE_THROTTLE_MAX_CONCURRENCY). HTTP2_ENABLED — мультиплексування
+# запитів в одному з'єднанні, якщо сервер підтримує h2 (потрібен pip install "httpx2[http2]").
+# Відкриті з'єднання та протоколи — у звіті метрик (domains.<host>.connections)
+CONNECTION_POOL_ENABLED = False
+CONNECTION_POOL_PER_HOST = 0
+HTTP2_ENABLED = False
 
-# Показывать статистику throttling в логах (для отладки)
-AUTOTHROTTLE_DEBUG = False
+# ==============================================================================
+# ASYNCIO ENGINE (Легкий рушій для статичних постачальників, suppliers/engine.py)
+# ==============================================================================
+# python scripts/ultra_clean_run.py lun_retail --engine asyncio
+# ENGINE_CONCURRENCY — воркери та паралельні ланцюги товарів (0 — CONCURRENT_REQUESTS_PER_DOMAIN)
+ENGINE_CONCURRENCY = 0
+ENGINE_UVLOOP = True
+
+# Паралельні ланцюги товарів категорії для рушія Scrapy (1 — послідовно, як раніше)
+PRODUCT_LANES = 1
 
 # ==============================================================================
 # COOKIES
@@ -111,11 +151,145 @@ EXTENSIONS = {
     'scrapy.extensions.corestats.CoreStats': None,
     'scrapy.extensions.telnet.TelnetConsole': None,
     'scrapy.extensions.logstats.LogStats': None,
+    'suppliers.metrics.CrawlMetrics': 500,
+    'suppliers.checkpoint.CheckpointExtension': 510,
+    'suppliers.backpressure.BackpressureExtension': 520,
 }
 
 # Отключаем вывод статистики при закрытии
 STATS_CLASS = 'scrapy.statscollectors.DummyStatsCollector'
 
+# ==============================================================================
+# METRICS (Легкі метрики прогону замість CoreStats/LogStats)
+# ==============================================================================
+# Запити/с і байти по доменах, гістограма затримок, час callback'ів та етапів
+# pipeline. Звіт пишеться в METRICS_OUTPUT_DIR/<spider>_metrics.json
+METRICS_ENABLED = True
+METRICS_OUTPUT_DIR = str(OUTPUT_DIR)
+
+# Вимір часу callback'ів: має бути найближчим до паука (найбільший номер)
+SPIDER_MIDDLEWARES = {
+    'suppliers.metrics.CallbackTimingMiddleware': 950,
+}
+
+# ==============================================================================
+# FAILED PRODUCTS (Відкладені повтори та список помилок для наступного запуску)
+# ==============================================================================
+# Товари, що не завантажились навіть після відкладених повторів, пишуться в
+# FAILED_PRODUCTS_DIR/<spider>_failed.json; наступний запуск:
+#   scrapy crawl viatec_retail -a failed_mode=first   (спочатку вони, далі весь обхід)
+#   scrapy crawl viatec_retail -a failed_mode=only    (тільки вони)
+FAILED_PRODUCTS_DIR = str(OUTPUT_DIR)
+
+# ==============================================================================
+# CHECKPOINT (Продовження перерваних прогонів)
+# ==============================================================================
+# Кожні CHECKPOINT_INTERVAL секунд стан обходу (категорія, товари що лишились,
+# оброблені URL, код товару, зсув у CSV) пишеться в
+# CHECKPOINT_DIR/<spider>_checkpoint.json; успішне завершення його видаляє.
+#   scrapy crawl viatec_dealer -a resume=1   (продовжити з місця зупинки, CSV дописується)
+CHECKPOINT_ENABLED = True
+CHECKPOINT_DIR = str(output_path("checkpoints"))
+CHECKPOINT_INTERVAL = 30
+
+# ==============================================================================
+# FRONTIER (Черга товарів категорії)
+# ==============================================================================
+# Перші FRONTIER_MEMORY_ITEMS товарів категорії тримаються в пам'яті, решта
+# вивантажується в FRONTIER_DIR/<spider>_frontier.sqlite (видаляється при закритті)
+FRONTIER_DIR = str(output_path("frontier"))
+FRONTIER_MEMORY_ITEMS = 1000
+
+# ==============================================================================
+# SEEN STORE (Відбитки завантажених товарів між прогонами)
+# ==============================================================================
+# Кожен прогін відмічає завантажені товари (64-бітні відбитки канонічних URL);
+# інкрементальний режим пропускає свіжі:
+#   scrapy crawl viatec_retail -a skip_seen_hours=24
+# SEEN_NAMESPACE — спільний простір для кількох пауків (напр. "viatec"), інакше ім'я паука
+SEEN_STORE_ENABLED = True
+SEEN_STORE_PATH = str(output_path("seen_products.sqlite"))
+SEEN_NAMESPACE = ""
+
+# ==============================================================================
+# BACKPRESSURE (Фіксований обсяг пам'яті при паралельних ланцюгах)
+# ==============================================================================
+# Раз на BACKPRESSURE_INTERVAL секунд: якщо RSS процесу, відповіді в черзі паука або
+# item в pipeline перевищують межу — engine.pause(), продовження нижче
+# BACKPRESSURE_RESUME_RATIO від межі. 0 — межа вимкнена (suppliers/backpressure.py)
+BACKPRESSURE_ENABLED = True
+BACKPRESSURE_MAX_RSS_MB = 1024
+BACKPRESSURE_MAX_RESPONSES = 32
+BACKPRESSURE_MAX_ITEMS = 100
+BACKPRESSURE_RESUME_RATIO = 0.8
+BACKPRESSURE_INTERVAL = 1.0
+
+# ==============================================================================
+# DEADLINE (Бюджет часу прогону, suppliers/deadline.py)
+# ==============================================================================
+# "45m", "1h30m" або секунди; "" — без обмеження. Категорії ділять залишок бюджету,
+# на дедлайні паук перестає ставити запити і закривається з причиною "deadline"
+# (CSV, метрики та checkpoint записуються штатно). Через DEADLINE_GRACE секунд після
+# дедлайну спрацьовує CLOSESPIDER_TIMEOUT. Кілька постачальників: scripts/nightly_run.py
+CRAWL_DEADLINE = ""
+DEADLINE_GRACE = 120
+
+# ==============================================================================
+# VOLATILITY (Частота змін ціни/наявності між прогонами)
+# ==============================================================================
+# В кінці прогону ціна/наявність кожного товару порівнюється з попереднім прогоном;
+# наступний прогін обходить категорії та товари категорії від найчастіше змінюваних
+# (частковий прогін з CLOSESPIDER_TIMEOUT першими оновлює саме їх)
+VOLATILITY_ENABLED = True
+VOLATILITY_STORE_PATH = str(output_path("volatility.sqlite"))
+
+# ==============================================================================
+# CONTENT CACHE (Назва/опис/характеристики за артикулом між прогонами)
+# ==============================================================================
+# Якщо контент завантаженої мовної сторінки не змінився (хеш), друга мовна
+# сторінка не завантажується — її контент береться з кешу (viatec_retail, viatec_dealer)
+CONTENT_CACHE_ENABLED = True
+CONTENT_CACHE_PATH = str(output_path("content_cache.sqlite"))
+
+# ==============================================================================
+# EXTRACTOR BACKEND (HTML-парсер екстракторів сторінок, suppliers/extractors/)
+# ==============================================================================
+# "lxml" — дерево parsel/lxml; "lexbor" — selectolax, швидший розбір великих сторінок
+# (pip install selectolax). Для окремого паука: custom_settings або
+# scrapy crawl eserver_retail -s EXTRACTOR_BACKEND=lexbor
+EXTRACTOR_BACKEND = "lxml"
+
+# ==============================================================================
+# PRODUCT CODES (Код_товару без колізій між пауками та шардами)
+# ==============================================================================
+# Лічильник постачальника в SQLite; кожен процес резервує блоки по PRODUCT_CODES_BLOCK
+# кодів, невикористаний залишок повертається при закритті. Початкове значення —
+# data/<supplier>/<supplier>_counter_product_code.csv
+PRODUCT_CODES_ENABLED = True
+PRODUCT_CODES_PATH = str(output_path("product_codes.sqlite"))
+PRODUCT_CODES_BLOCK = 100
+
+# ==============================================================================
+# SHARDING (Кілька воркерів на одного постачальника)
+# ==============================================================================
+# scrapy crawl viatec_retail -a shard=0/4 -a run_id=20260101 (або scripts/shard_run.py)
+# Товари з категорій кількох шардів завантажує той, хто перший їх застовпив:
+# шлях до SQLite (одна машина / спільний диск) або redis://host:6379/0 (кілька машин)
+SHARD_STORE = str(output_path("shard_claims.sqlite"))
+
+# ==============================================================================
+# REPLAY (Запис/відтворення прогонів для офлайн навантажувальних тестів)
+# ==============================================================================
+# "" — звичайний прогін, "record" — запис в архів, "replay" — відтворення з архіву
+# Приклад: scrapy crawl viatec_dealer -s REPLAY_MODE=replay -s REPLAY_LATENCY=0.2
+REPLAY_MODE = ""
+REPLAY_DIR = str(output_path("replay"))
+# Явний шлях до архіву (за замовчуванням <REPLAY_DIR>/<spider>.sqlite)
+REPLAY_ARCHIVE = ""
+# "recorded" — записаний час завантаження, або фіксована затримка в секундах
+REPLAY_LATENCY = "recorded"
+REPLAY_LATENCY_SCALE = 1.0
+
 # ==============================================================================
 # FEEDS (Не используем, т.к. pipeline управляет двумя CSV)
 # ==============================================================================
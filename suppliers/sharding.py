@@ -0,0 +1,177 @@
+"""
+Шардований прогін: категорії постачальника діляться між N воркерами
+(процесами або машинами), результати зливаються в звичайний <spider>.csv.
+
+- воркер i з N (-a shard=i/N) бере категорії з індексом k % N == i
+  (у режимі -a discovery=sitemap — товари з відбитком URL % N == i)
+- товар, що є в категоріях кількох шардів, завантажує лише той шард,
+  який першим «застовпив» його в спільному сховищі (ShardStore) прогону run_id:
+  SQLite файл (SHARD_STORE = шлях) або Redis-сумісний сервер (SHARD_STORE = redis://...);
+  сховище пам'ятає шард-власника, тож після -a resume=1 шард знову отримує свої товари
+- кожен шард пише <spider>.shard<i>of<N>.csv (та власні checkpoint/frontier/failed),
+  merge_shards() зливає їх по порядку шардів в <spider>.csv
+
+Запуск і злиття: scripts/shard_run.py
+"""
+import sqlite3
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS claims (
+    run_id TEXT NOT NULL,
+    namespace TEXT NOT NULL,
+    fingerprint INTEGER NOT NULL,
+    shard INTEGER NOT NULL DEFAULT -1,
+    PRIMARY KEY (run_id, namespace, fingerprint)
+) WITHOUT ROWID;
+"""
+
+# Колонка для дедуплікації рядків при злитті
+PRODUCT_URL_COLUMN = "Продукт_на_сайті"
+
+
+def parse_shard(value) -> Optional[Tuple[int, int]]:
+    """"1/4" → (1, 4); порожнє → None"""
+    if not value:
+        return None
+    try:
+        index, count = (int(part) for part in str(value).split("/"))
+    except ValueError:
+        raise ValueError(f"❌ Некоректний shard: {value} (очікується i/N, напр. 0/4)")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"❌ Некоректний shard: {value} (0 <= i < N)")
+    return index, count
+
+
+def shard_suffix(shard: Optional[Tuple[int, int]]) -> str:
+    return f".shard{shard[0]}of{shard[1]}" if shard else ""
+
+
+def shard_filename(filename: str, shard: Optional[Tuple[int, int]]) -> str:
+    """viatec_retail.csv → viatec_retail.shard1of4.csv"""
+    if not shard:
+        return filename
+    path = Path(filename)
+    return f"{path.stem}{shard_suffix(shard)}{path.suffix}"
+
+
+class SqliteShardStore:
+    """Спільне сховище «товар уже взяв інший шард» у SQLite (одна машина або спільний диск)"""
+
+    def __init__(self, path, run_id: str, namespace: str, shard_index: int):
+        self.path = Path(path)
+        self.run_id = run_id
+        self.namespace = namespace
+        self.shard_index = shard_index
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(claims)")}
+        if "shard" not in columns:
+            self.connection.execute("ALTER TABLE claims ADD COLUMN shard INTEGER NOT NULL DEFAULT -1")
+
+    def claim(self, fingerprint: int) -> bool:
+        """True — товар цього шарду (щойно застовплений або застовплений ним раніше); False — іншого"""
+        cursor = self.connection.execute(
+            "INSERT OR IGNORE INTO claims (run_id, namespace, fingerprint, shard) VALUES (?, ?, ?, ?)",
+            (self.run_id, self.namespace, fingerprint, self.shard_index),
+        )
+        if cursor.rowcount == 1:
+            return True
+        row = self.connection.execute(
+            "SELECT shard FROM claims WHERE run_id = ? AND namespace = ? AND fingerprint = ?",
+            (self.run_id, self.namespace, fingerprint),
+        ).fetchone()
+        return row is not None and row[0] == self.shard_index
+
+    def clear(self):
+        self.connection.execute("DELETE FROM claims WHERE run_id = ? AND namespace = ?", (self.run_id, self.namespace))
+
+    def close(self):
+        self.connection.close()
+
+
+class RedisShardStore:
+    """Те саме на Redis-сумісному сервері (кілька машин); потрібен пакет redis"""
+
+    # Ключі прогону живуть не довше доби
+    TTL = 24 * 3600
+
+    def __init__(self, url: str, run_id: str, namespace: str, shard_index: int):
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("❌ SHARD_STORE=redis://... потребує пакет redis: pip install redis")
+        self.client = redis.Redis.from_url(url)
+        self.shard_index = shard_index
+        # Хеш відбиток → шард-власник
+        self.key = f"suppliers:shard:{namespace}:{run_id}:owners"
+
+    def claim(self, fingerprint: int) -> bool:
+        with self.client.pipeline() as pipe:
+            pipe.hsetnx(self.key, fingerprint, self.shard_index)
+            pipe.hget(self.key, fingerprint)
+            pipe.expire(self.key, self.TTL)
+            _added, owner, _ = pipe.execute()
+        return owner is not None and int(owner) == self.shard_index
+
+    def clear(self):
+        self.client.delete(self.key)
+
+    def close(self):
+        self.client.close()
+
+
+def open_shard_store(location, run_id: str, namespace: str, shard_index: int):
+    """SHARD_STORE: redis://... або шлях до SQLite; shard_index — номер шарду-власника claim()"""
+    if str(location).startswith(("redis://", "rediss://", "unix://")):
+        return RedisShardStore(str(location), run_id, namespace, shard_index)
+    return SqliteShardStore(location, run_id, namespace, shard_index)
+
+
+def shard_files(output_dir, filename: str, count: int) -> Iterable[Path]:
+    for index in range(count):
+        yield Path(output_dir) / shard_filename(filename, (index, count))
+
+
+def merge_shards(output_dir, filename: str, count: int) -> Tuple[int, int]:
+    """Зливає <name>.shard<i>of<N>.csv по порядку шардів в <name>.csv
+
+    Заголовок (і BOM) береться один раз, рядки з уже записаним товаром
+    (Продукт_на_сайті) пропускаються. Pipeline замінює ; та переноси в значеннях,
+    тож рядок файлу — рівно один товар. Повертає (рядків, дублікатів).
+    """
+    target = Path(output_dir) / filename
+    missing = [str(path) for path in shard_files(output_dir, filename, count) if not path.exists()]
+    if missing:
+        raise FileNotFoundError(f"❌ Немає файлів шардів: {', '.join(missing)}")
+
+    rows = duplicates = 0
+    seen = set()
+    url_index = None
+    tmp_target = target.with_suffix(target.suffix + ".tmp")
+    with open(tmp_target, "w", encoding="utf-8-sig", newline="") as out:
+        for path in shard_files(output_dir, filename, count):
+            with open(path, encoding="utf-8-sig", newline="") as f:
+                header = f.readline()
+                if url_index is None:
+                    out.write(header)
+                    columns = header.rstrip("\r\n").split(";")
+                    url_index = columns.index(PRODUCT_URL_COLUMN) if PRODUCT_URL_COLUMN in columns else -1
+                for line in f:
+                    if not line.strip():
+                        continue
+                    if url_index >= 0:
+                        product_url = line.split(";")[url_index]
+                        if product_url in seen:
+                            duplicates += 1
+                            continue
+                        seen.add(product_url)
+                    out.write(line)
+                    rows += 1
+    tmp_target.replace(target)
+    return rows, duplicates
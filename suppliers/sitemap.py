@@ -0,0 +1,75 @@
+"""
+Потоковий розбір sitemap для пошуку товарів без обходу пагінації категорій.
+
+- sitemap_urls_from_robots() — рядки "Sitemap:" з robots.txt
+- iter_sitemap()             — потоковий (lxml.iterparse) розбір sitemap index та urlset:
+                               ("sitemap" | "url", loc, lastmod) без побудови всього дерева
+- parse_lastmod()            — <lastmod> (W3C Datetime) → unix timestamp
+
+Використання в пауках: -a discovery=sitemap (див. BaseSupplierSpider._sitemap_start_requests)
+"""
+import gzip
+from datetime import datetime, timezone
+from io import BytesIO
+from typing import Iterator, Optional, Tuple
+
+from lxml import etree
+from scrapy.utils.sitemap import sitemap_urls_from_robots
+
+
+# Обмеження розпакованого sitemap (захист від gzip-бомби), як SITEMAP_MAX_SIZE у Scrapy
+MAX_SITEMAP_SIZE = 50 * 1024 * 1024
+
+
+def sitemap_body(response) -> bytes:
+    """Тіло sitemap; .xml.gz розпаковується (Content-Encoding вже зняв HttpCompression)"""
+    body = response.body
+    if body[:2] == b"\x1f\x8b":
+        with gzip.GzipFile(fileobj=BytesIO(body)) as f:
+            body = f.read(MAX_SITEMAP_SIZE + 1)
+        if len(body) > MAX_SITEMAP_SIZE:
+            raise ValueError(f"Sitemap більший за {MAX_SITEMAP_SIZE} байт: {response.url}")
+    return body
+
+
+def _local_name(tag) -> str:
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+def iter_sitemap(body: bytes) -> Iterator[Tuple[str, str, Optional[str]]]:
+    """Потоковий розбір: ("sitemap", loc, lastmod) для index, ("url", loc, lastmod) для urlset
+
+    Оброблені елементи очищаються, тому пам'ять не росте з розміром sitemap.
+    """
+    events = etree.iterparse(
+        BytesIO(body), events=("end",), resolve_entities=False, no_network=True, huge_tree=True, recover=True,
+    )
+    for _event, element in events:
+        kind = _local_name(element.tag)
+        if kind not in ("url", "sitemap"):
+            continue
+        loc = lastmod = None
+        for child in element:
+            name = _local_name(child.tag)
+            if name == "loc":
+                loc = (child.text or "").strip()
+            elif name == "lastmod":
+                lastmod = (child.text or "").strip() or None
+        if loc:
+            yield kind, loc, lastmod
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[float]:
+    """2024-05-01 | 2024-05-01T10:00:00+03:00 | ...Z → unix timestamp (None якщо не розібрано)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
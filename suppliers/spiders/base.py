@@ -3,9 +3,27 @@
 Мінімізує дублювання коду та забезпечує уніфікований підхід.
 """
 import scrapy
+import csv
+import json
 import re
+import sqlite3
+import time
 from pathlib import Path
 from typing import Optional, Dict, List
+from urllib.parse import urlsplit
+from scrapy import signals
+from scrapy.exceptions import CloseSpider, DontCloseSpider
+from suppliers.checkpoint import get_checkpoint
+from suppliers.deadline import CrawlBudget, format_duration, parse_duration
+from suppliers.extractors import CategoryPage, PageExtractor, ProductPage, ViatecExtractor
+from suppliers.content_cache import ContentCache, content_hash
+from suppliers.filters import NO_PRICE, NO_STOCK, drop_reason, is_in_stock
+from suppliers.fingerprints import FingerprintSet, SeenStore, strip_url_prefixes
+from suppliers.sitemap import iter_sitemap, parse_lastmod, sitemap_body, sitemap_urls_from_robots
+from suppliers.frontier import ProductFrontier
+from suppliers.paths import OUTPUT_DIR, data_path, output_path
+from suppliers.sharding import open_shard_store, parse_shard, shard_suffix
+from suppliers.volatility import PRIOR_RATE, VolatilityStore, item_state, state_hash
 
 
 class BaseSupplierSpider(scrapy.Spider):
@@ -14,17 +32,226 @@ class BaseSupplierSpider(scrapy.Spider):
     # Налаштування за замовчуванням (можна перевизначити в дочірніх класах)
     custom_settings = {
         "CONCURRENT_REQUESTS": 8,
-        "CONCURRENT_REQUESTS_PER_DOMAIN": 8,
-        "AUTOTHROTTLE_ENABLED": True,
-        "AUTOTHROTTLE_START_DELAY": 1,
-        "AUTOTHROTTLE_MAX_DELAY": 60,
-        "AUTOTHROTTLE_TARGET_CONCURRENCY": 2.0,
+        # Стартова конкурентність; далі її підбирає suppliers.throttle по домену
+        "CONCURRENT_REQUESTS_PER_DOMAIN": 2,
+        "ADAPTIVE_THROTTLE_MAX_CONCURRENCY": 8,
     }
     
+    # Ключі meta, які описують категорію товару (достатньо для повторного запиту товару)
+    CATEGORY_META_KEYS = (
+        "category_url", "category_ru", "category_ua",
+        "group_number", "subdivision_id", "subdivision_link",
+    )
+    
+    # Мовні префікси шляху, що не змінюють товар (viatec: /ru/)
+    url_locale_prefixes = ()
+    
+    # Sitemap постачальника для -a discovery=sitemap (порожньо — з robots.txt)
+    sitemap_urls = ()
+    
+    # Callback першого запиту товару в ланцюгу (secur перевизначає)
+    product_callback_name = "parse_product"
+    
+    # Паук працює з asyncio-рушієм (--engine asyncio): без логіну, JS та особливих middleware
+    asyncio_engine = False
+    
+    # Клас екстрактора сторінок постачальника (suppliers/extractors/), бекенд — EXTRACTOR_BACKEND
+    extractor_class = None
+    
+    # Відкладені повтори товарів з помилками: після спорожнення основної черги,
+    # з експоненційною затримкою deferred_retry_delay * 2^спроба
+    deferred_retry_times = 3
+    deferred_retry_delay = 30
+    deferred_retry_priority = -100
+    
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.processed_products = set()
+        self.processed_products = FingerprintSet(self.url_locale_prefixes)
+        # Відбиток → категорія товарів, завантажених цим прогоном (для SeenStore)
+        self.scraped_fingerprints = {}
+        # Відбиток → ціна/наявність item товару цього прогону (для VolatilityStore)
+        self.product_states = {}
+        # Частота змін з минулих прогонів: відбиток → частота, category_url → частота
+        self._product_volatility = {}
+        self._category_volatility = {}
         self.failed_products = []
+        self.deferred_retry_queue = []
+        # Товари, відкинуті пауком до другого запиту (suppliers/filters.py)
+        self.early_filtered = {NO_PRICE: 0, NO_STOCK: 0}
+        
+        # -a failed_mode=first — спочатку товари з помилками минулого запуску, далі звичайний обхід
+        # -a failed_mode=only  — тільки товари з помилками минулого запуску
+        self.failed_mode = kwargs.get("failed_mode", "") or ""
+        if self.failed_mode not in ("", "first", "only"):
+            raise ValueError(f"❌ Невідомий failed_mode: {self.failed_mode} (очікується first або only)")
+        
+        # -a skip_seen_hours=24 — інкрементальний режим: пропускати товари,
+        # завантажені попередніми прогонами за останні N годин (SEEN_STORE_PATH)
+        self.skip_seen_hours = float(kwargs.get("skip_seen_hours", 0) or 0)
+        
+        # -a discovery=sitemap — товари з sitemap (robots.txt) замість пагінації категорій
+        self.discovery = kwargs.get("discovery", "") or "categories"
+        if self.discovery not in ("categories", "sitemap"):
+            raise ValueError(f"❌ Невідомий discovery: {self.discovery} (очікується categories або sitemap)")
+        self.sitemap_stats = {"sitemaps": 0, "urls": 0, "queued": 0, "unchanged": 0, "unmapped": 0}
+        self._sitemaps_pending = 0
+        self._seen_index = {}
+        
+        # -a resume=1 — продовжити перерваний обхід з checkpoint (suppliers/checkpoint.py)
+        self.resume = str(kwargs.get("resume", "")).lower() in ("1", "true", "yes")
+        
+        # -a shard=i/N -a run_id=X — воркер i з N одного прогону (suppliers/sharding.py)
+        self.shard = parse_shard(kwargs.get("shard"))
+        self.run_id = kwargs.get("run_id", "") or ""
+        if self.shard and not self.run_id:
+            raise ValueError("❌ -a shard=i/N потребує -a run_id (спільний для всіх шардів прогону)")
+        # Ім'я для файлів стану (frontier, checkpoint, failed, метрики): свої для кожного шарду
+        self.run_name = f"{self.name}{shard_suffix(self.shard)}"
+        self._shard_store = None
+        self.shard_skipped = 0
+        
+        # Межа обходу: поточна категорія та фаза (пагінація / ланцюг товарів)
+        self.frontier = {"category_index": 0, "phase": "pagination"}
+        self._product_frontier = None
+        self._content_cache = None
+        self._extractor = None
+        
+        # Бюджет часу (CRAWL_DEADLINE, suppliers/deadline.py): межа поточної категорії
+        self._crawl_budget = None
+        self._category_until = None
+        self.deadline_reached = False
+    
+    @property
+    def product_frontier(self) -> ProductFrontier:
+        """Черга товарів поточної категорії (suppliers/frontier.py)
+        
+        Створюється при першому зверненні — settings паука з'являються після __init__.
+        """
+        if self._product_frontier is None:
+            settings = getattr(self, "settings", None)
+            if settings is None:
+                self._product_frontier = ProductFrontier()
+            else:
+                frontier_dir = settings.get("FRONTIER_DIR", output_path("frontier"))
+                self._product_frontier = ProductFrontier(
+                    Path(frontier_dir) / f"{self.run_name}_frontier.sqlite",
+                    memory_items=settings.getint("FRONTIER_MEMORY_ITEMS", 1000),
+                )
+        return self._product_frontier
+    
+    @property
+    def product_lanes(self) -> int:
+        """Кількість паралельних ланцюгів товарів категорії (PRODUCT_LANES, за замовчуванням 1)"""
+        settings = getattr(self, "settings", None)
+        return max(1, settings.getint("PRODUCT_LANES", 1)) if settings is not None else 1
+    
+    @property
+    def extractor(self) -> PageExtractor:
+        """Екстрактор сторінок (extractor_class) на HTML-бекенді EXTRACTOR_BACKEND: lxml або lexbor"""
+        if self._extractor is None:
+            settings = getattr(self, "settings", None)
+            backend = settings.get("EXTRACTOR_BACKEND", "lxml") if settings is not None else "lxml"
+            self._extractor = self.extractor_class(backend)
+        return self._extractor
+    
+    @property
+    def content_cache(self) -> Optional[ContentCache]:
+        """Кеш контенту товарів за артикулом (suppliers/content_cache.py); None якщо вимкнено"""
+        if self._content_cache is None:
+            settings = getattr(self, "settings", None)
+            if settings is None or not settings.getbool("CONTENT_CACHE_ENABLED", True):
+                return None
+            path = settings.get("CONTENT_CACHE_PATH", output_path("content_cache.sqlite"))
+            self._content_cache = ContentCache(path, self.supplier_id)
+        return self._content_cache
+    
+    @property
+    def crawl_budget(self) -> Optional[CrawlBudget]:
+        """Бюджет часу прогону; None без CRAWL_DEADLINE (відлік — з першого звернення на старті)"""
+        if self._crawl_budget is None:
+            settings = getattr(self, "settings", None)
+            seconds = parse_duration(settings.get("CRAWL_DEADLINE")) if settings is not None else 0
+            if seconds:
+                self._crawl_budget = CrawlBudget(seconds)
+        return self._crawl_budget
+    
+    @property
+    def shard_store(self):
+        """Спільне сховище товарів, уже взятих шардами прогону; None без -a shard"""
+        if self._shard_store is None and self.shard:
+            settings = getattr(self, "settings", None)
+            location = settings.get("SHARD_STORE") if settings is not None else None
+            self._shard_store = open_shard_store(
+                location or output_path("shard_claims.sqlite"), self.run_id, self.name, self.shard[0]
+            )
+        return self._shard_store
+    
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        crawler.signals.connect(spider._on_spider_idle, signal=signals.spider_idle)
+        crawler.signals.connect(spider._on_item_scraped, signal=signals.item_scraped)
+        crawler.signals.connect(spider._on_item_scraped, signal=signals.item_dropped)
+        if spider.extractor_class is not None:
+            # Невідомий бекенд або lexbor без selectolax — помилка на старті, а не на кожному товарі
+            spider.logger.info(f"🧩 HTML-бекенд екстрактора: {spider.extractor.backend.name}")
+        return spider
+    
+    async def start(self):
+        """Scrapy >= 2.13 викликає start() замість start_requests() — делегуємо"""
+        for request in self.start_requests():
+            yield request
+    
+    def start_requests(self):
+        """Стартуємо з першої категорії"""
+        yield from self._crawl_start_requests()
+    
+    def _crawl_start_requests(self):
+        """Стартові запити обходу: товари з помилками, продовження з checkpoint, перша категорія"""
+        get_checkpoint(self).register("spider", self.checkpoint_state)
+        if self.crawl_budget is not None:
+            self.logger.info(f"⏰ Бюджет часу прогону: {format_duration(self.crawl_budget.seconds)}")
+        
+        # Товари з помилками минулого запуску (-a failed_mode=first|only)
+        yield from self._failed_product_requests()
+        if self.failed_mode == "only":
+            return
+        
+        if self.shard and self.discovery == "categories":
+            self._take_shard_categories()
+        
+        if not self.category_urls:
+            self.logger.error("Немає категорій для парсингу.")
+            return
+        
+        self._order_by_volatility()
+        
+        if self.skip_seen_hours:
+            self._skip_recently_seen()
+        
+        # Продовження перерваного обходу (-a resume=1)
+        if self.resume:
+            state = get_checkpoint(self).restored("spider")
+            if state:
+                yield from self._resume_requests(state)
+                return
+            self.logger.warning(f"⚠️ Checkpoint не знайдено: {get_checkpoint(self).path}. Починаю з початку.")
+        
+        if self.discovery == "sitemap":
+            yield from self._sitemap_start_requests()
+            return
+        
+        first_category_url = self.category_urls[0]
+        self.logger.info(f"🚀 СТАРТ ПАРСИНГУ. Перша категорія [1/{len(self.category_urls)}]: {first_category_url}")
+        self._enter_category(0)
+        yield self._category_request(first_category_url, 0)
+    
+    def _take_shard_categories(self):
+        """Залишає категорії шарду: k % N == i (порядок категорій однаковий у всіх шардів)"""
+        index, count = self.shard
+        total = len(self.category_urls)
+        self.category_urls = [url for k, url in enumerate(self.category_urls) if k % count == index]
+        self.logger.info(f"🧩 Шард {index + 1}/{count} (run_id={self.run_id}): категорій {len(self.category_urls)} з {total}")
     
     def _clean_price(self, price_str: str) -> str:
         """Очищення ціни від зайвих символів"""
@@ -96,7 +323,7 @@ class BaseSupplierSpider(scrapy.Spider):
         """
         import csv
         mapping = {}
-        csv_path = Path(r"C:\FullStack\Scrapy\data\viatec\viatec_keywords.csv")
+        csv_path = data_path("viatec", "viatec_keywords.csv")
         if not csv_path.exists():
             self.logger.warning("viatec_keywords.csv not found")
             return mapping
@@ -129,6 +356,727 @@ class BaseSupplierSpider(scrapy.Spider):
     
     # СТАРИЙ МЕТОД - видалено, оскільки генерація ключових слів
     # тепер відбувається через ProductKeywordsGenerator у pipeline.py
+    
+    # ------------------------------------------------------------------
+    # ЛАНЦЮГ ТОВАРІВ: категорія → товари по одному → наступна категорія
+    # ------------------------------------------------------------------
+    
+    def _product_request(self, url: str, meta: Dict, **kwargs) -> scrapy.Request:
+        """Запит першої сторінки товару (secur додає Playwright)"""
+        return scrapy.Request(
+            url=url,
+            callback=getattr(self, self.product_callback_name),
+            errback=self.parse_product_error,
+            meta=meta,
+            dont_filter=True,
+            **kwargs,
+        )
+    
+    def _category_request(self, url: str, category_index: int) -> scrapy.Request:
+        """Запит першої сторінки категорії"""
+        return scrapy.Request(
+            url=url,
+            callback=self.parse_category,
+            meta={
+                "category_url": url,
+                "category_index": category_index,
+                "page_number": 1,
+            },
+            dont_filter=True,
+        )
+    
+    def _enter_category(self, category_index: int):
+        self.frontier = {"category_index": category_index, "phase": "pagination"}
+        self.product_frontier.clear()
+    
+    def _start_product_chain(self, category_url: str, category_index: int):
+        """Пагінацію завершено — запускаємо ланцюг товарів категорії (або наступну категорію)"""
+        if not len(self.product_frontier):
+            self.logger.warning(f"⚠️ У категорії {category_url} не знайдено товарів. Переходжу до наступної.")
+            next_cat = self._start_next_category(category_index)
+            if next_cat:
+                yield next_cat
+            return
+        
+        self.frontier = {"category_index": category_index, "phase": "products"}
+        self.product_frontier.prioritize()
+        if self.crawl_budget is not None:
+            self._category_until = self.crawl_budget.category_until(len(self.category_urls) - category_index)
+        lanes = min(self.product_lanes, len(self.product_frontier))
+        self.logger.info(f"🔗 ЗАПУСК ланцюга продуктів. Товарів: {len(self.product_frontier)}" + (f", паралельних ланцюгів: {lanes}" if lanes > 1 else ""))
+        for _ in range(lanes):
+            yield from self._next_product_request(category_index)
+    
+    def _next_product_request(self, category_index: int):
+        """Запит наступного товару з черги або перехід до наступної категорії
+        
+        Запит несе лише frontier_key та мета категорії цього товару —
+        решта черги лишається в product_frontier.
+        """
+        if not self._budget_allows_product():
+            return
+        entry = self.product_frontier.pop()
+        if entry is None:
+            # Паралельні ланцюги: наступну категорію запускає останній, що завершився
+            if self.product_lanes > 1 and self.product_frontier.in_progress:
+                return
+            self.logger.info(f"⏭️ Товари категорії закінчились.")
+            next_cat = self._start_next_category(category_index)
+            if next_cat:
+                yield next_cat
+            return
+        
+        key, url, meta = entry
+        yield self._product_request(url, {
+            **meta,
+            "frontier_key": key,
+            "category_index": category_index,
+            "product_url": url,
+            "product_started_at": time.monotonic(),
+        })
+    
+    def parse_product_error(self, failure):
+        """Помилка завантаження товару: запам'ятовуємо та продовжуємо ланцюг"""
+        self._record_failed_product(failure.request, failure.value)
+        yield from self._skip_product(failure.request.meta)
+    
+    def _skip_product(self, meta):
+        """Перехід до наступного товару в ланцюгу (або до наступної категорії)"""
+        # Відкладений повтор — окремий запит поза ланцюгом
+        if meta.get("deferred_retry"):
+            return
+        
+        # Товар завершено (записано, пропущено або в списку помилок)
+        self.product_frontier.done(meta.get("frontier_key"))
+        if self.crawl_budget is not None and "product_started_at" in meta:
+            self.crawl_budget.observe_product(time.monotonic() - meta["product_started_at"])
+        
+        if len(self.product_frontier):
+            self.logger.info(f"⏭️ Перехід до наступного товару. Залишилось: {len(self.product_frontier) - 1}")
+        yield from self._next_product_request(meta.get("category_index"))
+    
+    def _start_next_category(self, current_category_index):
+        """Допоміжний метод для запуску наступної категорії"""
+        next_category_index = current_category_index + 1
+        if next_category_index < len(self.category_urls) and self.crawl_budget is not None and not self.crawl_budget.fits():
+            self._reach_deadline()
+            return None
+        if next_category_index < len(self.category_urls):
+            next_category_url = self.category_urls[next_category_index]
+            self.logger.info(f"🚀 СТАРТ НАСТУПНОЇ КАТЕГОРІЇ [{next_category_index + 1}/{len(self.category_urls)}]: {next_category_url}")
+            self._enter_category(next_category_index)
+            return self._category_request(next_category_url, next_category_index)
+        else:
+            self.logger.info(f"🎉🎉🎉 ВСІ КАТЕГОРІЇ ТА ПРОДУКТИ ОБРОБЛЕНІ 🎉🎉🎉")
+            return None
+    
+    # ------------------------------------------------------------------
+    # БЮДЖЕТ ЧАСУ: частка дедлайну на категорію, зупинка без обриву запису
+    # ------------------------------------------------------------------
+    
+    def _budget_allows_product(self) -> bool:
+        """Чи ставити запит наступного товару
+        
+        Частку категорії вичерпано — решта черги категорії пропускається (далі наступна
+        категорія); не встигаємо до дедлайну — нових запитів не буде, товари лишаються
+        в черзі (checkpoint).
+        """
+        budget = self.crawl_budget
+        if budget is None:
+            return True
+        if self.deadline_reached or not budget.fits():
+            self._reach_deadline()
+            return False
+        if self._category_until is not None and not budget.fits(self._category_until):
+            skipped = self.product_frontier.discard_queued()
+            if skipped:
+                budget.skipped_products += skipped
+                self.logger.warning(f"⏰ Частку бюджету категорії вичерпано — пропускаю товарів: {skipped}")
+        return True
+    
+    def _reach_deadline(self):
+        if self.deadline_reached:
+            return
+        self.deadline_reached = True
+        self.crawl_budget.skipped_categories = max(0, len(self.category_urls) - self.frontier["category_index"] - 1)
+        self.logger.warning(
+            f"⏰ ДЕДЛАЙН: нові запити не ставляться, завершую поточні "
+            f"(залишок {format_duration(self.crawl_budget.remaining())}, товарів у черзі: {len(self.product_frontier)})"
+        )
+    
+    def deadline_report(self) -> Optional[Dict]:
+        """Бюджет часу для звіту метрик; None без CRAWL_DEADLINE"""
+        if self._crawl_budget is None:
+            return None
+        return {**self._crawl_budget.report(), "deadline_reached": self.deadline_reached}
+    
+    # ------------------------------------------------------------------
+    # ТОВАРИ З ПОМИЛКАМИ: відкладені повтори та файл для наступного запуску
+    # ------------------------------------------------------------------
+    
+    def _failed_products_path(self) -> Path:
+        output_dir = self.settings.get("FAILED_PRODUCTS_DIR", OUTPUT_DIR)
+        return Path(output_dir) / f"{self.run_name}_failed.json"
+    
+    def _record_failed_product(self, request, reason):
+        """Додає товар до списку помилок і планує відкладений повтор"""
+        meta = request.meta
+        product_url = meta.get("failed_product_url") or meta.get("original_url") or request.url
+        product_name = meta.get("name_ru") or meta.get("name_ua") or "Назва не знайдена"
+        attempt = meta.get("deferred_retry_attempt", 0)
+        
+        self.logger.error(f"❌ Помилка завантаження товару: {product_name} ({request.url}). Причина: {reason}")
+        
+        entry = {
+            "url": product_url,
+            "failed_url": request.url,
+            "reason": str(reason),
+            "product_name": product_name,
+            "attempts": attempt,
+            "meta": {key: meta[key] for key in self.CATEGORY_META_KEYS if key in meta},
+        }
+        self.failed_products = [f for f in self.failed_products if f["url"] != product_url]
+        self.failed_products.append(entry)
+        
+        if attempt < self.deferred_retry_times:
+            delay = self.deferred_retry_delay * (2 ** attempt)
+            self.deferred_retry_queue.append((time.monotonic() + delay, entry))
+            self.logger.info(f"🔁 Відкладений повтор #{attempt + 1} через {delay}с після основної черги: {product_url}")
+    
+    def _failed_product_request(self, entry: Dict, attempt: int, priority: int) -> scrapy.Request:
+        return self._product_request(
+            entry["url"],
+            {
+                **entry.get("meta", {}),
+                "deferred_retry": True,
+                "deferred_retry_attempt": attempt,
+                "failed_product_url": entry["url"],
+            },
+            priority=priority,
+        )
+    
+    def _on_spider_idle(self, spider):
+        """Основна черга спорожніла — запускаємо відкладені повтори, що настали"""
+        if spider is not self:
+            return
+        if self._deadline_stops_retries():
+            raise CloseSpider("deadline")
+        if not self.deferred_retry_queue:
+            return
+        
+        for request in self._due_deferred_retries():
+            self.crawler.engine.crawl(request)
+        
+        raise DontCloseSpider
+    
+    def _deadline_stops_retries(self) -> bool:
+        """Дедлайн досягнуто або повтори до нього не встигають — черга повторів скидається"""
+        budget = self.crawl_budget
+        if budget is None:
+            return False
+        if self.deferred_retry_queue and not budget.fits():
+            self.logger.warning(f"⏰ Відкладені повтори не встигають до дедлайну: {len(self.deferred_retry_queue)} (залишаються у файлі помилок)")
+            self.deferred_retry_queue = []
+            self._reach_deadline()
+        return self.deadline_reached
+    
+    def _due_deferred_retries(self):
+        """Запити відкладених повторів, час яких настав (прибираються з черги)"""
+        now = time.monotonic()
+        due = [entry for when, entry in self.deferred_retry_queue if when <= now]
+        self.deferred_retry_queue = [(when, entry) for when, entry in self.deferred_retry_queue if when > now]
+        
+        for entry in due:
+            attempt = entry["attempts"] + 1
+            self.logger.info(f"🔁 Відкладений повтор #{attempt}: {entry['url']}")
+            yield self._failed_product_request(entry, attempt, self.deferred_retry_priority)
+    
+    def _on_item_scraped(self, item, response, spider, **kwargs):
+        """Успішний повтор (товар завантажено, навіть якщо pipeline його відкинув) — прибираємо зі списку помилок"""
+        if spider is not self or response is None:
+            return
+        seen_url = response.meta.get("product_url") or response.meta.get("failed_product_url")
+        if seen_url:
+            fingerprint = self.processed_products.fingerprint(seen_url)
+            self.scraped_fingerprints[fingerprint] = response.meta.get("category_url", "")
+            self.product_states.setdefault(fingerprint, []).append(item_state(item))
+        self._forget_failed_product(response.meta)
+    
+    def _forget_failed_product(self, meta):
+        """Повтор товару з помилкою (-a failed_mode, відкладений повтор) завантажено — прибираємо зі списку"""
+        product_url = meta.get("failed_product_url")
+        if product_url:
+            self.failed_products = [f for f in self.failed_products if f["url"] != product_url]
+            self.logger.info(f"✅ Товар відновлено після помилки: {product_url}")
+    
+    def _failed_product_requests(self):
+        """Запити товарів з помилками минулого запуску (-a failed_mode=first|only)"""
+        if not self.failed_mode:
+            return
+        
+        path = self._failed_products_path()
+        try:
+            with open(path, encoding="utf-8") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            self.logger.warning(f"⚠️ Файл товарів з помилками не знайдено: {path}")
+            return
+        except (OSError, ValueError) as e:
+            self.logger.error(f"❌ Помилка читання {path}: {e}")
+            return
+        
+        self.logger.info(f"📋 Товарів з помилками минулого запуску: {len(entries)} ({path})")
+        for entry in entries:
+            self.processed_products.add(entry["url"])
+            yield self._failed_product_request({**entry, "attempts": 0}, 0, priority=100)
+    
+    def _save_failed_products(self):
+        """Зберігає товари, що так і не завантажились, для наступного запуску"""
+        path = self._failed_products_path()
+        try:
+            if self.failed_products:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(self.failed_products, f, ensure_ascii=False, indent=2)
+                self.logger.info(f"💾 Товари з помилками збережено: {path} (повтор: -a failed_mode=first|only)")
+            elif path.exists():
+                path.unlink()
+        except OSError as e:
+            self.logger.warning(f"⚠️ Не вдалося зберегти товари з помилками {path}: {e}")
+    
+    # ------------------------------------------------------------------
+    # РАННІЙ ФІЛЬТР: товари, які pipeline все одно відкине
+    # ------------------------------------------------------------------
+    
+    def _filtered_early(self, response, price=None, availability=None) -> bool:
+        """Перевірки pipeline на першій сторінці товару; None — поле не перевіряється
+        
+        availability передається в тому вигляді, в якому потрапить у "Наявність".
+        Повтор товару з помилкою, відкинутий тут, завантажено — як і відкинутий
+        pipeline (item_dropped), він прибирається зі списку помилок.
+        """
+        reason = drop_reason(price, availability)
+        if reason is None:
+            return False
+        self.early_filtered[reason] += 1
+        label = "без ціни" if reason == NO_PRICE else f"не в наявності ({availability})"
+        self.logger.info(f"⏭️ Товар {label} — пропускаємо без другого запиту: {response.url}")
+        self._forget_failed_product(response.meta)
+        return True
+    
+    # ------------------------------------------------------------------
+    # КЕШ КОНТЕНТУ: друга мовна сторінка тільки для нових/змінених товарів
+    # ------------------------------------------------------------------
+    
+    def _cached_content(self, sku: str, lang: str, name: str, description: str, specs: List, other_lang: str) -> Optional[Dict]:
+        """Контент other_lang з кешу, якщо контент lang (щойно завантажений) не змінився"""
+        if not sku or self.content_cache is None:
+            return None
+        return self.content_cache.lookup(sku, lang, content_hash(name, description, specs), other_lang)
+    
+    def _store_content(self, sku: str, contents: Dict[str, tuple]):
+        """contents: мова → (назва, опис, характеристики) — обидві мови одночасно"""
+        if not sku or self.content_cache is None:
+            return
+        for lang, (name, description, specs) in contents.items():
+            self.content_cache.put(sku, lang, name, description, specs)
+    
+    # ------------------------------------------------------------------
+    # ВІДБИТКИ ТОВАРІВ: інкрементальний режим між прогонами
+    # ------------------------------------------------------------------
+    
+    def _seen_store(self) -> SeenStore:
+        path = self.settings.get("SEEN_STORE_PATH", output_path("seen_products.sqlite"))
+        return SeenStore(path, self.settings.get("SEEN_NAMESPACE") or self.name)
+    
+    def _skip_recently_seen(self):
+        """Товари, завантажені за останні skip_seen_hours годин, вважаються обробленими"""
+        store = self._seen_store()
+        try:
+            before = len(self.processed_products)
+            self.processed_products.update(store.recent(self.skip_seen_hours))
+            self.logger.info(
+                f"⏩ Інкрементальний режим: пропускаю {len(self.processed_products) - before} товарів, "
+                f"завантажених за останні {self.skip_seen_hours:g} год ({store.path})"
+            )
+        finally:
+            store.close()
+    
+    def _save_seen_products(self):
+        """Відмічає товари цього прогону в SEEN_STORE_PATH"""
+        if not self.scraped_fingerprints or not self.settings.getbool("SEEN_STORE_ENABLED", True):
+            return
+        try:
+            store = self._seen_store()
+            try:
+                store.mark(self.scraped_fingerprints)
+            finally:
+                store.close()
+            self.logger.info(f"💾 Відмічено завантажених товарів: {len(self.scraped_fingerprints)} ({store.path})")
+        except (OSError, sqlite3.Error) as e:
+            self.logger.warning(f"⚠️ Не вдалося оновити сховище відбитків: {e}")
+    
+    # ------------------------------------------------------------------
+    # ЧАСТОТА ЗМІН: спочатку категорії та товари, що змінюються найчастіше
+    # ------------------------------------------------------------------
+    
+    def _volatility_store(self) -> Optional[VolatilityStore]:
+        settings = getattr(self, "settings", None)
+        if settings is None or not settings.getbool("VOLATILITY_ENABLED", True):
+            return None
+        path = settings.get("VOLATILITY_STORE_PATH", output_path("volatility.sqlite"))
+        return VolatilityStore(path, self.name)
+    
+    def _order_by_volatility(self):
+        """Категорії від найчастіше змінюваних (рівна частота — порядок CSV)"""
+        try:
+            store = self._volatility_store()
+            if store is None:
+                return
+            try:
+                self._product_volatility, self._category_volatility = store.rates()
+            finally:
+                store.close()
+        except (OSError, sqlite3.Error) as e:
+            self.logger.warning(f"⚠️ Сховище частоти змін недоступне, порядок категорій з CSV: {e}")
+            return
+        if not self._category_volatility:
+            return
+        
+        rates = self._category_volatility
+        self.category_urls = sorted(self.category_urls, key=lambda url: -rates.get(url, PRIOR_RATE))
+        top = ", ".join(f"{url} ({rates.get(url, PRIOR_RATE):.0%})" for url in self.category_urls[:3])
+        self.logger.info(f"📈 Порядок категорій за частотою змін (товарів з історією: {len(self._product_volatility)}): {top}")
+    
+    def _product_rank(self, fingerprint: int, category_url: str) -> float:
+        """Частота змін товару; без історії — частота його категорії"""
+        if not self._category_volatility:
+            return 0.0
+        rate = self._product_volatility.get(fingerprint)
+        if rate is None:
+            rate = self._category_volatility.get(category_url, PRIOR_RATE)
+        return rate
+    
+    def _save_volatility(self):
+        """Порівнює ціну/наявність товарів цього прогону з попереднім (VOLATILITY_STORE_PATH)"""
+        if not self.product_states:
+            return
+        states = {
+            fingerprint: (self.scraped_fingerprints.get(fingerprint, ""), state_hash(item_states))
+            for fingerprint, item_states in self.product_states.items()
+        }
+        try:
+            store = self._volatility_store()
+            if store is None:
+                return
+            try:
+                compared, changed = store.record(states)
+            finally:
+                store.close()
+            self.logger.info(f"📈 Частота змін: змінилось {changed} з {compared} товарів попереднього прогону ({store.path})")
+        except (OSError, sqlite3.Error) as e:
+            self.logger.warning(f"⚠️ Не вдалося оновити сховище частоти змін: {e}")
+    
+    # ------------------------------------------------------------------
+    # SITEMAP: пошук товарів без пагінації категорій (-a discovery=sitemap)
+    # ------------------------------------------------------------------
+    
+    def _sitemap_start_requests(self):
+        """Sitemap з sitemap_urls паука або з robots.txt домену першої категорії"""
+        self.frontier = {"category_index": len(self.category_urls) - 1, "phase": "sitemap"}
+        self.product_frontier.clear()
+        self._load_seen_index()
+        
+        if self.sitemap_urls:
+            for url in self.sitemap_urls:
+                yield self._sitemap_request(url)
+            return
+        
+        parts = urlsplit(self.category_urls[0])
+        robots_url = f"{parts.scheme}://{parts.netloc}/robots.txt"
+        self.logger.info(f"🗺️ СТАРТ ПОШУКУ ТОВАРІВ ЧЕРЕЗ SITEMAP: {robots_url}")
+        yield scrapy.Request(
+            robots_url,
+            callback=self._parse_robots_sitemaps,
+            errback=self._robots_error,
+            dont_filter=True,
+        )
+    
+    def _load_seen_index(self):
+        """Попередні прогони: коли товар завантажено і з якої категорії"""
+        if not self.settings.getbool("SEEN_STORE_ENABLED", True):
+            return
+        try:
+            store = self._seen_store()
+            try:
+                self._seen_index = store.index()
+            finally:
+                store.close()
+        except (OSError, sqlite3.Error) as e:
+            self.logger.warning(f"⚠️ Сховище відбитків недоступне, lastmod не використовується: {e}")
+    
+    def _parse_robots_sitemaps(self, response):
+        sitemap_urls = list(sitemap_urls_from_robots(response.text, base_url=response.url))
+        if not sitemap_urls:
+            parts = urlsplit(response.url)
+            sitemap_urls = [f"{parts.scheme}://{parts.netloc}/sitemap.xml"]
+            self.logger.warning(f"⚠️ У robots.txt немає Sitemap — пробую {sitemap_urls[0]}")
+        for url in sitemap_urls:
+            yield self._sitemap_request(url)
+    
+    def _robots_error(self, failure):
+        parts = urlsplit(failure.request.url)
+        self.logger.warning(f"⚠️ robots.txt недоступний ({failure.value}) — пробую /sitemap.xml")
+        yield self._sitemap_request(f"{parts.scheme}://{parts.netloc}/sitemap.xml")
+    
+    def _sitemap_request(self, url: str) -> scrapy.Request:
+        self._sitemaps_pending += 1
+        return scrapy.Request(
+            url,
+            callback=self._parse_sitemap,
+            errback=self._sitemap_error,
+            dont_filter=True,
+        )
+    
+    def _parse_sitemap(self, response):
+        """Sitemap index → вкладені sitemap; urlset → товари в чергу"""
+        self.sitemap_stats["sitemaps"] += 1
+        try:
+            for kind, loc, lastmod in iter_sitemap(sitemap_body(response)):
+                if kind == "sitemap":
+                    yield self._sitemap_request(loc)
+                else:
+                    self._discover_product(loc, lastmod)
+        except (ValueError, OSError) as e:
+            self.logger.error(f"❌ Помилка розбору sitemap {response.url}: {e}")
+        yield from self._sitemap_done()
+    
+    def _sitemap_error(self, failure):
+        self.logger.error(f"❌ Sitemap недоступний: {failure.request.url} ({failure.value})")
+        yield from self._sitemap_done()
+    
+    def _sitemap_done(self):
+        """Всі sitemap розібрано — запускаємо один ланцюг товарів по всіх категоріях"""
+        self._sitemaps_pending -= 1
+        if self._sitemaps_pending > 0:
+            return
+        
+        stats = self.sitemap_stats
+        self.logger.info(
+            f"🗺️ SITEMAP РОЗІБРАНО: sitemap {stats['sitemaps']}, URL {stats['urls']}, "
+            f"в черзі {stats['queued']}, без змін з минулого прогону {stats['unchanged']}, "
+            f"без категорії {stats['unmapped']}"
+        )
+        # Ланцюг завершиться на останній категорії — далі _start_next_category нічого не запускає
+        last_index = len(self.category_urls) - 1
+        self.frontier = {"category_index": last_index, "phase": "products"}
+        if not len(self.product_frontier):
+            self.logger.info("🎉 Нових або змінених товарів у sitemap немає")
+            return
+        self.product_frontier.prioritize()
+        for _ in range(min(self.product_lanes, len(self.product_frontier))):
+            yield from self._next_product_request(last_index)
+    
+    def _sitemap_product_url(self, url: str) -> str:
+        """URL товару з sitemap → URL для завантаження (viatec: без /ru/)"""
+        return strip_url_prefixes(url, self.url_locale_prefixes)
+    
+    def _discover_product(self, url: str, lastmod: Optional[str]):
+        self.sitemap_stats["urls"] += 1
+        product_url = self._sitemap_product_url(url)
+        if product_url in self.processed_products:
+            return
+        
+        fingerprint = self.processed_products.fingerprint(product_url)
+        if self.shard and fingerprint % self.shard[1] != self.shard[0]:
+            return
+        seen = self._seen_index.get(fingerprint)
+        category_url = self._category_for_product(product_url, seen)
+        if not category_url:
+            self.sitemap_stats["unmapped"] += 1
+            return
+        
+        # Сторінка не змінювалась після останнього завантаження — пропускаємо
+        modified_at = parse_lastmod(lastmod)
+        if seen and modified_at is not None and modified_at <= seen[0]:
+            self.sitemap_stats["unchanged"] += 1
+            self.processed_products.add(fingerprint)
+            return
+        
+        self.product_frontier.push(product_url, self._category_meta(category_url), self._product_rank(fingerprint, category_url))
+        self.processed_products.add(fingerprint)
+        self.sitemap_stats["queued"] += 1
+    
+    def _category_for_product(self, product_url: str, seen) -> str:
+        """Категорія товару: найдовший шлях категорії-префікс URL товару,
+        інакше категорія, з якої товар завантажувався минулого разу
+        """
+        product = urlsplit(product_url)
+        best_url, best_length = "", 0
+        for category_url in self.category_urls:
+            category = urlsplit(category_url)
+            category_path = category.path.rstrip("/") + "/"
+            if category.netloc == product.netloc and product.path.startswith(category_path) and len(category_path) > best_length:
+                best_url, best_length = category_url, len(category_path)
+        if best_url:
+            return best_url
+        if seen and seen[1] in self.category_mapping:
+            return seen[1]
+        return ""
+    
+    def _queue_product(self, product_url: str, category_url: str):
+        """Товар зі сторінки категорії → черга ланцюга (якщо ще не оброблений)"""
+        if product_url in self.processed_products:
+            return
+        self.processed_products.add(product_url)
+        meta = self._claim_product(product_url, self._category_meta(category_url))
+        if meta is not None:
+            rank = self._product_rank(self.processed_products.fingerprint(product_url), category_url)
+            self.product_frontier.push(product_url, meta, rank)
+    
+    def _claim_product(self, product_url: str, meta: Dict) -> Optional[Dict]:
+        """Шардований прогін: товар з категорій кількох шардів бере перший, хто його застовпив
+        
+        Повертає meta для черги або None, якщо товар уже взяв інший шард.
+        """
+        if self.shard_store is None:
+            return meta
+        if self.shard_store.claim(self.processed_products.fingerprint(product_url)):
+            return meta
+        self.shard_skipped += 1
+        return None
+    
+    def _category_meta(self, category_url: str) -> Dict:
+        category_info = self.category_mapping.get(category_url, {})
+        meta = {"category_url": category_url}
+        for key in self.CATEGORY_META_KEYS[1:]:
+            meta[key] = category_info.get(key, "")
+        return meta
+    
+    # ------------------------------------------------------------------
+    # CHECKPOINT: стан ланцюга для продовження перерваного обходу
+    # ------------------------------------------------------------------
+    
+    def checkpoint_state(self) -> Dict:
+        """Стан паука для checkpoint (див. suppliers/checkpoint.py)
+        
+        Товари незавершеної пагінації не вважаються обробленими — після
+        продовження категорія проходиться з першої сторінки.
+        """
+        category_index = self.frontier["category_index"]
+        pending = [
+            {"url": url, "meta": {k: v for k, v in meta.items() if k in self.CATEGORY_META_KEYS}}
+            for url, meta in self.product_frontier.pending()
+        ]
+        in_products = self.frontier["phase"] == "products"
+        unfinished = set() if in_products else {self.processed_products.fingerprint(p["url"]) for p in pending}
+        return {
+            "category_index": category_index,
+            "category_url": self.category_urls[category_index] if category_index < len(self.category_urls) else "",
+            "phase": self.frontier["phase"],
+            "pending": pending if in_products else [],
+            "processed_products": sorted(self.processed_products.fingerprints() - unfinished),
+            "scraped_fingerprints": sorted(self.scraped_fingerprints.items()),
+            "product_states": sorted(self.product_states.items()),
+            # Порядок категорій за частотою змін — продовження йде тим самим порядком
+            "category_urls": list(self.category_urls),
+            "failed_products": self.failed_products,
+        }
+    
+    def _resume_requests(self, state: Dict):
+        """Запити для продовження обходу з місця зупинки"""
+        category_index = state.get("category_index", 0)
+        category_url = state.get("category_url", "")
+        
+        saved_order = state.get("category_urls")
+        if saved_order and set(saved_order) == set(self.category_urls):
+            self.category_urls = list(saved_order)
+        
+        # Список категорій міг змінитись — шукаємо категорію за URL
+        if category_url and category_index < len(self.category_urls) and self.category_urls[category_index] != category_url:
+            if category_url in self.category_urls:
+                category_index = self.category_urls.index(category_url)
+            else:
+                self.logger.warning(f"⚠️ Категорію з checkpoint не знайдено: {category_url}. Продовжую з [{category_index + 1}]")
+        
+        self.processed_products.update(state.get("processed_products", []))
+        for entry in state.get("scraped_fingerprints", []):
+            fingerprint, category_url = entry if isinstance(entry, list) else (entry, "")
+            self.scraped_fingerprints[fingerprint] = category_url
+        for fingerprint, states in state.get("product_states", []):
+            self.product_states[fingerprint] = list(states)
+        self.failed_products = state.get("failed_products", [])
+        pending = state.get("pending", [])
+        
+        if category_index >= len(self.category_urls):
+            self.logger.info("🎉 За checkpoint всі категорії вже оброблені")
+            return
+        
+        self.logger.info(
+            f"♻️ ПРОДОВЖЕННЯ з категорії [{category_index + 1}/{len(self.category_urls)}] "
+            f"({state.get('phase')}, товарів у ланцюгу: {len(pending)}, оброблено раніше: {len(self.processed_products)})"
+        )
+        
+        if state.get("phase") == "products" and pending:
+            for product in pending:
+                self.product_frontier.push(product["url"], dict(product["meta"]))
+            yield from self._start_product_chain(self.category_urls[category_index], category_index)
+        elif self.discovery == "sitemap":
+            yield from self._sitemap_start_requests()
+        else:
+            self._enter_category(category_index)
+            yield self._category_request(self.category_urls[category_index], category_index)
+    
+    def closed(self, reason):
+        """Викликається при завершенні паука"""
+        self.logger.info(f"🎉 Паук {self.name} завершено! Причина: {reason}")
+        
+        if self.failed_products:
+            self.logger.info("=" * 80)
+            self.logger.info("📦 СПИСОК ТОВАРІВ З ПОМИЛКАМИ ЗАВАНТАЖЕННЯ")
+            self.logger.info("=" * 80)
+            for failed in self.failed_products:
+                self.logger.error(f"- Товар: {failed['product_name']} | URL: {failed['url']} | Причина: {failed['reason']}")
+            self.logger.info("=" * 80)
+        else:
+            self.logger.info("✅ Товарів з помилками завантаження не знайдено.")
+        
+        if any(self.early_filtered.values()):
+            self.logger.info(
+                f"⏭️ Відфільтровано пауком до другого запиту: без ціни {self.early_filtered[NO_PRICE]}, "
+                f"без наявності {self.early_filtered[NO_STOCK]}"
+            )
+        
+        if self._crawl_budget is not None:
+            budget = self._crawl_budget
+            self.logger.info(
+                f"⏰ Бюджет часу: {'дедлайн досягнуто' if self.deadline_reached else 'вклались'}, "
+                f"пропущено товарів {budget.skipped_products}, категорій {budget.skipped_categories}, "
+                f"залишок {format_duration(budget.remaining())}"
+            )
+        
+        self._save_failed_products()
+        self._save_seen_products()
+        self._save_volatility()
+        self.product_frontier.close()
+        
+        if self._shard_store is not None:
+            self.logger.info(f"🧩 Шард {self.shard[0] + 1}/{self.shard[1]}: товарів інших шардів пропущено {self.shard_skipped}")
+            self._shard_store.close()
+        
+        if self._content_cache is not None:
+            cache = self._content_cache
+            self.logger.info(f"♻️ Кеш контенту: з кешу {cache.hits}, завантажено {cache.misses}")
+            cache.close()
+        
+        # Звуковий сигнал (опціонально, працює тільки на Windows)
+        try:
+            import winsound
+            for _ in range(3):
+                winsound.Beep(1000, 300)
+            self.logger.info("🔔 Звуковий сигнал відтворено!")
+        except Exception as e:
+            self.logger.debug(f"Не вдалося відтворити звук: {e}")
 
 
 class BaseRetailSpider(BaseSupplierSpider):
@@ -171,7 +1119,6 @@ class EserverBaseSpider(BaseSupplierSpider):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.category_urls = []
-        self.products_from_pagination = []
     
     def _extract_manufacturer(self, product_name: str) -> str:
         """Визначає виробника з назви товару"""
@@ -203,40 +1150,72 @@ class EserverBaseSpider(BaseSupplierSpider):
                 return name
         
         return ""
-    
-    def closed(self, reason):
-        """Викликається при завершенні паука"""
-        self.logger.info(f"🎉 Паук {self.name} завершено! Причина: {reason}")
-        
-        if self.failed_products:
-            self.logger.info("=" * 80)
-            self.logger.info("📦 СПИСОК ТОВАРІВ З ПОМИЛКАМИ ЗАВАНТАЖЕННЯ")
-            self.logger.info("=" * 80)
-            for failed in self.failed_products:
-                self.logger.error(f"- Товар: {failed['product_name']} | URL: {failed['url']} | Причина: {failed['reason']}")
-            self.logger.info("=" * 80)
-        else:
-            self.logger.info("✅ Товарів з помилками завантаження не знайдено.")
-        
-        # Звуковий сигнал (опціонально, працює тільки на Windows)
-        try:
-            import winsound
-            for _ in range(3):
-                winsound.Beep(1000, 300)
-            self.logger.info("🔔 Звуковий сигнал відтворено!")
-        except Exception as e:
-            self.logger.debug(f"Не вдалося відтворити звук: {e}")
 
 
 class ViatecBaseSpider(BaseSupplierSpider):
     """Базовий клас для пауків Viatec (загальна логіка для retail і dealer)"""
     
     allowed_domains = ["viatec.ua"]
+    url_locale_prefixes = ("/ru/",)
+    extractor_class = ViatecExtractor
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.category_urls = []
-        self.products_from_pagination = []
+    
+    def _read_category_csv(self, csv_path: Path) -> Dict[str, Dict[str, str]]:
+        """Маппінг категорій viatec_category_*.csv: URL категорії постачальника → наша категорія"""
+        mapping = {}
+        
+        try:
+            with open(csv_path, encoding="utf-8-sig") as f:
+                reader = csv.DictReader(f, delimiter=";")
+                for row in reader:
+                    url = row["Линк категории поставщика"].strip().strip('"')
+                    
+                    if not url or not url.startswith("http"):
+                        continue
+                    
+                    mapping[url] = {
+                        "category_ru": row["Категория на моем сайте_RU"],
+                        "category_ua": row["Категория на моем сайте_UA"],
+                        "group_number": row.get("Номер_групи", ""),
+                        "subdivision_id": row.get("Ідентифікатор_підрозділу", ""),
+                        "subdivision_link": row.get("Посилання_підрозділу", ""),
+                    }
+            self.logger.info(f"✅ Завантажено {len(mapping)} категорій")
+        except Exception as e:
+            self.logger.error(f"❌ Помилка завантаження категорій: {e}")
+        
+        return mapping
+    
+    def _page_price(self, page: ProductPage) -> str:
+        """Ціна з картки товару (текст на кшталт «4 815 грн»)"""
+        price_raw = page.price.strip().replace("&nbsp;", "").replace(" ", "") if page.price else ""
+        return self._clean_price(price_raw) if price_raw else ""
+    
+    def _page_images(self, response, page: ProductPage) -> List[str]:
+        """Абсолютні URL зображень галереї, підготовлені для PROM"""
+        image_urls = []
+        for img in page.images:
+            sanitized_url = self._sanitize_image_url(response.urljoin(img))
+            if sanitized_url:
+                image_urls.append(sanitized_url)
+        return image_urls
+    
+    def _filtered_on_product_page(self, page: ProductPage, response, check_price: bool = True) -> bool:
+        """Ранній фільтр за ціною та наявністю з картки товару (як у parse_product_ru)"""
+        price = self._page_price(page) if check_price else None
+        return self._filtered_early(response, price, self._normalize_availability(page.availability))
+    
+    def _listing_out_of_stock(self, listing: CategoryPage) -> set:
+        """Посилання карток категорії зі статусом «немає в наявності» / «під замовлення»"""
+        hidden = set()
+        for status, links in listing.cards:
+            if status and not is_in_stock(status):
+                hidden.update(links)
+                self.early_filtered[NO_STOCK] += 1
+        return hidden
     
     def _extract_manufacturer(self, product_name: str) -> str:
         """Визначає виробника з назви товару"""
@@ -305,7 +1284,7 @@ class ViatecBaseSpider(BaseSupplierSpider):
         import csv
         mapping = {}
         try:
-            csv_path = Path(r"C:\FullStack\Scrapy\data\viatec\viatec_manufacturers.csv")
+            csv_path = data_path("viatec", "viatec_manufacturers.csv")
             if csv_path.exists():
                 with open(csv_path, encoding="utf-8-sig") as f:
                     reader = csv.DictReader(f, delimiter=";")
@@ -320,108 +1299,8 @@ class ViatecBaseSpider(BaseSupplierSpider):
         
         return mapping
     
-    def _extract_description_with_br(self, response) -> str:
-        """
-        Витягує опис зі збереженням переносів <br> та обробкою списків <ul>
-        """
-        description_container = response.css("div.card-header__card-info-text")
-        if not description_container:
-            self.logger.warning(f"Не знайдено контейнер опису на {response.url}")
-            return ""
-        
-        # Перевірка на наявність <ul>
-        ul_list = description_container.css("ul")
-        if ul_list:
-            self.logger.info(f"Знайдено <ul> список в описі на {response.url}")
-            list_items = ul_list.css("li")
-            
-            description_parts = []
-            for item in list_items:
-                inner_content = item.get()
-                inner_content = re.sub(r'</?li[^>]*>', '', inner_content).strip()
-                if not inner_content.startswith('●'):
-                    description_parts.append(f"● {inner_content}")
-                else:
-                    description_parts.append(inner_content)
-            
-            return "<br>".join(description_parts)
-        
-        # Обробка <p> тегів
-        p_tags = description_container.css("p")
-        if p_tags:
-            self.logger.info(f"Знайдено <p> теги в описі на {response.url}")
-            result_parts = []
-            for p in p_tags:
-                if p.css("::attr(class)").get() == "card-header__analog-link":
-                    continue
-                
-                p_html = p.get()
-                inner_html = re.sub(r'^<p[^>]*>|</p>$', '', p_html).strip()
-                
-                if inner_html:
-                    inner_html = inner_html.replace("<br/>", "<br>").replace("<br />", "<br>")
-                    result_parts.append(inner_html)
-            
-            return "<br>".join(result_parts)
-        
-        self.logger.warning(f"В контейнері опису не знайдено ні <ul>, ні <p> на {response.url}")
-        return ""
-    
-    def _extract_specifications(self, response) -> List[Dict[str, str]]:
-        """
-        Витягує характеристики товару з таблиці (українські назви)
-        """
-        specs_list = []
-        
-        # Спроба 1: Активна вкладка
-        spec_rows = response.css("li.card-tabs__item.active div.card-tabs__characteristic-content table tr")
-        
-        # Спроба 2: Будь-яка вкладка з характеристиками
-        if not spec_rows:
-            spec_rows = response.css("div.card-tabs__characteristic-content table tr")
-        
-        # Спроба 3: Загальний селектор таблиці
-        if not spec_rows:
-            spec_rows = response.css("ul.card-tabs__list table tr")
-        
-        for row in spec_rows[:60]:
-            name = row.css("th::text").get()
-            value = row.css("td::text").get()
-            
-            if name and value:
-                specs_list.append({
-                    "name": name.strip(),
-                    "value": value.strip(),
-                    "unit": ""
-                })
-        
-        return specs_list
-    
     def _convert_to_ru_url(self, url: str) -> str:
         """Конвертує український URL в російський"""
         if "/ru/" not in url:
             url = url.replace("viatec.ua/", "viatec.ua/ru/")
         return url
-    
-    def closed(self, reason):
-        """Викликається при завершенні паука"""
-        self.logger.info(f"🎉 Паук {self.name} завершено! Причина: {reason}")
-        
-        if self.failed_products:
-            self.logger.info("=" * 80)
-            self.logger.info("📦 СПИСОК ТОВАРІВ З ПОМИЛКАМИ ЗАВАНТАЖЕННЯ")
-            self.logger.info("=" * 80)
-            for failed in self.failed_products:
-                self.logger.error(f"- Товар: {failed['product_name']} | URL: {failed['url']} | Причина: {failed['reason']}")
-            self.logger.info("=" * 80)
-        else:
-            self.logger.info("✅ Товарів з помилками завантаження не знайдено.")
-        
-        # Звуковий сигнал (опціонально, працює тільки на Windows)
-        try:
-            import winsound
-            for _ in range(3):
-                winsound.Beep(1000, 300)
-            self.logger.info("🔔 Звуковий сигнал відтворено!")
-        except Exception as e:
-            self.logger.debug(f"Не вдалося відтворити звук: {e}")
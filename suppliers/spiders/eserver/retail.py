@@ -9,7 +9,10 @@ Spider для парсингу роздрібних цін з e-server.com.ua (U
 import scrapy
 import csv
 import re
-from pathlib import Path
+from typing import List
+from suppliers.extractors import EserverExtractor
+from suppliers.items import ProductRecord
+from suppliers.paths import data_path
 from suppliers.spiders.base import EserverBaseSpider, BaseRetailSpider
 
 
@@ -17,6 +20,9 @@ class EserverRetailSpider(EserverBaseSpider, BaseRetailSpider):
     name = "eserver_retail"
     supplier_id = "eserver"
     output_filename = "eserver_retail.csv"
+    # Статичний HTML без логіну — можна запускати asyncio-рушієм (suppliers/engine.py)
+    asyncio_engine = True
+    extractor_class = EserverExtractor
     
     custom_settings = {
         **EserverBaseSpider.custom_settings,
@@ -35,7 +41,7 @@ class EserverRetailSpider(EserverBaseSpider, BaseRetailSpider):
     def _load_category_mapping(self):
         """Завантажує маппінг категорій з CSV"""
         mapping = {}
-        csv_path = Path(r"C:\FullStack\Scrapy\data\eserver\eserver_category_retail.csv")
+        csv_path = data_path("eserver", "eserver_category_retail.csv")
         
         try:
             with open(csv_path, encoding="utf-8-sig") as f:
@@ -59,59 +65,26 @@ class EserverRetailSpider(EserverBaseSpider, BaseRetailSpider):
         
         return mapping
     
-    def start_requests(self):
-        """Стартуємо з першої категорії"""
-        if self.category_urls:
-            first_category_url = self.category_urls[0]
-            self.logger.info(f"🚀 СТАРТ ПАРСИНГУ. Перша категорія [1/{len(self.category_urls)}]: {first_category_url}")
-            
-            yield scrapy.Request(
-                url=first_category_url,
-                callback=self.parse_category,
-                meta={
-                    "category_url": first_category_url,
-                    "category_index": 0,
-                    "page_number": 1,
-                },
-                dont_filter=True,
-            )
-    
     def parse_category(self, response):
         """Парсимо список товарів у категорії та сторінки пагінації"""
         category_url = response.meta["category_url"]
         category_index = response.meta["category_index"]
         page_number = response.meta.get("page_number", 1)
-        category_info = self.category_mapping.get(category_url, {})
         
         self.logger.info(f"📂 Обробляю категорію [{category_index + 1}/{len(self.category_urls)}] сторінка {page_number}: {response.url}")
         
-        # Посилання на товари - використовуємо універсальний селектор карточок
-        # Сайт використовує різні URL структури: з -detail та без
-        product_links = response.css("div[class*='card'] a[href*='/uk/']::attr(href)").getall()
+        listing = self.extractor.category(response)
+        product_links = listing.product_links
         
         if not product_links:
             self.logger.warning(f"⚠️ Не знайдено товарів на сторінці: {response.url}")
         else:
             self.logger.info(f"📦 Знайдено товарів на сторінці: {len(product_links)}")
             for link in product_links:
-                product_url = response.urljoin(link)
-                
-                if product_url not in self.processed_products:
-                    self.products_from_pagination.append({
-                        "url": product_url,
-                        "meta": {
-                            "category_url": category_url,
-                            "category_ru": category_info.get("category_ru", ""),
-                            "category_ua": category_info.get("category_ua", ""),
-                            "group_number": category_info.get("group_number", ""),
-                            "subdivision_id": category_info.get("subdivision_id", ""),
-                            "subdivision_link": category_info.get("subdivision_link", ""),
-                        },
-                    })
-                    self.processed_products.add(product_url)
+                self._queue_product(response.urljoin(link), category_url)
         
         # ПАГІНАЦІЯ
-        next_page_link = response.css("li.next a::attr(href)").get()
+        next_page_link = listing.next_page
         
         if not next_page_link and len(product_links) > 0:
             next_page_link = self._build_next_page_url(category_url, page_number, len(product_links))
@@ -130,27 +103,9 @@ class EserverRetailSpider(EserverBaseSpider, BaseRetailSpider):
                 dont_filter=True,
             )
         else:
-            self.logger.info(f"✅ ПАГІНАЦІЯ ЗАВЕРШЕНА [{category_index + 1}/{len(self.category_urls)}]: накопичено {len(self.products_from_pagination)} товарів")
+            self.logger.info(f"✅ ПАГІНАЦІЯ ЗАВЕРШЕНА [{category_index + 1}/{len(self.category_urls)}]: накопичено {len(self.product_frontier)} товарів")
             
-            if self.products_from_pagination:
-                product_data = self.products_from_pagination.pop(0)
-                product_data["meta"]["remaining_products"] = self.products_from_pagination
-                product_data["meta"]["category_index"] = category_index
-                
-                self.logger.info(f"🔗 ЗАПУСК ланцюга продуктів. Перший: {product_data['url']}. Залишилось: {len(self.products_from_pagination)}")
-                
-                yield scrapy.Request(
-                    url=product_data["url"],
-                    callback=self.parse_product,
-                    errback=self.parse_product_error,
-                    meta=product_data["meta"],
-                    dont_filter=True,
-                )
-            else:
-                self.logger.warning(f"⚠️ У категорії {category_url} не знайдено товарів. Переходжу до наступної.")
-                yield self._start_next_category(category_index)
-            
-            self.products_from_pagination = []
+            yield from self._start_product_chain(category_url, category_index)
     
     def _build_next_page_url(self, category_url, current_page, products_count):
         """Будує URL наступної сторінки"""
@@ -170,11 +125,16 @@ class EserverRetailSpider(EserverBaseSpider, BaseRetailSpider):
         try:
             self.logger.info(f"🔗 Парсимо товар (пошук мов): {response.url}")
             
-            # Шукаємо перемикач мови
-            # Селектор: <a href="/uk/..."><div>Укр</div></a>
-            # Селектор: <a href="/servernye-shkafy/..."><div>Рус</div></a>
-            ua_link = response.css("div.langs_langs__QyR6J a[href*='/uk/']::attr(href)").get()
-            ru_link = response.css("div.langs_langs__QyR6J a:not([href*='/uk/'])::attr(href)").get()
+            page = self.extractor.product(response)
+            
+            # Без ціни / не в наявності — pipeline все одно відкине, мовні сторінки не завантажуємо
+            if self._filtered_early(response, self._page_price(page), page.availability):
+                yield from self._skip_product(response.meta)
+                return
+            
+            # Перемикач мови
+            ua_link = page.links.get("ua")
+            ru_link = page.links.get("ru")
             
             if not ua_link or not ru_link:
                 self.logger.error(f"❌ Не знайдено посилань на мови: UA={ua_link}, RU={ru_link}")
@@ -187,16 +147,23 @@ class EserverRetailSpider(EserverBaseSpider, BaseRetailSpider):
             
             self.logger.info(f"🌐 Знайдено мови: UA={ua_url}, RU={ru_url}")
             
+            meta = {
+                **response.meta,
+                "ru_url": ru_url,
+                "original_url": response.url,
+            }
+            
+            # Посилання з категорії вже веде на UA версію — запис сторінки є, повторно не завантажуємо
+            if ua_url == response.url:
+                yield from self.parse_product_ua(response.replace(request=response.request.replace(meta=meta)), page)
+                return
+            
             # Переходимо на українську версію
             yield scrapy.Request(
                 url=ua_url,
                 callback=self.parse_product_ua,
                 errback=self.parse_product_error,
-                meta={
-                    **response.meta,
-                    "ru_url": ru_url,
-                    "original_url": response.url,
-                },
+                meta=meta,
                 dont_filter=True,
             )
             
@@ -205,19 +172,16 @@ class EserverRetailSpider(EserverBaseSpider, BaseRetailSpider):
             yield from self._skip_product(response.meta)
             return
     
-    def parse_product_ua(self, response):
-        """Парсимо українську версію товару"""
+    def parse_product_ua(self, response, page=None):
+        """Парсимо українську версію товару (page — вже розібрана сторінка, якщо це вона ж)"""
         try:
             self.logger.info(f"🔗 Парсимо товар (UA): {response.url}")
             
-            # Селектор для h1 з класом es-h1
-            name_ua = response.css("h1.es-h1::text").get()
-            if not name_ua:
-                name_ua = response.css("h1::text").get()
-            name_ua = name_ua.strip() if name_ua else ""
-            
-            description_ua = self._extract_description_from_html(response)
-            specs_list_ua = self._extract_specifications_eserver(response)
+            if page is None:
+                page = self.extractor.product(response)
+            name_ua = page.name
+            description_ua = page.description
+            specs_list_ua = page.specifications
             
             self.logger.info(f"📊 Характеристик (UA) знайдено: {len(specs_list_ua)} шт.")
             
@@ -247,70 +211,22 @@ class EserverRetailSpider(EserverBaseSpider, BaseRetailSpider):
         try:
             self.logger.info(f"🔗 Парсимо товар (RU): {response.url}")
             
-            # Селектор для h1 з класом es-h1
-            name_ru = response.css("h1.es-h1::text").get()
-            if not name_ru:
-                name_ru = response.css("h1::text").get()
-            name_ru = name_ru.strip() if name_ru else ""
-            
-            description_ru = self._extract_description_from_html(response)
+            page = self.extractor.product(response)
+            name_ru = page.name
+            description_ru = page.description
             
             name_ua = response.meta.get("name_ua", "")
             description_ua = response.meta.get("description_ua", "")
             specs_list = response.meta.get("specifications_list", [])
             
-            # Ціна
-            price_raw = response.css("div.flex.items-end.font-bold.text-23px::text").get()
-            if not price_raw:
-                price_raw = response.css("div[class*='price']::text").get()
-            price = self._clean_price(price_raw) if price_raw else ""
-            
-            # Наявність - РОЗШИРЕНЕ ВИТЯГУВАННЯ З ЛОГУВАННЯМ
-            availability_raw = ""
-            
-            # Спробуємо різні селектори
-            availability_element = response.css("div.product_ag-sts__x60QA")
-            if availability_element:
-                availability_text = availability_element.css("::text").getall()
-                availability_raw = " ".join([t.strip() for t in availability_text if t.strip()])
-                self.logger.info(f"📦 Наявність (селектор 1): '{availability_raw}'")
-            
-            # Альтернативний селектор 1: загальний пошук тексту з "наявності" або "наличии"
-            if not availability_raw:
-                all_text = response.css("*::text").getall()
-                for text in all_text:
-                    text_lower = text.lower().strip()
-                    if "наявност" in text_lower or "налич" in text_lower:
-                        availability_raw = text.strip()
-                        self.logger.info(f"📦 Наявність (селектор 2 - пошук): '{availability_raw}'")
-                        break
-            
-            # Альтернативний селектор 2: шукаємо в div з класами що містять "status", "stock", "available"
-            if not availability_raw:
-                status_divs = response.css("div[class*='status'], div[class*='stock'], div[class*='available']")
-                for div in status_divs:
-                    text = " ".join(div.css("::text").getall()).strip()
-                    if text:
-                        availability_raw = text
-                        self.logger.info(f"📦 Наявність (селектор 3 - div): '{availability_raw}'")
-                        break
+            price = self._page_price(page)
+            availability_raw = page.availability
             
-            # Якщо нічого не знайдено - логуємо попередження з HTML
-            if not availability_raw:
-                self.logger.warning(f"⚠️ НЕ ЗНАЙДЕНО наявності для: {response.url}")
-                # Логуємо фрагмент HTML для дебагу
-                product_section = response.css("div[class*='product']").get()
-                if product_section:
-                    self.logger.warning(f"HTML фрагмент: {product_section[:500]}...")
-                # За замовчуванням вважаємо В НАЯВНОСТІ (бо в категорії фільтр only-inStock)
-                availability_raw = "В наявності"
-            
-            # Зображення
-            image_url = self._extract_image_from_srcset(response)
-            image_url = self._sanitize_image_url(image_url)
+            # Зображення (найбільше з srcset)
+            image_url = self._sanitize_image_url(page.images[0] if page.images else "")
             
             # Виробник - парсимо з сайту
-            manufacturer = self._extract_manufacturer_from_page(response)
+            manufacturer = page.manufacturer
             if not manufacturer:
                 # Fallback на старий метод (з назви або CSV)
                 manufacturer = self._extract_manufacturer(name_ru)
@@ -329,7 +245,7 @@ class EserverRetailSpider(EserverBaseSpider, BaseRetailSpider):
             self.logger.info(f"📝 Опис RU: {len(description_ru)} символів")
             self.logger.info(f"📝 Опис UA: {len(description_ua)} символів")
             
-            item = {
+            item = ProductRecord({
                 "Код_товару": "",
                 "Назва_позиції": name_ru,
                 "Назва_позиції_укр": name_ua,
@@ -356,7 +272,7 @@ class EserverRetailSpider(EserverBaseSpider, BaseRetailSpider):
                 "output_file": self.output_filename,
                 "Продукт_на_сайті": response.meta.get("original_url", response.url),
                 "specifications_list": specs_list,
-            }
+            })
             
             self.logger.info(f"✅ YIELD: {item['Назва_позиції']} | Ціна: {item['Ціна']} | Характеристик: {len(specs_list)}")
             yield item
@@ -368,188 +284,15 @@ class EserverRetailSpider(EserverBaseSpider, BaseRetailSpider):
             yield from self._skip_product(response.meta)
             return
     
-    def parse_product_error(self, failure):
-        """Обробка помилок завантаження товару"""
-        url = failure.request.url
-        reason = failure.value
-        product_name = failure.request.meta.get("name_ua", "Назва не знайдена")
-        
-        self.logger.error(f"❌ Помилка завантаження товару: {product_name} ({url}). Причина: {reason}")
-        self.failed_products.append({"url": url, "reason": str(reason), "product_name": product_name})
-        
-        meta = failure.request.meta
-        remaining = meta.get("remaining_products", [])
-        category_index = meta.get("category_index")
-        
-        if remaining:
-            next_data = remaining.pop(0)
-            next_data["meta"]["remaining_products"] = remaining
-            next_data["meta"]["category_index"] = category_index
-            
-            self.logger.info(f"⏭️ Пропускаю товар. Залишилось: {len(remaining)}")
-            yield scrapy.Request(
-                url=next_data["url"],
-                callback=self.parse_product,
-                errback=self.parse_product_error,
-                meta=next_data["meta"],
-                dont_filter=True,
-            )
-        else:
-            self.logger.info(f"⏭️ Всі товари категорії оброблені (з помилками).")
-            next_cat = self._start_next_category(category_index)
-            if next_cat:
-                yield next_cat
-    
-    def _skip_product(self, meta):
-        """Перехід до наступного товару в ланцюгу"""
-        remaining = meta.get("remaining_products", [])
-        category_index = meta.get("category_index")
-        
-        if remaining:
-            next_data = remaining.pop(0)
-            next_data["meta"]["remaining_products"] = remaining
-            next_data["meta"]["category_index"] = category_index
-            
-            self.logger.info(f"⏭️ Перехід до наступного товару. Залишилось: {len(remaining)}")
-            yield scrapy.Request(
-                url=next_data["url"],
-                callback=self.parse_product,
-                errback=self.parse_product_error,
-                meta=next_data["meta"],
-                dont_filter=True,
-            )
-        else:
-            self.logger.info(f"⏭️ Товари категорії закінчились.")
-            next_cat = self._start_next_category(category_index)
-            if next_cat:
-                yield next_cat
-    
-    def _start_next_category(self, current_category_index):
-        """Допоміжний метод для запуску наступної категорії"""
-        next_category_index = current_category_index + 1
-        if next_category_index < len(self.category_urls):
-            next_category_url = self.category_urls[next_category_index]
-            self.logger.info(f"🚀 СТАРТ НАСТУПНОЇ КАТЕГОРІЇ [{next_category_index + 1}/{len(self.category_urls)}]: {next_category_url}")
-            return scrapy.Request(
-                url=next_category_url,
-                callback=self.parse_category,
-                meta={
-                    "category_url": next_category_url,
-                    "category_index": next_category_index,
-                    "page_number": 1,
-                },
-                dont_filter=True,
-            )
-        else:
-            self.logger.info(f"🎉🎉🎉 ВСІ КАТЕГОРІЇ ТА ПРОДУКТИ ОБРОБЛЕНІ 🎉🎉🎉")
-            return None
-    
-    def _extract_manufacturer_from_page(self, response):
-        """Витягує виробника з сайту E-Server
-        
-        HTML структура:
-        <div class="mb-13px xl:mb-5px xl:last:mb-0 xl:pl-1 3xl:pl-0">
-            Виробник: 
-            <a class="text-midBlue..." href="...">
-                EServer™
-            </a>
-        </div>
-        """
-        try:
-            # Спочатку шукаємо div що містить текст "Виробник"
-            manufacturer_divs = response.xpath("//div[contains(text(), 'Виробник')]")
-            
-            if not manufacturer_divs:
-                # Російська версія
-                manufacturer_divs = response.xpath("//div[contains(text(), 'Производитель')]")
-            
-            if manufacturer_divs:
-                # Витягуємо текст з <a> всередині div
-                manufacturer_link = manufacturer_divs[0].css("a::text").get()
-                
-                if manufacturer_link:
-                    manufacturer = manufacturer_link.strip()
-                    # Очищаємо від символу ™
-                    manufacturer = manufacturer.replace("™", "").strip()
-                    return manufacturer
-            
-            return ""
-            
-        except Exception as e:
-            self.logger.warning(f"⚠️ Помилка парсингу виробника з сайту: {e}")
-            return ""
-    
-    def _extract_image_from_srcset(self, response):
-        """Витягує найбільше зображення з srcset"""
-        srcset = response.css("img[alt*='фото']::attr(srcset)").get()
-        
-        if srcset:
-            urls = re.findall(r'(https?://[^\s]+)\s+\d+w', srcset)
-            if urls:
-                return urls[-1]
-        
-        # Fallback на src
-        image_url = response.css("img[alt*='фото']::attr(src)").get()
-        if not image_url:
-            image_url = response.css("img[src*='storage']::attr(src)").get()
-        
-        if image_url and not image_url.startswith('http'):
-            image_url = response.urljoin(image_url)
-        
-        return image_url or ""
-    
-    def _extract_specifications_eserver(self, response):
-        """Екстракт характеристик з таблиці e-server"""
-        specs = []
-        
-        spec_container = response.css("div.bg-white")
-        if not spec_container:
-            self.logger.warning(f"⚠️ Не знайдено контейнер характеристик: {response.url}")
-            return specs
-        
-        spec_rows = spec_container.css("div.flex.justify-between.mx-3")
-        
-        for row in spec_rows:
-            name_element = row.css("div.font-semibold::text").get()
-            name = name_element.strip() if name_element else ""
-            
-            # Витягуємо ВСІ текстові вузли зі значення (включаючи багаторядкові)
-            value_elements = row.css("div.text-right::text, div.whitespace-pre-line::text").getall()
-            if not value_elements:
-                value_elements = row.css("div.font-medium::text").getall()
-            
-            # Об'єднуємо всі текстові вузли, замінюючи переноси на <br> для збереження форматування
-            value = "<br>".join([v.strip() for v in value_elements if v.strip()])
-            
-            if name and value:
-                specs.append({
-                    "name": name,
-                    "unit": "",
-                    "value": value,
-                })
-        
-        return specs
-    
-    def _extract_description_from_html(self, response):
-        """Екстракт тексту опису з HTML"""
-        description_container = response.css("div.product_pg-dsc__h3fai")
-        
-        if not description_container:
-            return ""
-        
-        paragraphs = description_container.css("p::text").getall()
-        
-        if paragraphs:
-            return "\n".join([p.strip() for p in paragraphs if p.strip()])
-        
-        all_text = description_container.css("::text").getall()
-        return " ".join([t.strip() for t in all_text if t.strip()])
+    def _page_price(self, page):
+        """Ціна з картки товару (однакова на UA та RU сторінках)"""
+        return self._clean_price(page.price) if page.price else ""
     
     def _load_keywords_mapping_eserver(self):
         """Завантажує маппінг ключових слів для eserver з CSV"""
         import csv
         mapping = {}
-        csv_path = Path(r"C:\FullStack\Scrapy\data\eserver\eserver_keywords.csv")
+        csv_path = data_path("eserver", "eserver_keywords.csv")
         
         if not csv_path.exists():
             self.logger.warning("eserver_keywords.csv not found")
@@ -572,6 +315,15 @@ class EserverRetailSpider(EserverBaseSpider, BaseRetailSpider):
         
         return mapping
     
+    def _extract_model_components(self, title: str, lang: str = "ua") -> List[str]:
+        """Повна назва товару + токени-моделі (з цифрами або латиницею, напр. 42U, 600x1000, EServer)"""
+        components = [title.strip()]
+        for token in re.split(r"[\s,()/]+", title):
+            token = token.strip(".-")
+            if len(token) > 1 and re.search(r"[0-9A-Za-z]", token):
+                components.append(token)
+        return components
+    
     def _generate_search_terms(self, title: str, subdivision_id: str = "", lang: str = "ua") -> str:
         """Генерує пошукові терміни з назви товару та ключових слів"""
         if not title:
@@ -3,12 +3,24 @@ Spider для парсингу роздрібних цін з secur.ua (UAH)
 Вигружає дані в: output/secur_retail.csv
 
 ВИПРАВЛЕНО: Прибрано wait_for_selector що викликав timeout
+
+ЗАВАНТАЖЕННЯ (-a fetch_mode=auto|http|browser, за замовчуванням auto):
+- auto    — спочатку звичайний HTTP; поля, яких немає в HTML, доповнюються з JSON-LD;
+            якщо потрібних полів все одно немає — та сама сторінка через Playwright.
+            Після 3 відкатів поспіль без жодного успіху тип сторінки йде одразу в браузер
+- http    — тільки HTTP (без Playwright)
+- browser — кожна сторінка через Playwright (як раніше)
+
+Примітка: /ajax/... у URL категорій — це бренд Ajax, а не AJAX/JSON API;
+окремого JSON-каталогу secur.ua не має.
 """
 import scrapy
 import csv
-import re
-from pathlib import Path
+import json
 from scrapy_playwright.page import PageMethod
+from suppliers.extractors import SecurExtractor
+from suppliers.items import ProductRecord
+from suppliers.paths import data_path
 from suppliers.spiders.base import BaseRetailSpider
 
 
@@ -17,6 +29,8 @@ class SecurRetailSpider(BaseRetailSpider):
     supplier_id = "secur"
     output_filename = "secur_retail.csv"
     allowed_domains = ["secur.ua"]
+    product_callback_name = "parse_product_ua"
+    extractor_class = SecurExtractor
     
     custom_settings = {
         "ITEM_PIPELINES": {
@@ -27,21 +41,33 @@ class SecurRetailSpider(BaseRetailSpider):
             "https": "scrapy_playwright.handler.ScrapyPlaywrightDownloadHandler",
         },
         "TWISTED_REACTOR": "twisted.internet.asyncioreactor.AsyncioSelectorReactor",
-        "CONCURRENT_REQUESTS": 1,
+        "CONCURRENT_REQUESTS": 2,
+        "CONCURRENT_REQUESTS_PER_DOMAIN": 1,
         "DOWNLOAD_DELAY": 2,
+        # Playwright-рендеринг важкий — контролер не піднімає вище 2 сторінок
+        "ADAPTIVE_THROTTLE_MAX_CONCURRENCY": 2,
+        "ADAPTIVE_THROTTLE_MIN_DELAY": 0.5,
     }
     
+    # Відкатів у браузер без жодної успішної HTTP-сторінки, після яких тип сторінки йде одразу в браузер
+    browser_switch_after = 3
+    
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.fetch_mode = kwargs.get("fetch_mode", "") or "auto"
+        if self.fetch_mode not in ("auto", "http", "browser"):
+            raise ValueError(f"❌ Невідомий fetch_mode: {self.fetch_mode} (очікується auto, http або browser)")
+        # Тип сторінки (category / product_ua / product_ru) → {"http": успіхів, "browser": відкатів}
+        self.fetch_stats = {}
+        self.browser_only = set()
         self.category_mapping = self._load_category_mapping()
         self.category_urls = list(self.category_mapping.keys())
         self.current_category_index = 0
-        self.products_from_pagination = []
     
     def _load_category_mapping(self):
         """Завантажує маппінг категорій з CSV"""
         mapping = {}
-        csv_path = Path(r"C:\FullStack\Scrapy\data\secur\secur_category_retail.csv")
+        csv_path = data_path("secur", "secur_category_retail.csv")
         
         try:
             with open(csv_path, encoding="utf-8-sig") as f:
@@ -65,146 +91,227 @@ class SecurRetailSpider(BaseRetailSpider):
         
         return mapping
     
-    def start_requests(self):
-        """Стартуємо з першої категорії"""
-        if self.category_urls:
-            first_category_url = self.category_urls[0]
-            self.logger.info(f"🚀 СТАРТ ПАРСИНГУ. Перша категорія [1/{len(self.category_urls)}]: {first_category_url}")
-            yield scrapy.Request(
-                url=first_category_url,
-                callback=self.parse_category,
-                meta={
-                    "category_url": first_category_url,
-                    "category_index": 0,
-                    "page_number": 1,
-                    "playwright": True,
-                },
-                dont_filter=True,
-                errback=self.errback_httpbin,
-            )
-    
     def errback_httpbin(self, failure):
         """Обробка помилок"""
         self.logger.error(f"❌ ERRBACK: {failure.value}")
         self.logger.error(f"   URL: {failure.request.url}")
         
-        # Отримуємо remaining_products з meta
-        remaining = failure.request.meta.get("remaining_products", [])
-        category_index = failure.request.meta.get("category_index", 0)
+        meta = failure.request.meta
         
-        # Якщо є ще товари - обробляємо їх
-        if remaining:
-            self.logger.info(f"⏭️ Пропускаємо товар з помилкою, обробляємо наступний ({len(remaining)} залишилось)")
-            request_to_yield = self._process_next_item(remaining, category_index)
-            if request_to_yield:
-                yield request_to_yield
-        else:
-            # Інакше переходимо до наступної категорії
-            next_cat = self._start_next_category(category_index)
-            if next_cat:
-                yield next_cat
+        # Помилка товару — запам'ятовуємо для відкладеного повтору та продовжуємо ланцюг
+        if getattr(failure.request.callback, "__name__", "") in ("parse_product_ua", "parse_product_ru"):
+            self._record_failed_product(failure.request, failure.value)
+            yield from self._skip_product(meta)
+            return
+        
+        # Помилка категорії — переходимо до наступної категорії
+        next_cat = self._start_next_category(meta.get("category_index", 0))
+        if next_cat:
+            yield next_cat
+    
+    def _product_request(self, url, meta, **kwargs):
+        """Запит товару (UA версія)"""
+        return self._secur_request(url, getattr(self, self.product_callback_name), meta, "product_ua", **kwargs)
+    
+    def _category_request(self, url, category_index):
+        """Запит першої сторінки категорії"""
+        return self._secur_request(
+            url,
+            self.parse_category,
+            {
+                "category_url": url,
+                "category_index": category_index,
+                "page_number": 1,
+            },
+            "category",
+        )
+    
+    # ------------------------------------------------------------------
+    # HTTP спочатку, Playwright — лише для сторінок без потрібних полів
+    # ------------------------------------------------------------------
+    
+    def _use_browser(self, page_kind):
+        return self.fetch_mode == "browser" or page_kind in self.browser_only
+    
+    def _secur_request(self, url, callback, meta, page_kind, rendered=False, **kwargs):
+        """Запит сторінки secur: звичайний HTTP або Playwright (товари — з очікуванням Vue.js)"""
+        meta = {**meta, "secur_page_kind": page_kind}
+        meta.pop("playwright_page_methods", None)
+        meta["playwright"] = rendered or self._use_browser(page_kind)
+        if meta["playwright"] and page_kind != "category":
+            meta["playwright_page_methods"] = [PageMethod("wait_for_timeout", 2000)]
+        return scrapy.Request(
+            url=url,
+            callback=callback,
+            meta=meta,
+            dont_filter=True,
+            errback=self.errback_httpbin,
+            **kwargs,
+        )
+    
+    def _fetched(self, response, page_kind):
+        """Облік сторінок, що обійшлись без браузера"""
+        if not response.meta.get("playwright"):
+            self.fetch_stats.setdefault(page_kind, {"http": 0, "browser": 0})["http"] += 1
+    
+    def _render_fallback(self, response, page_kind, missing):
+        """HTML без потрібних полів → та сама сторінка через Playwright (None — відкат неможливий)"""
+        if response.meta.get("playwright") or self.fetch_mode == "http":
+            return None
+        
+        stats = self.fetch_stats.setdefault(page_kind, {"http": 0, "browser": 0})
+        stats["browser"] += 1
+        if page_kind not in self.browser_only and stats["http"] == 0 and stats["browser"] >= self.browser_switch_after:
+            self.browser_only.add(page_kind)
+            self.logger.warning(f"🌐 {page_kind}: HTML без даних {stats['browser']} раз поспіль — далі тільки через браузер")
+        
+        self.logger.info(f"🌐 {page_kind}: в HTML немає {', '.join(missing)} — рендеринг через Playwright: {response.url}")
+        return self._secur_request(
+            response.url,
+            response.request.callback,
+            response.meta,
+            page_kind,
+            rendered=True,
+            priority=response.request.priority,
+        )
+    
+    def _json_ld_product(self, page):
+        """schema.org Product з JSON-LD сторінки (порожній dict якщо немає)"""
+        for raw in page.json_ld:
+            try:
+                data = json.loads(raw)
+            except ValueError:
+                continue
+            candidates = data if isinstance(data, list) else data.get("@graph", [data]) if isinstance(data, dict) else []
+            for candidate in candidates:
+                if isinstance(candidate, dict) and candidate.get("@type") == "Product":
+                    return candidate
+        return {}
+    
+    def _fill_from_json_ld(self, page, fields):
+        """Доповнює відсутні поля товару з JSON-LD"""
+        if all(fields.values()):
+            return fields
+        product = self._json_ld_product(page)
+        if not product:
+            return fields
+        offers = product.get("offers") or {}
+        if isinstance(offers, list):
+            offers = offers[0] if offers else {}
+        image = product.get("image")
+        if isinstance(image, list):
+            image = image[0] if image else None
+        availability = str(offers.get("availability", ""))
+        from_json_ld = {
+            "name": product.get("name"),
+            "price_raw": str(offers["price"]) if offers.get("price") not in (None, "") else None,
+            "image_url": image if isinstance(image, str) else None,
+            "product_code": product.get("sku"),
+            "availability_raw": (
+                "В наявності" if availability.endswith("InStock")
+                else "Немає в наявності" if availability.endswith("OutOfStock")
+                else None
+            ),
+        }
+        for key, value in fields.items():
+            if not value and from_json_ld.get(key):
+                fields[key] = from_json_ld[key]
+        return fields
+    
+    def closed(self, reason):
+        if self.fetch_stats:
+            summary = ", ".join(
+                f"{kind}: HTTP {stats['http']}, браузер {stats['browser']}"
+                for kind, stats in sorted(self.fetch_stats.items())
+            )
+            self.logger.info(f"🌐 Завантаження сторінок — {summary}")
+        super().closed(reason)
     
     def parse_category(self, response):
         """Парсимо список товарів у категорії"""
         category_url = response.meta["category_url"]
         category_index = response.meta["category_index"]
         page_number = response.meta.get("page_number", 1)
-        category_info = self.category_mapping.get(category_url, {})
         
         self.logger.info(f"📂 Обробляю категорію [{category_index + 1}/{len(self.category_urls)}] сторінка {page_number}")
         
-        product_links = response.css('div.productsCardsSlider a::attr(href)').getall()
+        listing = self.extractor.category(response)
+        product_links = listing.product_links
+        
+        if not product_links:
+            fallback = self._render_fallback(response, "category", ["товарів"])
+            if fallback:
+                yield fallback
+                return
+        else:
+            self._fetched(response, "category")
         
         if not product_links:
             self.logger.warning(f"⚠️ Не знайдено товарів на сторінці: {response.url}")
         else:
             self.logger.info(f"📦 Знайдено товарів на сторінці: {len(product_links)}")
             for link in product_links:
-                product_url = response.urljoin(link)
-                
-                if product_url not in self.processed_products:
-                    self.products_from_pagination.append({
-                        "url": product_url,
-                        "meta": {
-                            "category_url": category_url,
-                            "category_ru": category_info.get("category_ru", ""),
-                            "category_ua": category_info.get("category_ua", ""),
-                            "group_number": category_info.get("group_number", ""),
-                            "subdivision_id": category_info.get("subdivision_id", ""),
-                            "subdivision_link": category_info.get("subdivision_link", ""),
-                        },
-                    })
-                    self.processed_products.add(product_url)
+                self._queue_product(response.urljoin(link), category_url)
         
-        next_page = response.css('a.next-button::attr(href)').get()
+        next_page = listing.next_page
         
         if next_page:
             next_page_url = response.urljoin(next_page)
             self.logger.info(f"📄 Пагінація: сторінка {page_number + 1}")
-            yield scrapy.Request(
-                url=next_page_url,
-                callback=self.parse_category,
-                meta={
+            yield self._secur_request(
+                next_page_url,
+                self.parse_category,
+                {
                     "category_url": category_url,
                     "category_index": category_index,
                     "page_number": page_number + 1,
-                    "playwright": True,
                 },
-                dont_filter=True,
-                errback=self.errback_httpbin,
+                "category",
             )
         else:
-            self.logger.info(f"✅ ПАГІНАЦІЯ ЗАВЕРШЕНА [{category_index + 1}/{len(self.category_urls)}]: накопичено {len(self.products_from_pagination)} товарів")
+            self.logger.info(f"✅ ПАГІНАЦІЯ ЗАВЕРШЕНА [{category_index + 1}/{len(self.category_urls)}]: накопичено {len(self.product_frontier)} товарів")
             
-            if self.products_from_pagination:
-                product_data = self.products_from_pagination.pop(0)
-                product_data["meta"]["remaining_products"] = list(self.products_from_pagination)
-                product_data["meta"]["category_index"] = category_index
-                
-                self.logger.info(f"🔗 ЗАПУСК ланцюга продуктів. Перший: {product_data['url']}. Залишилось: {len(self.products_from_pagination)}")
-                
-                # Просто чекаємо 3 секунди - без wait_for_selector
-                yield scrapy.Request(
-                    url=product_data["url"],
-                    callback=self.parse_product_ua,
-                    meta={
-                        **product_data["meta"],
-                        "playwright": True,
-                        "playwright_page_methods": [
-                            PageMethod("wait_for_timeout", 2000),  # Чекаємо 2 секунди для Vue.js
-                        ],
-                    },
-                    dont_filter=True,
-                    errback=self.errback_httpbin,
-                )
-            else:
-                self.logger.warning(f"⚠️ У категорії {category_url} не знайдено товарів. Переходжу до наступної.")
-                next_cat = self._start_next_category(category_index)
-                if next_cat:
-                    yield next_cat
+            yield from self._start_product_chain(category_url, category_index)
     
     def parse_product_ua(self, response):
         """Парсим украинскую версию товара"""
         self.logger.info(f"🇺🇦 UA: {response.url}")
         
-        name_ua = response.css('h1.title::text').get()
-        price_raw = response.css('div.currentPrice span.bold::text').get()
-        image_url = response.css('div.productsCardsSlider a img::attr(src)').get()
-        product_code = response.css('div.productsCardsCode span::text').get()
+        page = self.extractor.product(response)
+        fields = self._fill_from_json_ld(page, {
+            "name": page.name,
+            "price_raw": page.price,
+            "image_url": page.images[0] if page.images else None,
+            "product_code": page.sku,
+            "availability_raw": page.availability,
+        })
+        missing = [key for key in ("name", "price_raw") if not fields[key]]
+        if missing:
+            fallback = self._render_fallback(response, "product_ua", missing)
+            if fallback:
+                yield fallback
+                return
+        else:
+            self._fetched(response, "product_ua")
+        
+        name_ua = fields["name"]
+        price_raw = fields["price_raw"]
+        image_url = fields["image_url"]
+        product_code = fields["product_code"]
         
-        availability_raw = response.css('div.statusWrap::text').get()
+        availability_raw = fields["availability_raw"]
         if availability_raw:
             availability_raw = availability_raw.strip()
         else:
             availability_raw = "В наявності"
         
-        description_ua = response.css('div.content.descr div.item').get()
-        if description_ua:
-            description_ua = self._clean_html_description(description_ua)
-        else:
-            description_ua = ""
+        # Без ціни / не в наявності — pipeline все одно відкине, RU сторінку не завантажуємо
+        if self._filtered_early(response, self._clean_price(price_raw) if price_raw else "", availability_raw):
+            yield from self._skip_product(response.meta)
+            return
         
-        specs_list = self._parse_specifications(response)
+        description_ua = page.description
+        specs_list = page.specifications
         
         self.logger.info(f"📊 UA: Знайдено характеристик: {len(specs_list)}")
         
@@ -221,32 +328,23 @@ class SecurRetailSpider(BaseRetailSpider):
         
         ru_url = response.url.replace("secur.ua/", "secur.ua/ru/")
         
-        yield scrapy.Request(
-            url=ru_url,
-            callback=self.parse_product_ru,
-            meta={
-                **meta,
-                "playwright": True,
-                "playwright_page_methods": [
-                    PageMethod("wait_for_timeout", 2000),
-                ],
-            },
-            dont_filter=True,
-            errback=self.errback_httpbin,
-        )
+        yield self._secur_request(ru_url, self.parse_product_ru, meta, "product_ru")
     
     def parse_product_ru(self, response):
         """Парсим русскую версию товара"""
         self.logger.info(f"🇷🇺 RU: {response.url}")
         
-        name_ru = response.css('h1.title::text').get()
-        brand = response.xpath("//div[@class='subtitle' and text()='Бренд']/../div[@class='inner']//p/text()").get()
-        
-        description_ru = response.css('div.content.descr div.item').get()
-        if description_ru:
-            description_ru = self._clean_html_description(description_ru)
+        page = self.extractor.product(response)
+        name_ru = page.name or self._json_ld_product(page).get("name")
+        if not name_ru:
+            fallback = self._render_fallback(response, "product_ru", ["name"])
+            if fallback:
+                yield fallback
+                return
         else:
-            description_ru = ""
+            self._fetched(response, "product_ru")
+        
+        description_ru = page.description
         
         name_ua = response.meta.get("name_ua", "")
         name_ru = name_ru.strip() if name_ru else name_ua
@@ -259,21 +357,19 @@ class SecurRetailSpider(BaseRetailSpider):
         
         price = self._clean_price(price_raw) if price_raw else ""
         image_url = response.urljoin(image_url) if image_url else ""
-        brand = brand.strip() if brand else ""
         quantity = self._extract_quantity(availability_raw)
         
-        search_terms_ru = self._generate_search_terms(name_ru)
-        search_terms_ua = self._generate_search_terms(name_ua)
+        # Ключові слова генеруються автоматично через ProductKeywordsGenerator в pipeline
         
         self.logger.info(f"📝 Опис RU: {len(description_ru)} символів")
         self.logger.info(f"📝 Опис UA: {len(description_ua)} символів")
         
-        item = {
+        item = ProductRecord({
             "Код_товару": product_code,
             "Назва_позиції": name_ru,
             "Назва_позиції_укр": name_ua,
-            "Пошукові_запити": search_terms_ru,
-            "Пошукові_запити_укр": search_terms_ua,
+            "Пошукові_запити": "",  # Заповнюється в pipeline
+            "Пошукові_запити_укр": "",  # Заповнюється в pipeline
             "Опис": description_ru,
             "Опис_укр": description_ua,
             "Тип_товару": "r",
@@ -288,154 +384,17 @@ class SecurRetailSpider(BaseRetailSpider):
             "Номер_групи": response.meta.get("group_number", ""),
             "Ідентифікатор_підрозділу": response.meta.get("subdivision_id", ""),
             "Посилання_підрозділу": response.meta.get("subdivision_link", ""),
-            "Виробник": brand,
+            "Виробник": page.manufacturer,
             "Країна_виробник": "",
             "price_type": self.price_type,
             "supplier_id": self.supplier_id,
             "output_file": self.output_filename,
             "Продукт_на_сайті": response.url.replace("/ru/", "/"),
             "specifications_list": specs_list,
-        }
+        })
         
         self.logger.info(f"✅ YIELD: {item['Назва_позиції']} | Ціна: {item['Ціна']} | Характеристик: {len(specs_list)}")
         yield item
         
         # Обробляємо наступний товар
-        remaining = response.meta.get("remaining_products", [])
-        category_index = response.meta.get("category_index", 0)
-        
-        request_to_yield = self._process_next_item(remaining, category_index)
-        if request_to_yield:
-            yield request_to_yield
-    
-    def _process_next_item(self, remaining, category_index):
-        """Обробляє наступний товар або переходить до наступної категорії"""
-        if remaining:
-            next_data = remaining.pop(0)
-            next_data["meta"]["remaining_products"] = list(remaining)
-            next_data["meta"]["category_index"] = category_index
-            
-            self.logger.info(f"⏭️ Наступний товар ({len(remaining)} залишилось)")
-            
-            return scrapy.Request(
-                url=next_data["url"],
-                callback=self.parse_product_ua,
-                meta={
-                    **next_data["meta"],
-                    "playwright": True,
-                    "playwright_page_methods": [
-                        PageMethod("wait_for_timeout", 2000),
-                    ],
-                },
-                dont_filter=True,
-                errback=self.errback_httpbin,
-            )
-        else:
-            self.logger.info(f"✅ ВСІ ТОВАРИ КАТЕГОРІЇ ОБРОБЛЕНІ")
-            return self._start_next_category(category_index)
-    
-    def _parse_specifications(self, response):
-        """
-        Парсим характеристики товара
-        Структура HTML: 
-        <div class="item"><div class="subtitle">Назва</div><div class="inner"><div class="innerItem"><p>Значення</p></div></div></div>
-        """
-        specs_list = []
-        
-        # Знаходимо всі div.item які містять характеристики
-        # Вони можуть бути в різних контейнерах, тому шукаємо глобально
-        items = response.xpath('//div[@class="item"][.//div[@class="subtitle"]]')
-        
-        self.logger.info(f"🔍 Знайдено {len(items)} елементів div.item з характеристиками")
-        
-        for item in items:
-            # Витягуємо назву характеристики
-            characteristic = item.xpath('.//div[@class="subtitle"]/text()').get()
-            
-            if not characteristic:
-                continue
-            
-            characteristic = characteristic.strip()
-            
-            # Витягуємо значення - всі текстові вузли в div.inner
-            value_texts = item.xpath('.//div[@class="inner"]//text()').getall()
-            value = ' '.join(t.strip() for t in value_texts if t.strip())
-            
-            if value:
-                value = value.replace('\u00a0', ' ').strip()
-                specs_list.append({
-                    "name": characteristic,
-                    "unit": "",
-                    "value": value,
-                })
-        
-        return specs_list
-    
-    def _clean_html_description(self, html_content):
-        """Очищаем HTML описание, сохраняя форматирование"""
-        if not html_content:
-            return ""
-        
-        from scrapy.selector import Selector
-        sel = Selector(text=html_content)
-        
-        description_html = sel.css('div.item').get()
-        
-        if not description_html:
-            return ""
-        
-        description_html = re.sub(r'^<div[^>]*>', '', description_html)
-        description_html = re.sub(r'</div>$', '', description_html)
-        description_html = re.sub(r'\s*style="[^"]*"', '', description_html)
-        description_html = re.sub(r'>\s+<', '><', description_html)
-        
-        if len(description_html) > 10000:
-            description_html = description_html[:10000] + '...</p>'
-        
-        return description_html.strip()
-    
-    def closed(self, reason):
-        """Викликається при завершенні паука"""
-        self.logger.info(f"🎉 Паук {self.name} завершено! Причина: {reason}")
-        
-        if self.failed_products:
-            self.logger.info("=" * 80)
-            self.logger.info("📦 СПИСОК ТОВАРІВ З ПОМИЛКАМИ ЗАВАНТАЖЕННЯ")
-            self.logger.info("=" * 80)
-            for failed in self.failed_products:
-                self.logger.error(f"- Товар: {failed['product_name']} | URL: {failed['url']} | Причина: {failed['reason']}")
-            self.logger.info("=" * 80)
-        else:
-            self.logger.info("✅ Товарів з помилками завантаження не знайдено.")
-        
-        # Звуковий сигнал (опціонально, працює тільки на Windows)
-        try:
-            import winsound
-            for _ in range(3):
-                winsound.Beep(1000, 300)
-            self.logger.info("🔔 Звуковий сигнал відтворено!")
-        except Exception as e:
-            self.logger.debug(f"Не вдалося відтворити звук: {e}")
-    
-    def _start_next_category(self, current_category_index):
-        """Запуск следующей категории"""
-        next_category_index = current_category_index + 1
-        if next_category_index < len(self.category_urls):
-            next_category_url = self.category_urls[next_category_index]
-            self.logger.info(f"🚀 НАСТУПНА КАТЕГОРІЯ [{next_category_index + 1}/{len(self.category_urls)}]")
-            self.products_from_pagination = []
-            return scrapy.Request(
-                url=next_category_url,
-                callback=self.parse_category,
-                meta={
-                    "category_url": next_category_url,
-                    "category_index": next_category_index,
-                    "page_number": 1,
-                    "playwright": True,
-                },
-                dont_filter=True,
-                errback=self.errback_httpbin,
-            )
-        else:
-            self.logger.info(f"🎉 ВСІ КАТЕГОРІЇ ОБРОБЛЕНІ 🎉")
-            return None
+        yield from self._skip_product(response.meta)
@@ -0,0 +1,317 @@
+"""
+Spider для одночасного парсингу роздрібних (UAH) та дилерських (USD) цін з viatec.ua
+Вигружає дані в: output/viatec_retail.csv та output/viatec_dealer.csv
+
+Замість двох окремих обходів (viatec_retail + viatec_dealer) — один:
+- логін один раз (як viatec_dealer), категорії — об'єднання viatec_category_retail.csv
+  та viatec_category_dealer.csv
+- кожен товар завантажується двома запитами замість чотирьох:
+  UA сторінка в сесії дилера → назва/опис/характеристики UA + дилерська ціна
+  RU сторінка без сесії (окремий cookiejar) → назва/опис RU + роздрібна ціна, наявність, артикул
+- якщо на UA сторінці немає ціни — один додатковий запит RU сторінки в сесії дилера
+- товар потрапляє в той файл, в категорії якого він знайдений (retail, dealer або обидва)
+
+Запуск: python scripts/ultra_clean_run.py viatec_combined
+"""
+import scrapy
+from pathlib import Path
+from suppliers.items import ProductRecord
+from suppliers.spiders.base import BaseSupplierSpider
+from suppliers.paths import data_path
+from suppliers.spiders.viatec.dealer import ViatecDealerSpider
+
+
+# Вигляд → (тип ціни, валюта, вихідний файл, шлях маппінгу категорій)
+VIEWS = {
+    "retail": ("retail", "UAH", "viatec_retail.csv", data_path("viatec", "viatec_category_retail.csv")),
+    "dealer": ("dealer", "USD", "viatec_dealer.csv", data_path("viatec", "viatec_category_dealer.csv")),
+}
+
+# Cookiejar для сторінок без сесії дилера (роздрібна ціна)
+RETAIL_COOKIEJAR = "retail"
+
+# Відбиток товару ^ сіль вигляду — окремий ключ у сховищі шардів для кожного вигляду
+VIEW_CLAIM_SALT = {"retail": 1, "dealer": 2}
+
+
+class ViatecCombinedSpider(ViatecDealerSpider):
+    name = "viatec_combined"
+    output_filenames = [VIEWS["retail"][2], VIEWS["dealer"][2]]
+    
+    # views — категорія товару для кожного вигляду (потрібно і для checkpoint/повторів)
+    CATEGORY_META_KEYS = BaseSupplierSpider.CATEGORY_META_KEYS + ("views",)
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.view_mappings = {
+            view: self._read_category_csv(Path(csv_path))
+            for view, (_price_type, _currency, _output, csv_path) in VIEWS.items()
+        }
+        
+        # Об'єднання категорій: спочатку дилерські, далі тільки роздрібні
+        self.category_mapping = {**self.view_mappings["retail"], **self.view_mappings["dealer"]}
+        self.category_urls = list(self.view_mappings["dealer"]) + [
+            url for url in self.view_mappings["retail"] if url not in self.view_mappings["dealer"]
+        ]
+        self.logger.info(
+            f"🔀 Категорій: {len(self.category_urls)} (dealer {len(self.view_mappings['dealer'])}, "
+            f"retail {len(self.view_mappings['retail'])})"
+        )
+        
+        # Товари, знайдені повторно в категорії іншого вигляду:
+        # ще в черзі або обробляються → extra_views (вигляд додається при парсингу чи завершенні),
+        # завершені лише для частини виглядів → partial_views (повторний запит),
+        # завершені для всіх виглядів (або відкинуті фільтром) → finished_products
+        self.extra_views = {}
+        self.partial_views = {}
+        self.finished_products = set()
+        self.view_counts = {view: 0 for view in VIEWS}
+    
+    def _load_category_mapping(self):
+        """Маппінги обох виглядів завантажуються в __init__"""
+        return {}
+    
+    def _category_meta(self, category_url):
+        meta = super()._category_meta(category_url)
+        meta["views"] = {
+            view: {
+                "category_url": category_url,
+                **{key: mapping[category_url].get(key, "") for key in BaseSupplierSpider.CATEGORY_META_KEYS[1:]},
+            }
+            for view, mapping in self.view_mappings.items()
+            if category_url in mapping
+        }
+        return meta
+    
+    def _queue_product(self, product_url, category_url):
+        """Повторна зустріч товару в категорії іншого вигляду — запам'ятовуємо вигляд"""
+        if product_url not in self.processed_products:
+            super()._queue_product(product_url, category_url)
+            return
+        
+        fingerprint = self.processed_products.fingerprint(product_url)
+        if fingerprint in self.finished_products:
+            return
+        meta = self._category_meta(category_url)
+        if fingerprint in self.partial_views:
+            missing = {view: view_meta for view, view_meta in meta["views"].items() if view not in self.partial_views[fingerprint]}
+            if missing:
+                self.partial_views[fingerprint].update(missing)
+                self.product_frontier.push(product_url, {**meta, "views": missing})
+            return
+        
+        known = self.extra_views.setdefault(fingerprint, {})
+        for view, view_meta in meta["views"].items():
+            known.setdefault(view, view_meta)
+    
+    def _claim_product(self, product_url, meta):
+        """Шардований прогін: вигляди застовплюються окремо — товар з дилерської категорії
+        одного шарду та роздрібної категорії іншого вивантажується в обидва файли
+        """
+        if self.shard_store is None:
+            return meta
+        fingerprint = self.processed_products.fingerprint(product_url)
+        claimed = {
+            view: view_meta for view, view_meta in meta["views"].items()
+            if self.shard_store.claim(fingerprint ^ VIEW_CLAIM_SALT[view])
+        }
+        if not claimed:
+            self.shard_skipped += 1
+            return None
+        return {**meta, "views": claimed}
+    
+    def _skip_product(self, meta):
+        self._finish_product_views(meta)
+        yield from super()._skip_product(meta)
+    
+    def _finish_product_views(self, meta):
+        """Товар завершено (вивантажено, відкинуто або з помилкою): переносимо його вигляди
+        з extra_views у partial_views / finished_products; вигляд, що з'явився під час
+        обробки, ставиться в чергу окремим запитом
+        """
+        product_url = meta.get("product_url") or meta.get("failed_product_url")
+        if not product_url:
+            return
+        fingerprint = self.processed_products.fingerprint(product_url)
+        handled = self.partial_views.pop(fingerprint, set()) | set(meta.get("views") or ())
+        late = {
+            view: view_meta for view, view_meta in self.extra_views.pop(fingerprint, {}).items()
+            if view not in handled
+        }
+        # Повторний запит вигляду з partial_views: товар уже завершено для всіх виглядів
+        if fingerprint in self.finished_products:
+            return
+        if late:
+            category_meta = self._category_meta(next(iter(late.values()))["category_url"])
+            self.product_frontier.push(product_url, {**category_meta, "views": late})
+            handled.update(late)
+        
+        if len(handled) < len(VIEWS):
+            self.partial_views[fingerprint] = handled
+        else:
+            self.finished_products.add(fingerprint)
+    
+    def _product_views(self, meta):
+        views = dict(meta.get("views") or {})
+        product_url = meta.get("product_url") or meta.get("failed_product_url")
+        if product_url:
+            for view, view_meta in self.extra_views.pop(self.processed_products.fingerprint(product_url), {}).items():
+                views.setdefault(view, view_meta)
+        return views
+    
+    def _parse_offer(self, page):
+        """Ціна, наявність та артикул з картки товару"""
+        return {
+            "price": self._page_price(page),
+            "availability": self._normalize_availability(page.availability),
+            "quantity": self._extract_quantity(page.availability),
+            "sku": page.sku,
+        }
+    
+    def parse_product(self, response):
+        """UA сторінка в сесії дилера: назва, опис, характеристики та дилерська ціна"""
+        try:
+            self.logger.info(f"🔗 Парсимо товар (UA, dealer): {response.url}")
+            
+            page = self.extractor.product(response)
+            
+            # Не в наявності — pipeline відкине в обох файлах; ціну перевіряє кожен вигляд окремо
+            if self._filtered_on_product_page(page, response, check_price=False):
+                # Наявність спільна для всіх виглядів — відкинуто і для доданих з інших категорій
+                yield from self._skip_product({**response.meta, "views": self._product_views(response.meta)})
+                return
+            
+            yield scrapy.Request(
+                url=self._convert_to_ru_url(response.url),
+                callback=self.parse_product_ru,
+                errback=self.parse_product_error,
+                meta={
+                    **response.meta,
+                    "cookiejar": RETAIL_COOKIEJAR,
+                    "name_ua": page.name,
+                    "description_ua": page.description,
+                    "specifications_list": page.specifications,
+                    "dealer_price": self._page_price(page),
+                    "original_url": response.url,
+                },
+                dont_filter=True,
+            )
+        except Exception as e:
+            self.logger.error(f"❌ Помилка парсингу продукту (UA): {response.url} | {e}")
+            yield from self._skip_product(response.meta)
+    
+    def parse_product_ru(self, response):
+        """RU сторінка без сесії: роздрібна ціна; items для кожного вигляду товару"""
+        try:
+            self.logger.info(f"🔗 Парсимо товар (RU, retail): {response.url}")
+            
+            views = self._product_views(response.meta)
+            page = self.extractor.product(response)
+            offer = self._parse_offer(page)
+            
+            # Дилерської ціни на UA сторінці немає — RU сторінка ще раз, але в сесії дилера
+            if "dealer" in views and not response.meta.get("dealer_price") and not response.meta.get("dealer_price_retry"):
+                meta = {**response.meta, "views": views, "retail_response_offer": offer, "dealer_price_retry": True}
+                meta.pop("cookiejar", None)
+                self.logger.info(f"💵 Дилерської ціни на UA сторінці немає — RU сторінка в сесії дилера: {response.url}")
+                yield scrapy.Request(
+                    url=response.url,
+                    callback=self.parse_product_dealer_price,
+                    errback=self.parse_product_error,
+                    meta=meta,
+                    dont_filter=True,
+                )
+                return
+            
+            yield from self._product_items(response, page, views, offer, response.meta.get("dealer_price", ""))
+            yield from self._skip_product(response.meta)
+        
+        except Exception as e:
+            self.logger.error(f"❌ Помилка парсингу продукту (RU): {response.url} | {e}")
+            yield from self._skip_product(response.meta)
+    
+    def parse_product_dealer_price(self, response):
+        """Додатковий запит: дилерська ціна з RU сторінки в сесії дилера"""
+        try:
+            page = self.extractor.product(response)
+            views = response.meta.get("views", {})
+            yield from self._product_items(response, page, views, response.meta["retail_response_offer"], self._page_price(page))
+            yield from self._skip_product(response.meta)
+        except Exception as e:
+            self.logger.error(f"❌ Помилка парсингу дилерської ціни: {response.url} | {e}")
+            yield from self._skip_product(response.meta)
+    
+    def _product_items(self, response, page, views, offer, dealer_price):
+        """Один item на кожен вигляд; спільні поля з RU сторінки"""
+        name_ru = page.name
+        description_ru = page.description
+        image_urls = self._page_images(response, page)
+        
+        if not offer["sku"]:
+            self.logger.warning(f"⚠️ Артикул не знайдено для товару: {response.url}")
+        
+        manufacturer = self._extract_manufacturer(name_ru)
+        specs_list = response.meta.get("specifications_list", [])
+        
+        # Вивантажені вигляди — при завершенні товару решту буде дозапитано при зустрічі в іншій категорії
+        fingerprint = self.processed_products.fingerprint(response.meta.get("product_url") or response.url)
+        self.partial_views.setdefault(fingerprint, set()).update(views)
+        
+        for view, view_meta in views.items():
+            price_type, currency, output_file, _csv_path = VIEWS[view]
+            price = dealer_price if view == "dealer" else offer["price"]
+            
+            item = ProductRecord({
+                "Код_товару": "",
+                "Назва_позиції": name_ru,
+                "Назва_позиції_укр": response.meta.get("name_ua", ""),
+                "Пошукові_запити": "",  # Заповнюється в pipeline
+                "Пошукові_запити_укр": "",  # Заповнюється в pipeline
+                "Опис": description_ru,
+                "Опис_укр": response.meta.get("description_ua", ""),
+                "Тип_товару": "r",
+                "Ціна": price,
+                "Валюта": currency,
+                "Одиниця_виміру": "шт.",
+                "Посилання_зображення": ", ".join(image_urls),
+                "Наявність": offer["availability"],
+                "Кількість": offer["quantity"],
+                "Назва_групи": view_meta.get("category_ru", ""),
+                "Назва_групи_укр": view_meta.get("category_ua", ""),
+                "Номер_групи": view_meta.get("group_number", ""),
+                "Ідентифікатор_товару": offer["sku"],
+                "Ідентифікатор_підрозділу": view_meta.get("subdivision_id", ""),
+                "Посилання_підрозділу": view_meta.get("subdivision_link", ""),
+                "Виробник": manufacturer,
+                "Країна_виробник": "",
+                "price_type": price_type,
+                "supplier_id": self.supplier_id,
+                "output_file": output_file,
+                "Продукт_на_сайті": response.meta.get("original_url", response.url),
+                "category_url": view_meta.get("category_url", ""),
+                "specifications_list": specs_list,
+            })
+            
+            self.view_counts[view] += 1
+            self.logger.info(f"✅ YIELD [{view}]: {name_ru} | Ціна: {price} {currency} | Характеристик: {len(specs_list)}")
+            yield item
+    
+    def checkpoint_state(self):
+        state = super().checkpoint_state()
+        state["partial_views"] = sorted([fingerprint, sorted(views)] for fingerprint, views in self.partial_views.items())
+        return state
+    
+    def _resume_requests(self, state):
+        for fingerprint, views in state.get("partial_views", []):
+            self.partial_views[fingerprint] = set(views)
+        # Решта оброблених у попередньому прогоні товарів (крім тих, що в ланцюгу) — завершені
+        pending = {self.processed_products.fingerprint(product["url"]) for product in state.get("pending", [])}
+        self.finished_products.update(
+            fingerprint for fingerprint in state.get("processed_products", [])
+            if fingerprint not in pending and fingerprint not in self.partial_views
+        )
+        yield from super()._resume_requests(state)
+    
+    def closed(self, reason):
+        self.logger.info(f"🔀 Items: retail {self.view_counts['retail']}, dealer {self.view_counts['dealer']}")
+        super().closed(reason)
@@ -7,11 +7,12 @@ Spider для парсингу дилерських цін з viatec.ua (USD)
 ХАРАКТЕРИСТИКИ: парсяться УКРАЇНСЬКОЮ (UA) мовою з підтримкою rule_kind
 """
 import scrapy
-import csv
-from pathlib import Path
 from urllib.parse import urljoin
 import os
 from dotenv import load_dotenv
+from suppliers.fingerprints import strip_url_prefixes
+from suppliers.items import ProductRecord
+from suppliers.paths import ROOT, data_path
 from suppliers.spiders.base import ViatecBaseSpider, BaseDealerSpider
 
 
@@ -33,7 +34,7 @@ class ViatecDealerSpider(ViatecBaseSpider, BaseDealerSpider):
         super().__init__(*args, **kwargs)
         
         # Завантажуємо облікові дані з .env
-        load_dotenv(Path(r"C:\FullStack\Scrapy\suppliers\.env"))
+        load_dotenv(ROOT / "suppliers" / ".env")
         self.email = os.getenv("VIATEC_EMAIL")
         self.password = os.getenv("VIATEC_PASSWORD")
         
@@ -46,30 +47,7 @@ class ViatecDealerSpider(ViatecBaseSpider, BaseDealerSpider):
     
     def _load_category_mapping(self):
         """Завантажує маппінг категорій з CSV"""
-        mapping = {}
-        csv_path = Path(r"C:\FullStack\Scrapy\data\viatec\viatec_category_dealer.csv")
-        
-        try:
-            with open(csv_path, encoding="utf-8-sig") as f:
-                reader = csv.DictReader(f, delimiter=";")
-                for row in reader:
-                    url = row["Линк категории поставщика"].strip().strip('"')
-                    
-                    if not url or url == "" or not url.startswith("http"):
-                        continue
-                    
-                    mapping[url] = {
-                        "category_ru": row["Категория на моем сайте_RU"],
-                        "category_ua": row["Категория на моем сайте_UA"],
-                        "group_number": row.get("Номер_групи", ""),
-                        "subdivision_id": row.get("Ідентифікатор_підрозділу", ""),
-                        "subdivision_link": row.get("Посилання_підрозділу", ""),
-                    }
-            self.logger.info(f"✅ Завантажено {len(mapping)} категорій")
-        except Exception as e:
-            self.logger.error(f"❌ Помилка завантаження категорій: {e}")
-        
-        return mapping
+        return self._read_category_csv(data_path("viatec", "viatec_category_dealer.csv"))
     
     def start_requests(self):
         """Спочатку GET /login → отримаємо cookies і csrf"""
@@ -109,70 +87,35 @@ class ViatecDealerSpider(ViatecBaseSpider, BaseDealerSpider):
         
         self.logger.info("✅ УСПІШНИЙ ЛОГІН")
         
-        if not self.category_urls:
-            self.logger.error("Немає категорій для парсингу.")
-            return
-        
-        first = self.category_urls[0]
-        
-        yield scrapy.Request(
-            url=first,
-            callback=self.parse_category,
-            meta={
-                "category_url": first,
-                "category_index": 0,
-                "page_number": 1
-            },
-            dont_filter=True
-        )
+        # Обхід стартує тільки після логіну (товари з помилками, checkpoint, перша категорія)
+        yield from self._crawl_start_requests()
     
     def parse_category(self, response):
         """Парсимо список товарів у категорії та сторінки пагінації"""
         category_url = response.meta["category_url"]
         category_index = response.meta["category_index"]
         page_number = response.meta.get("page_number", 1)
-        category_info = self.category_mapping.get(category_url, {})
         
         self.logger.info(f"📂 Обробляю категорію [{category_index + 1}/{len(self.category_urls)}] сторінка {page_number}: {category_url}")
         
-        product_links = response.css("a[href*='/product/']::attr(href)").getall()
+        listing = self.extractor.category(response)
+        product_links = listing.product_links
         
         if not product_links:
             self.logger.warning(f"⚠️ Не знайдено товарів на сторінці: {response.url}")
         else:
             self.logger.info(f"📦 Знайдено товарів на сторінці: {len(product_links)}")
+            # Картки «немає в наявності» / «під замовлення» не ставимо в чергу
+            out_of_stock = self._listing_out_of_stock(listing)
             for link in product_links:
+                if link in out_of_stock:
+                    continue
                 product_url = response.urljoin(link)
-                normalized_url = product_url.replace("/ru/", "/")
+                normalized_url = strip_url_prefixes(product_url, self.url_locale_prefixes)
                 
-                if normalized_url not in self.processed_products:
-                    self.products_from_pagination.append({
-                        "url": normalized_url,
-                        "meta": {
-                            "category_url": category_url,
-                            "category_ru": category_info.get("category_ru", ""),
-                            "category_ua": category_info.get("category_ua", ""),
-                            "group_number": category_info.get("group_number", ""),
-                            "subdivision_id": category_info.get("subdivision_id", ""),
-                            "subdivision_link": category_info.get("subdivision_link", ""),
-                        },
-                    })
-                    self.processed_products.add(normalized_url)
+                self._queue_product(normalized_url, category_url)
         
-        next_page_link = response.css("a.paggination__next::attr(href)").get()
-        if not next_page_link:
-            all_pages = response.css("a.paggination__page::attr(href)").getall()
-            active_page_nodes = response.css("a.paggination__page--active")
-            if all_pages and active_page_nodes:
-                try:
-                    active_page_text = active_page_nodes[0].css("::text").get()
-                    all_page_texts = [a.css("::text").get() for a in response.css("a.paggination__page")]
-                    current_idx = all_page_texts.index(active_page_text)
-                    
-                    if current_idx >= 0 and current_idx + 1 < len(all_pages):
-                        next_page_link = all_pages[current_idx + 1]
-                except (ValueError, IndexError):
-                    pass
+        next_page_link = listing.next_page
         
         if next_page_link:
             self.logger.info(f"📄 Перехід на наступну сторінку пагінації ({page_number + 1}): {next_page_link}")
@@ -187,68 +130,51 @@ class ViatecDealerSpider(ViatecBaseSpider, BaseDealerSpider):
                 dont_filter=True
             )
         else:
-            self.logger.info(f"✅ ПАГІНАЦІЯ ЗАВЕРШЕНА [{category_index + 1}/{len(self.category_urls)}]: накопичено {len(self.products_from_pagination)} товарів")
+            self.logger.info(f"✅ ПАГІНАЦІЯ ЗАВЕРШЕНА [{category_index + 1}/{len(self.category_urls)}]: накопичено {len(self.product_frontier)} товарів")
             
-            if self.products_from_pagination:
-                product_data = self.products_from_pagination.pop(0)
-                product_data["meta"]["remaining_products"] = self.products_from_pagination
-                product_data["meta"]["category_index"] = category_index
-                
-                self.logger.info(f"🔗 ЗАПУСК ланцюга продуктів. Перший: {product_data['url']}. Залишилось: {len(self.products_from_pagination)}")
-                
-                yield scrapy.Request(
-                    url=product_data["url"],
-                    callback=self.parse_product,
-                    errback=self.parse_product_error,
-                    meta=product_data["meta"],
-                    dont_filter=True,
-                )
-            else:
-                self.logger.warning(f"⚠️ У категорії {category_url} не знайдено товарів. Переходжу до наступної.")
-                next_idx = response.meta["category_index"] + 1
-                
-                if next_idx < len(self.category_urls):
-                    next_cat = self.category_urls[next_idx]
-                    
-                    yield scrapy.Request(
-                        url=next_cat,
-                        callback=self.parse_category,
-                        meta={
-                            "category_url": next_cat,
-                            "category_index": next_idx,
-                            "page_number": 1
-                        },
-                        dont_filter=True
-                    )
-            
-            self.products_from_pagination = []
+            yield from self._start_product_chain(category_url, category_index)
     
     def parse_product(self, response):
         """Парсимо сторінку товару (українська версія) - НАЗВА, ОПИС, ХАРАКТЕРИСТИКИ"""
         try:
             self.logger.info(f"🔗 Парсимо товар (UA): {response.url}")
             
-            name_ua = response.css("h1::text").get()
-            name_ua = name_ua.strip() if name_ua else ""
+            page = self.extractor.product(response)
             
-            description_ua = self._extract_description_with_br(response)
-            specs_list_ua = self._extract_specifications(response)
+            # Без ціни / не в наявності — pipeline все одно відкине, RU сторінку не завантажуємо
+            if self._filtered_on_product_page(page, response):
+                yield from self._skip_product(response.meta)
+                return
+            
+            name_ua = page.name
+            description_ua = page.description
+            specs_list_ua = page.specifications
             
             self.logger.info(f"📐 Характеристик (UA) знайдено: {len(specs_list_ua)} шт.")
             
+            meta = {
+                **response.meta,
+                "name_ua": name_ua,
+                "description_ua": description_ua,
+                "specifications_list": specs_list_ua,
+                "original_url": response.url,
+            }
+            
+            # UA контент не змінився з минулого прогону — RU контент з кешу, RU сторінку не завантажуємо
+            cached_ru = self._cached_content(page.sku, "ua", name_ua, description_ua, specs_list_ua, "ru")
+            if cached_ru:
+                self.logger.info(f"♻️ RU контент з кешу, ціна та наявність з UA сторінки: {response.url}")
+                meta["cached_content_ru"] = cached_ru
+                yield from self.parse_product_ru(response.replace(request=response.request.replace(meta=meta)), page)
+                return
+            
             ru_url = self._convert_to_ru_url(response.url)
             
             yield scrapy.Request(
                 url=ru_url,
                 callback=self.parse_product_ru,
                 errback=self.parse_product_error,
-                meta={
-                    **response.meta,
-                    "name_ua": name_ua,
-                    "description_ua": description_ua,
-                    "specifications_list": specs_list_ua,
-                    "original_url": response.url,
-                },
+                meta=meta,
                 dont_filter=True,
             )
         except Exception as e:
@@ -256,15 +182,23 @@ class ViatecDealerSpider(ViatecBaseSpider, BaseDealerSpider):
             yield from self._skip_product(response.meta)
             return
     
-    def parse_product_ru(self, response):
-        """Парсимо сторінку товару (російська версія) та продовжуємо ланцюг"""
+    def parse_product_ru(self, response, page=None):
+        """Парсимо сторінку товару (російська версія) та продовжуємо ланцюг
+        
+        page — вже розібрана UA сторінка, коли RU контент взято з кешу
+        """
         try:
             self.logger.info(f"🔗 Парсимо товар (RU): {response.url}")
             
-            name_ru = response.css("h1::text").get()
-            name_ru = name_ru.strip() if name_ru else ""
+            if page is None:
+                page = self.extractor.product(response)
             
-            description_ru = self._extract_description_with_br(response)
+            cached_ru = response.meta.get("cached_content_ru")
+            if cached_ru:
+                name_ru, description_ru = cached_ru["name"], cached_ru["description"]
+            else:
+                name_ru = page.name
+                description_ru = page.description
             
             name_ua = response.meta.get("name_ua", "")
             description_ua = response.meta.get("description_ua", "")
@@ -273,42 +207,34 @@ class ViatecDealerSpider(ViatecBaseSpider, BaseDealerSpider):
             code = ""
             
             # Парсимо артикул постачальника
-            supplier_sku = response.css("span.card-header__card-articul-text-value::text").get()
-            supplier_sku = supplier_sku.strip() if supplier_sku else ""
+            supplier_sku = page.sku
             
             if supplier_sku:
                 self.logger.info(f"🔖 Артикул постачальника: {supplier_sku}")
             else:
                 self.logger.warning(f"⚠️ Артикул не знайдено для товару: {response.url}")
             
+            if not cached_ru:
+                self._store_content(supplier_sku, {
+                    "ua": (name_ua, description_ua, specs_list),
+                    "ru": (name_ru, description_ru, []),
+                })
+            
             # ДИЛЕРСЬКА ЦІНА В USD (селектор той же, але валюта USD)
-            price_raw = response.css("div.card-header__card-price-new::text").get()
-            price_raw = price_raw.strip().replace("&nbsp;", "").replace(" ", "") if price_raw else ""
-            price = self._clean_price(price_raw) if price_raw else ""
+            price = self._page_price(page)
             
             self.logger.info(f"📝 Опис RU: {len(description_ru)} символів")
             self.logger.info(f"📝 Опис UA: {len(description_ua)} символів")
             
-            # Парсимо всі зображення товару
-            gallery_images = response.css('a[data-fancybox*="gallery"]::attr(href)').getall()
-            
-            if not gallery_images:
-                gallery_images = response.css("img.card-header__card-images-image::attr(src)").getall()
-            
-            self.logger.info(f"🖼️ Знайдено зображень: {len(gallery_images)}")
+            self.logger.info(f"🖼️ Знайдено зображень: {len(page.images)}")
             
-            image_urls = []
-            for img in gallery_images:
-                full_url = response.urljoin(img)
-                sanitized_url = self._sanitize_image_url(full_url)
-                if sanitized_url:
-                    image_urls.append(sanitized_url)
+            image_urls = self._page_images(response, page)
             
             image_url = ", ".join(image_urls) if image_urls else ""
             if len(image_urls) > 1:
                 self.logger.info(f"🖼️ Оброблено множинних зображень: {len(image_urls)} шт.")
             
-            availability_raw_text = response.css("div.card-header__card-status-badge::text").get()
+            availability_raw_text = page.availability
             availability_status = self._normalize_availability(availability_raw_text)
             quantity = self._extract_quantity(availability_raw_text)
             
@@ -317,7 +243,7 @@ class ViatecDealerSpider(ViatecBaseSpider, BaseDealerSpider):
             subdivision_id = response.meta.get("subdivision_id", "")
             # Ключові слова генеруються автоматично через ProductKeywordsGenerator в pipeline
             
-            item = {
+            item = ProductRecord({
                 "Код_товару": code,
                 "Назва_позиції": name_ru,
                 "Назва_позиції_укр": name_ua,
@@ -346,7 +272,7 @@ class ViatecDealerSpider(ViatecBaseSpider, BaseDealerSpider):
                 "Продукт_на_сайті": response.meta.get("original_url", response.url),
                 "category_url": response.meta.get("category_url", ""),
                 "specifications_list": specs_list,
-            }
+            })
             
             self.logger.info(f"✅ YIELD: {item['Назва_позиції']} | Ціна: {item['Ціна']} USD | Зображень: {len(image_urls)} | Характеристик: {len(specs_list)}")
             yield item
@@ -357,77 +283,3 @@ class ViatecDealerSpider(ViatecBaseSpider, BaseDealerSpider):
             self.logger.error(f"❌ Помилка парсингу продукту (RU): {response.url} | {e}")
             yield from self._skip_product(response.meta)
             return
-    
-    def parse_product_error(self, failure):
-        url = failure.request.url
-        reason = failure.value
-        product_name = failure.request.meta.get("name_ru", "Назва не знайдена")
-        
-        self.logger.error(f"❌ Помилка завантаження товару: {product_name} ({url}). Причина: {reason}")
-        self.failed_products.append({"url": url, "reason": str(reason), "product_name": product_name})
-        
-        meta = failure.request.meta
-        remaining = meta.get("remaining_products", [])
-        category_index = meta.get("category_index")
-        
-        if remaining:
-            next_data = remaining.pop(0)
-            next_data["meta"]["remaining_products"] = remaining
-            next_data["meta"]["category_index"] = category_index
-            
-            self.logger.info(f"⏭️ Пропускаю товар. Залишилось: {len(remaining)}")
-            yield scrapy.Request(
-                url=next_data["url"],
-                callback=self.parse_product,
-                errback=self.parse_product_error,
-                meta=next_data["meta"],
-                dont_filter=True,
-            )
-        else:
-            self.logger.info(f"⏭️ Всі товари категорії оброблені (з помилками).")
-            next_cat = self._start_next_category(category_index)
-            if next_cat:
-                yield next_cat
-    
-    def _skip_product(self, meta):
-        remaining = meta.get("remaining_products", [])
-        category_index = meta.get("category_index")
-        
-        if remaining:
-            next_data = remaining.pop(0)
-            next_data["meta"]["remaining_products"] = remaining
-            next_data["meta"]["category_index"] = category_index
-            
-            self.logger.info(f"⏭️ Перехід до наступного товару. Залишилось: {len(remaining)}")
-            yield scrapy.Request(
-                url=next_data["url"],
-                callback=self.parse_product,
-                errback=self.parse_product_error,
-                meta=next_data["meta"],
-                dont_filter=True,
-            )
-        else:
-            self.logger.info(f"⏭️ Товари категорії закінчились.")
-            next_cat = self._start_next_category(category_index)
-            if next_cat:
-                yield next_cat
-    
-    def _start_next_category(self, current_category_index):
-        """Допоміжний метод для запуску наступної категорії"""
-        next_category_index = current_category_index + 1
-        if next_category_index < len(self.category_urls):
-            next_category_url = self.category_urls[next_category_index]
-            self.logger.info(f"🚀 СТАРТ НАСТУПНОЇ КАТЕГОРІЇ [{next_category_index + 1}/{len(self.category_urls)}]: {next_category_url}")
-            return scrapy.Request(
-                url=next_category_url,
-                callback=self.parse_category,
-                meta={
-                    "category_url": next_category_url,
-                    "category_index": next_category_index,
-                    "page_number": 1,
-                },
-                dont_filter=True,
-            )
-        else:
-            self.logger.info(f"🎉🎉🎉 ВСІ КАТЕГОРІЇ ТА ПРОДУКТИ ОБРОБЛЕНІ 🎉🎉🎉")
-            return None
@@ -0,0 +1,277 @@
+"""
+Адаптивний контролер конкурентності по доменах постачальників (AIMD).
+
+Замість фіксованих DOWNLOAD_DELAY / CONCURRENT_REQUESTS_PER_DOMAIN / AutoThrottle
+кожен домен керується окремо за зворотнім зв'язком:
+- затримка відповіді (EWMA) порівнюється з найкращою баченою для домену
+- частка помилок (5xx, 429, таймаути, обриви з'єднання) у вікні відповідей
+- 429/503 з Retry-After: слот домену чекає вказаний час, потім продовжує
+
+Поки сайт «здоровий» — адитивне збільшення (спочатку зменшується затримка,
+далі +1 до конкурентності); при помилках або росту латентності —
+мультиплікативне зменшення (конкурентність / 2, затримка × 2).
+
+Налаштування (глобально в settings.py або в custom_settings паука):
+  ADAPTIVE_THROTTLE_ENABLED, ADAPTIVE_THROTTLE_MIN_CONCURRENCY, ADAPTIVE_THROTTLE_MAX_CONCURRENCY,
+  ADAPTIVE_THROTTLE_MIN_DELAY, ADAPTIVE_THROTTLE_MAX_DELAY, ADAPTIVE_THROTTLE_WINDOW,
+  ADAPTIVE_THROTTLE_MAX_ERROR_RATE, ADAPTIVE_THROTTLE_LATENCY_FACTOR, ADAPTIVE_THROTTLE_MAX_RETRY_AFTER
+"""
+import time
+from email.utils import parsedate_to_datetime
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+
+
+# Статуси, що означають перевантаження сайту (зменшуємо швидкість одразу)
+THROTTLE_STATUSES = {429, 503}
+
+# Коефіцієнт згладжування EWMA латентності
+LATENCY_ALPHA = 0.3
+
+# Мінімальна затримка після «штрафу» (інакше подвоєння нуля нічого не дає)
+DECREASE_DELAY_FLOOR = 0.25
+
+
+def parse_retry_after(value):
+    """Retry-After: секунди або HTTP-дата → секунди (None якщо не розібрано)"""
+    if not value:
+        return None
+    value = value.decode("latin-1").strip() if isinstance(value, bytes) else str(value).strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class DomainState:
+    """Стан контролера для одного слоту завантаження (домену)"""
+
+    __slots__ = (
+        "concurrency", "delay", "latency", "best_latency",
+        "window_responses", "window_errors", "cooldown_until",
+        "responses", "errors", "throttled", "increases", "decreases", "peak_concurrency",
+    )
+
+    def __init__(self, concurrency, delay):
+        self.concurrency = concurrency
+        self.delay = delay
+        self.latency = None
+        self.best_latency = None
+        self.window_responses = 0
+        self.window_errors = 0
+        self.cooldown_until = 0.0
+        self.responses = 0
+        self.errors = 0
+        self.throttled = 0
+        self.increases = 0
+        self.decreases = 0
+        self.peak_concurrency = concurrency
+
+    def observe_latency(self, latency):
+        self.latency = latency if self.latency is None else (
+            LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * self.latency
+        )
+        if self.best_latency is None or latency < self.best_latency:
+            self.best_latency = latency
+
+    def report(self):
+        return {
+            "concurrency": self.concurrency,
+            "peak_concurrency": self.peak_concurrency,
+            "delay_s": round(self.delay, 3),
+            "latency_ewma_s": round(self.latency, 3) if self.latency is not None else None,
+            "best_latency_s": round(self.best_latency, 3) if self.best_latency is not None else None,
+            "responses": self.responses,
+            "errors": self.errors,
+            "throttled": self.throttled,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
+
+
+class AdaptiveConcurrencyMiddleware:
+    """Downloader middleware: AIMD-керування слотами завантажувача по доменах
+
+    Стоїть близько до завантажувача (945), тому бачить 429/5xx до RetryMiddleware
+    і відповіді до обробки редиректів.
+    """
+
+    def __init__(self, crawler):
+        settings = crawler.settings
+        self.crawler = crawler
+        self.min_concurrency = max(1, settings.getint("ADAPTIVE_THROTTLE_MIN_CONCURRENCY", 1))
+        self.max_concurrency = max(self.min_concurrency, settings.getint("ADAPTIVE_THROTTLE_MAX_CONCURRENCY", 8))
+        self.min_delay = settings.getfloat("ADAPTIVE_THROTTLE_MIN_DELAY", 0.0)
+        self.max_delay = settings.getfloat("ADAPTIVE_THROTTLE_MAX_DELAY", 60.0)
+        self.window = max(1, settings.getint("ADAPTIVE_THROTTLE_WINDOW", 20))
+        self.max_error_rate = settings.getfloat("ADAPTIVE_THROTTLE_MAX_ERROR_RATE", 0.05)
+        self.latency_factor = settings.getfloat("ADAPTIVE_THROTTLE_LATENCY_FACTOR", 3.0)
+        self.max_retry_after = settings.getfloat("ADAPTIVE_THROTTLE_MAX_RETRY_AFTER", 300.0)
+        self.states = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("ADAPTIVE_THROTTLE_ENABLED", True):
+            raise NotConfigured
+        mw = cls(crawler)
+        crawler.signals.connect(mw.spider_closed, signal=signals.spider_closed)
+        return mw
+
+    # ------------------------------------------------------------------
+    # Слоти завантажувача
+    # ------------------------------------------------------------------
+
+    def _slot(self, request):
+        key = request.meta.get("download_slot")
+        if key is None:
+            return None, None
+        return key, self.crawler.engine.downloader.slots.get(key)
+
+    def _state(self, key, slot):
+        state = self.states.get(key)
+        if state is None:
+            concurrency = min(self.max_concurrency, max(self.min_concurrency, slot.concurrency))
+            delay = min(self.max_delay, max(self.min_delay, slot.delay))
+            state = self.states[key] = DomainState(concurrency, delay)
+        # Scrapy прибирає неактивні слоти (_slot_gc) і створює нові з налаштувань —
+        # значення контролера повертаємо щоразу, коли слот з ними розходиться
+        if slot.concurrency != state.concurrency or slot.delay != state.delay:
+            self._apply(slot, state)
+        return state
+
+    @staticmethod
+    def _apply(slot, state):
+        slot.concurrency = state.concurrency
+        now = time.monotonic()
+        if now >= state.cooldown_until:
+            slot.delay = state.delay
+        elif slot.delay < state.cooldown_until - now:
+            # Слот перестворено під час паузи Retry-After — решта паузи рахується від зараз
+            slot.delay = state.cooldown_until - now
+            slot.lastseen = max(slot.lastseen, now)
+
+    # ------------------------------------------------------------------
+    # AIMD
+    # ------------------------------------------------------------------
+
+    def _increase(self, state):
+        if state.delay > self.min_delay:
+            state.delay = max(self.min_delay, state.delay / 2)
+            if state.delay < 0.05:
+                state.delay = self.min_delay
+        elif state.concurrency < self.max_concurrency:
+            state.concurrency += 1
+            state.peak_concurrency = max(state.peak_concurrency, state.concurrency)
+        else:
+            return False
+        state.increases += 1
+        return True
+
+    def _decrease(self, state):
+        state.concurrency = max(self.min_concurrency, state.concurrency // 2)
+        state.delay = min(self.max_delay, max(state.delay * 2, DECREASE_DELAY_FLOOR, self.min_delay))
+        state.decreases += 1
+
+    def _is_degraded(self, state):
+        if state.window_errors / state.window_responses > self.max_error_rate:
+            return True
+        return (
+            state.latency is not None
+            and state.best_latency is not None
+            and state.latency > state.best_latency * self.latency_factor
+            and state.latency - state.best_latency > 0.5
+        )
+
+    def _observe(self, request, spider, error=False, retry_after=None, throttled=False):
+        key, slot = self._slot(request)
+        if slot is None:
+            return
+        state = self._state(key, slot)
+        if state.cooldown_until and time.monotonic() >= state.cooldown_until:
+            state.cooldown_until = 0.0
+
+        state.responses += 1
+        state.window_responses += 1
+        latency = request.meta.get("download_latency")
+        if latency is not None and not error:
+            state.observe_latency(latency)
+        if error:
+            state.errors += 1
+            state.window_errors += 1
+
+        if throttled:
+            state.throttled += 1
+            self._decrease(state)
+            self._reset_window(state)
+            if retry_after:
+                self._pause(slot, state, min(retry_after, self.max_retry_after))
+            self._apply(slot, state)
+            spider.logger.warning(
+                f"🐢 {key}: {request.meta.get('_throttle_status', 429)} → "
+                f"конкурентність {state.concurrency}, затримка {state.delay:.2f}с"
+                + (f", пауза {retry_after:.0f}с (Retry-After)" if retry_after else "")
+            )
+            return
+
+        if state.window_responses < self.window:
+            return
+
+        if self._is_degraded(state):
+            self._decrease(state)
+            spider.logger.info(
+                f"🐢 {key}: помилок {state.window_errors}/{state.window_responses}, "
+                f"латентність {state.latency or 0:.2f}с → конкурентність {state.concurrency}, "
+                f"затримка {state.delay:.2f}с"
+            )
+        elif self._increase(state):
+            spider.logger.debug(
+                f"🐇 {key}: конкурентність {state.concurrency}, затримка {state.delay:.2f}с"
+            )
+        self._reset_window(state)
+        self._apply(slot, state)
+
+    @staticmethod
+    def _reset_window(state):
+        state.window_responses = 0
+        state.window_errors = 0
+
+    @staticmethod
+    def _pause(slot, state, seconds):
+        """Retry-After: наступний запит слоту не раніше ніж через seconds
+
+        Завантажувач чекає slot.delay від останнього запиту, тому тимчасово
+        підіймаємо затримку слоту; після паузи _apply повертає state.delay.
+        """
+        state.cooldown_until = time.monotonic() + seconds
+        slot.delay = max(slot.delay, seconds)
+
+    # ------------------------------------------------------------------
+    # Downloader middleware
+    # ------------------------------------------------------------------
+
+    def process_response(self, request, response, spider):
+        if response.status in THROTTLE_STATUSES:
+            request.meta["_throttle_status"] = response.status
+            self._observe(
+                request, spider, error=True, throttled=True,
+                retry_after=parse_retry_after(response.headers.get("Retry-After")),
+            )
+        else:
+            self._observe(request, spider, error=response.status >= 500)
+        return response
+
+    def process_exception(self, request, exception, spider):
+        self._observe(request, spider, error=True)
+        return None
+
+    def spider_closed(self, spider, reason):
+        for key, state in sorted(self.states.items()):
+            report = state.report()
+            spider.logger.info(
+                f"🎛️ {key}: конкурентність {report['concurrency']} (пік {report['peak_concurrency']}), "
+                f"затримка {report['delay_s']}с, відповідей {report['responses']}, "
+                f"помилок {report['errors']}, 429/503: {report['throttled']}"
+            )
@@ -0,0 +1,144 @@
+"""
+Частота змін товарів між прогонами для порядку обходу.
+
+Ціна та наявність одних категорій (камери, реєстратори, акумулятори) змінюються
+щодня, інших (бокси, кріплення) — рідко. VolatilityStore зберігає в SQLite
+<VOLATILITY_STORE_PATH> стан кожного товару з минулого прогону:
+
+    (namespace, fingerprint) → category_url, state_hash, observations, changes
+
+- state_hash()       — хеш ціни/наявності/кількості всіх item товару за прогін
+- record()           — в кінці прогону: стан товару порівнюється з попереднім,
+                       observations += 1, changes += 1 якщо змінився
+- rates()            — частота змін категорій та ранг товарів (згладжені апріорною,
+                       щоб товар з одним спостереженням не отримав 0 або 1)
+
+Паук упорядковує категорії та товари категорії від найчастіше змінюваних —
+частковий прогін (CRAWL_DEADLINE, -a shard) першими оновлює їх.
+Нові товари та категорії без історії отримують апріорну частоту 0.5.
+Ранг товару — ймовірність зміни після останнього завантаження (частота на
+прогін, прогони щодоби): товар, не оновлений кілька діб (пропущений через
+дедлайн), піднімається в черзі.
+"""
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS volatility (
+    namespace TEXT NOT NULL,
+    fingerprint INTEGER NOT NULL,
+    category_url TEXT NOT NULL,
+    state_hash TEXT NOT NULL,
+    observations INTEGER NOT NULL DEFAULT 0,
+    changes INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (namespace, fingerprint)
+) WITHOUT ROWID;
+"""
+
+# Поля item, зміна яких вважається зміною товару
+STATE_FIELDS = ("Ціна", "Оптова_ціна", "Наявність", "Кількість")
+
+# Частота без історії та її вага (у спостереженнях) при згладжуванні
+PRIOR_RATE = 0.5
+PRIOR_WEIGHT = 2
+
+
+def item_state(item) -> str:
+    """Ціна/наявність одного item у вигляді рядка"""
+    return "|".join(str(item.get(field) or "") for field in STATE_FIELDS)
+
+
+def state_hash(states: Iterable[str]) -> str:
+    """Хеш станів усіх item товару (combined дає по item на вигляд)"""
+    payload = "\n".join(sorted(states))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def smoothed_rate(changes: int, observations: int, prior: float = PRIOR_RATE) -> float:
+    return (changes + PRIOR_WEIGHT * prior) / (observations + PRIOR_WEIGHT)
+
+
+def changed_since(rate: float, age_seconds: float) -> float:
+    """Ймовірність хоча б однієї зміни за age (частота rate — на добу, мінімум одна доба)"""
+    days = max(1.0, age_seconds / 86400)
+    return 1.0 - (1.0 - rate) ** days
+
+
+class VolatilityStore:
+    """SQLite сховище «як часто змінюється товар» між прогонами"""
+
+    def __init__(self, path, namespace: str):
+        self.path = Path(path)
+        self.namespace = namespace
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.path))
+        self.connection.executescript(SCHEMA)
+
+    def rates(self, now: float = None) -> Tuple[Dict[int, float], Dict[str, float]]:
+        """(відбиток → ранг товару, category_url → частота змін категорії)
+
+        Ранг — ймовірність зміни товару за час від останнього завантаження;
+        товар без спостережень отримує частоту своєї категорії.
+        """
+        now = time.time() if now is None else now
+        rows = self.connection.execute(
+            "SELECT fingerprint, category_url, observations, changes, updated_at FROM volatility WHERE namespace = ?",
+            (self.namespace,),
+        ).fetchall()
+        totals = {}
+        for _fingerprint, category_url, observations, changes, _updated_at in rows:
+            total = totals.setdefault(category_url, [0, 0])
+            total[0] += changes
+            total[1] += observations
+        categories = {url: smoothed_rate(changes, observations) for url, (changes, observations) in totals.items()}
+        products = {
+            fingerprint: changed_since(smoothed_rate(changes, observations, categories[category_url]), now - updated_at)
+            for fingerprint, category_url, observations, changes, updated_at in rows
+        }
+        return products, categories
+
+    def record(self, states: Dict[int, Tuple[str, str]], recorded_at: float = None) -> Tuple[int, int]:
+        """states: відбиток → (category_url, state_hash) товарів цього прогону
+
+        Повертає (товарів з попереднім станом, з них змінилось).
+        """
+        recorded_at = time.time() if recorded_at is None else recorded_at
+        previous = {}
+        fingerprints = list(states)
+        for start in range(0, len(fingerprints), 500):
+            chunk = fingerprints[start:start + 500]
+            rows = self.connection.execute(
+                f"SELECT fingerprint, state_hash FROM volatility WHERE namespace = ? "
+                f"AND fingerprint IN ({', '.join('?' * len(chunk))})",
+                (self.namespace, *chunk),
+            )
+            previous.update(rows)
+
+        compared = changed = 0
+        updates = []
+        for fingerprint, (category_url, digest) in states.items():
+            observed = fingerprint in previous
+            is_changed = observed and previous[fingerprint] != digest
+            compared += observed
+            changed += is_changed
+            updates.append((self.namespace, fingerprint, category_url, digest, int(observed), int(is_changed), recorded_at))
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO volatility (namespace, fingerprint, category_url, state_hash, observations, changes, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (namespace, fingerprint) DO UPDATE SET "
+                "category_url = excluded.category_url, state_hash = excluded.state_hash, "
+                "observations = observations + excluded.observations, changes = changes + excluded.changes, "
+                "updated_at = excluded.updated_at",
+                updates,
+            )
+        return compared, changed
+
+    def close(self):
+        self.connection.close()
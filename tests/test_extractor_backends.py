@@ -0,0 +1,121 @@
+"""
+Диференційні тести HTML-бекендів екстракторів (suppliers/extractors/backends.py):
+записи сторінок і вихідний CSV пауків на фікстурах мають збігатися для lxml і lexbor.
+
+    python -m pytest -q tests/test_extractor_backends.py
+"""
+import dataclasses
+import importlib.util
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("selectolax")
+
+from scrapy.http import HtmlResponse
+
+PROJECT_ROOT = Path(__file__).parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from suppliers.extractors import EserverExtractor, SecurExtractor, ViatecExtractor
+from suppliers.extractors.backends import css, get_backend
+
+FIXTURES_DIR = PROJECT_ROOT / "tests" / "fixtures"
+EXTRACTORS = {"viatec": ViatecExtractor, "eserver": EserverExtractor, "secur": SecurExtractor}
+BACKENDS = ("lxml", "lexbor")
+
+
+def _response(body, url="https://example.com/page"):
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return HtmlResponse(url=url, body=body, encoding="utf-8")
+
+
+def _fixtures():
+    for supplier in EXTRACTORS:
+        for path in sorted((FIXTURES_DIR / supplier).glob("*.html")):
+            yield pytest.param(supplier, path, id=f"{supplier}/{path.name}")
+
+
+@pytest.mark.parametrize("supplier, path", list(_fixtures()))
+def test_page_records_match(supplier, path):
+    """CategoryPage / ProductPage з обох бекендів однакові на кожній фікстурі постачальника"""
+    records = {}
+    for backend in BACKENDS:
+        extractor = EXTRACTORS[supplier](backend)
+        response = _response(path.read_bytes(), url=f"https://example.com/{path.stem}")
+        records[backend] = (
+            dataclasses.asdict(extractor.category(response)),
+            dataclasses.asdict(extractor.product(response)),
+        )
+    assert records["lexbor"] == records["lxml"]
+
+
+def _load_benchmark():
+    spec = importlib.util.spec_from_file_location("benchmark_parse", PROJECT_ROOT / "scripts" / "benchmark_parse.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("name", ["viatec_retail", "viatec_dealer", "eserver_retail", "secur_retail"])
+def test_spider_output_matches(name, tmp_path, monkeypatch):
+    """Повний прогін паука + SuppliersPipeline на фікстурах: ті самі items і байт-в-байт CSV"""
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    os.environ.setdefault("VIATEC_EMAIL", "test@example.com")
+    os.environ.setdefault("VIATEC_PASSWORD", "test")
+    benchmark = _load_benchmark()
+    scenario = benchmark.SCENARIOS[name]
+
+    runs = {backend: benchmark.run_scenario(name, scenario, backend=backend) for backend in BACKENDS}
+
+    assert runs["lxml"]["items"] > 0
+    for key in ("requests", "items", "dropped", "output_sha256"):
+        assert runs["lexbor"][key] == runs["lxml"][key], key
+
+
+MARKUP = """<html><head><title>t</title></head><body>
+<div class="info">Виробник: <a href="/brand">EServer™</a></div>
+<div class="info"><span>Виробник</span> всередині span</div>
+<div class="text-right whitespace-pre-line">42U</div>
+<p class="descr">до&nbsp;2000 м<br/>Ethernet</p>
+<input id="flag" disabled>
+</body></html>"""
+
+
+@pytest.mark.parametrize("query", [
+    css("div", contains="Виробник"),
+    css("div.text-right::text, div.whitespace-pre-line::text"),
+    css("div.text-right, div.whitespace-pre-line"),
+    css("input::attr(disabled)"),
+    css("::attr(class)"),
+    css("::text"),
+    css("*::text"),
+    css("a::text"),
+])
+def test_query_semantics_match(query):
+    """Окремі випадки семантики селекторів: contains(text()), групи через кому, атрибути, &nbsp;"""
+    results = {}
+    for name in BACKENDS:
+        backend = get_backend(name)
+        found = backend.select(backend.root(_response(MARKUP)), query)
+        results[name] = [item if isinstance(item, str) else backend.html(item) for item in found]
+    assert results["lexbor"] == results["lxml"]
+
+
+def test_manufacturer_matches():
+    records = {
+        backend: EserverExtractor(backend).product(_response(MARKUP)).manufacturer
+        for backend in BACKENDS
+    }
+    assert records["lxml"] == "EServer"
+    assert records["lexbor"] == records["lxml"]
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_backend("html5lib")
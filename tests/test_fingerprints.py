@@ -0,0 +1,79 @@
+"""
+Відбитки URL (suppliers/fingerprints.py): канонічна форма URL та 64-бітний відбиток.
+
+    python -m pytest -q tests/test_fingerprints.py
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from suppliers.fingerprints import FingerprintSet, SeenStore, canonical_url, url_fingerprint
+
+PRODUCT = "https://viatec.ua/product/ip-kamera-hikvision"
+LOCALE_PREFIXES = ("/ru/",)
+
+
+@pytest.mark.parametrize("url", [
+    "https://viatec.ua/product/ip-kamera-hikvision",
+    "HTTPS://Viatec.UA/product/ip-kamera-hikvision",
+    "https://www.viatec.ua/product/ip-kamera-hikvision",
+    "https://viatec.ua/product/ip-kamera-hikvision/",
+    "https://viatec.ua/product/ip-kamera-hikvision#reviews",
+    "https://viatec.ua/product/ip-kamera-hikvision?utm_source=google&utm_medium=cpc",
+    "https://viatec.ua/product/ip-kamera-hikvision?gclid=abc&fbclid=def&ref=home",
+    "  https://viatec.ua/ru/product/ip-kamera-hikvision ",
+])
+def test_equivalent_urls_share_canonical_form(url):
+    assert canonical_url(url, LOCALE_PREFIXES) == PRODUCT
+    assert url_fingerprint(url, LOCALE_PREFIXES) == url_fingerprint(PRODUCT)
+
+
+def test_query_is_sorted_and_kept():
+    assert canonical_url("https://secur.ua/item?b=2&a=1&utm_campaign=x&empty=") == "https://secur.ua/item?a=1&b=2&empty="
+    assert url_fingerprint("https://secur.ua/item?b=2&a=1") == url_fingerprint("https://secur.ua/item?a=1&b=2")
+    assert url_fingerprint("https://secur.ua/item?a=1") != url_fingerprint("https://secur.ua/item?a=2")
+
+
+def test_meaningful_differences_are_kept():
+    # Шлях чутливий до регістру, мовний префікс знімається лише явно
+    assert url_fingerprint(PRODUCT) != url_fingerprint("https://viatec.ua/Product/IP-Kamera-Hikvision")
+    assert url_fingerprint("https://viatec.ua/ru/product/x") != url_fingerprint("https://viatec.ua/product/x")
+    assert canonical_url("https://viatec.ua") == "https://viatec.ua/"
+
+
+def test_fingerprint_is_signed_64_bit():
+    fingerprints = {url_fingerprint(f"https://e-server.com.ua/uk/product/{i}") for i in range(2000)}
+    assert len(fingerprints) == 2000
+    assert all(-2 ** 63 <= f < 2 ** 63 for f in fingerprints)
+    assert any(f < 0 for f in fingerprints)
+
+
+def test_fingerprint_set_accepts_urls_and_fingerprints():
+    products = FingerprintSet(LOCALE_PREFIXES)
+    products.add("https://viatec.ua/ru/product/ip-kamera-hikvision/")
+    assert PRODUCT in products
+    assert url_fingerprint(PRODUCT) in products
+
+    restored = FingerprintSet(LOCALE_PREFIXES)
+    restored.update(products.fingerprints())
+    assert "https://www.viatec.ua/product/ip-kamera-hikvision?utm_source=x" in restored
+    assert len(restored) == 1
+
+
+def test_seen_store_keeps_64_bit_fingerprints(tmp_path):
+    fingerprints = {url_fingerprint(f"https://viatec.ua/product/{i}"): "https://viatec.ua/catalog/cameras" for i in range(50)}
+    store = SeenStore(tmp_path / "seen.sqlite", "viatec")
+    store.mark(fingerprints, seen_at=1000.0)
+    store.close()
+
+    store = SeenStore(tmp_path / "seen.sqlite", "viatec")
+    assert {fingerprint: category for fingerprint, (_seen_at, category) in store.index().items()} == fingerprints
+    store.close()
+    other = SeenStore(tmp_path / "seen.sqlite", "secur")
+    assert other.index() == {}
+    other.close()
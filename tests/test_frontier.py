@@ -0,0 +1,105 @@
+"""
+ProductFrontier (suppliers/frontier.py): порядок черги при вивантаженні в SQLite та prioritize().
+
+    python -m pytest -q tests/test_frontier.py
+"""
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from suppliers.frontier import ProductFrontier
+
+
+def _urls(count):
+    return [f"https://viatec.ua/product/{i}" for i in range(count)]
+
+
+def _drain(frontier):
+    urls = []
+    while True:
+        entry = frontier.pop()
+        if entry is None:
+            return urls
+        key, url, _meta = entry
+        frontier.done(key)
+        urls.append(url)
+
+
+def test_spill_keeps_fifo(tmp_path):
+    path = tmp_path / "frontier.sqlite"
+    frontier = ProductFrontier(path, memory_items=3)
+    urls = _urls(10)
+    for url in urls[:7]:
+        frontier.push(url, {"category_url": "https://viatec.ua/catalog/cameras"})
+    assert frontier.spilled == 4 and path.exists()
+
+    # Товари, додані під час ланцюга, стають після вже вивантажених
+    first = frontier.pop()
+    frontier.done(first[0])
+    for url in urls[7:]:
+        frontier.push(url, {})
+    assert len(frontier) == 9
+
+    assert [first[1]] + _drain(frontier) == urls
+    assert frontier.spilled == 0
+
+
+def test_spilled_meta_round_trip(tmp_path):
+    frontier = ProductFrontier(tmp_path / "frontier.sqlite", memory_items=1)
+    meta = {"category_url": "https://viatec.ua/catalog/cameras", "category_ua": "Камери", "views": {"retail": {}}}
+    frontier.push("https://viatec.ua/product/0", {})
+    frontier.push("https://viatec.ua/product/1", meta)
+    frontier.pop()
+    assert frontier.pop()[2] == meta
+
+
+def test_pending_order_and_close(tmp_path):
+    path = tmp_path / "frontier.sqlite"
+    frontier = ProductFrontier(path, memory_items=2)
+    urls = _urls(5)
+    for url in urls:
+        frontier.push(url, {})
+    in_progress = frontier.pop()
+
+    assert [url for url, _meta in frontier.pending()] == urls
+    assert frontier.get(in_progress[0]) == (urls[0], {})
+
+    # Закриття видаляє файл, незавершені товари лишаються для checkpoint
+    frontier.close()
+    assert not path.exists()
+    assert [url for url, _meta in frontier.pending()] == urls
+
+
+def test_prioritize_in_memory():
+    frontier = ProductFrontier(memory_items=100)
+    ranks = [0.0, 2.0, 0.5, 2.0, 0.0]
+    urls = _urls(len(ranks))
+    for url, rank in zip(urls, ranks):
+        frontier.push(url, {}, rank)
+    frontier.prioritize()
+    # Більший rank першим, однаковий rank — порядок додавання
+    assert _drain(frontier) == [urls[1], urls[3], urls[2], urls[0], urls[4]]
+
+
+def test_prioritize_with_spill(tmp_path):
+    frontier = ProductFrontier(tmp_path / "frontier.sqlite", memory_items=2)
+    ranks = [0.0, 1.0, 0.0, 3.0, 1.0, 0.0]
+    urls = _urls(len(ranks))
+    for url, rank in zip(urls, ranks):
+        frontier.push(url, {}, rank)
+    frontier.prioritize()
+    assert not frontier.memory
+    assert _drain(frontier) == [urls[3], urls[1], urls[4], urls[0], urls[2], urls[5]]
+
+
+def test_prioritize_without_ranks_is_fifo(tmp_path):
+    frontier = ProductFrontier(tmp_path / "frontier.sqlite", memory_items=2)
+    urls = _urls(4)
+    for url in urls:
+        frontier.push(url, {})
+    frontier.prioritize()
+    assert frontier.spilled == 2
+    assert _drain(frontier) == urls
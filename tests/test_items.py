@@ -0,0 +1,64 @@
+"""
+ProductRecord (suppliers/items.py): інтерфейс словника, ItemAdapter і рядок CSV pipeline.
+
+    python -m pytest -q tests/test_items.py
+"""
+import sys
+from pathlib import Path
+
+import pytest
+from itemadapter import ItemAdapter, is_item
+
+PROJECT_ROOT = Path(__file__).parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from suppliers.items import FIELDS, PROM_FIELDS, UNSET, ProductRecord
+
+
+FIELDS_SAMPLE = {"Назва_позиції": "Камера", "Ціна": "1 250,50", "supplier_id": "viatec"}
+
+
+def test_mapping_interface():
+    record = ProductRecord(FIELDS_SAMPLE)
+    assert dict(record) == FIELDS_SAMPLE
+    assert record.keys() == list(FIELDS_SAMPLE)
+    assert record.values() == list(FIELDS_SAMPLE.values())
+    assert record.items() == list(FIELDS_SAMPLE.items())
+    assert len(record) == 3
+    assert "Валюта" not in record and record.get("Валюта", "UAH") == "UAH"
+    with pytest.raises(KeyError):
+        record["Валюта"]
+
+
+def test_unknown_field():
+    record = ProductRecord()
+    with pytest.raises(KeyError):
+        record["Колір"] = "чорний"
+    with pytest.raises(KeyError):
+        ProductRecord({"Колір": "чорний"})
+
+
+def test_copy_is_independent():
+    record = ProductRecord(FIELDS_SAMPLE)
+    copied = record.copy()
+    copied["Ціна"] = "1"
+    del copied["supplier_id"]
+    assert record == ProductRecord(FIELDS_SAMPLE)
+    assert copied != record
+
+
+def test_cells_follow_fields_order():
+    record = ProductRecord.from_cells(["", "Камера"])
+    assert len(record.cells()) == len(FIELDS)
+    assert record.cells()[PROM_FIELDS.index("Назва_позиції")] == "Камера"
+    assert record.cells()[-1] is UNSET
+
+
+def test_item_adapter():
+    record = ProductRecord(FIELDS_SAMPLE)
+    assert is_item(record)
+    adapter = ItemAdapter(record)
+    adapter["Валюта"] = "USD"
+    assert record["Валюта"] == "USD"
+    assert adapter.asdict() == {**FIELDS_SAMPLE, "Валюта": "USD"}
@@ -0,0 +1,102 @@
+"""
+Продовження перерваного прогону (-a resume=1): SuppliersPipeline обрізає CSV до
+зсуву з checkpoint і дописує далі — результат байт-в-байт як у неперерваному прогоні.
+
+    python -m pytest -q tests/test_pipeline_resume.py
+"""
+import codecs
+import importlib.util
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+from scrapy.settings import Settings
+
+PROJECT_ROOT = Path(__file__).parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from suppliers.checkpoint import get_checkpoint
+from suppliers.pipelines import SuppliersPipeline
+
+
+def _viatec_items(tmp_path, monkeypatch):
+    """Items паука viatec_retail з офлайн-фікстур (той самий прогін, що й у benchmark_parse.py)"""
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    spec = importlib.util.spec_from_file_location("benchmark_parse", PROJECT_ROOT / "scripts" / "benchmark_parse.py")
+    benchmark = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(benchmark)
+    items = []
+    benchmark.run_scenario("viatec_retail", benchmark.SCENARIOS["viatec_retail"], captured=items)
+    return items
+
+
+def _spider(checkpoint_dir, **kwargs):
+    from suppliers.spiders.viatec.retail import ViatecRetailSpider
+
+    spider = ViatecRetailSpider(**kwargs)
+    # Коди з лічильника в пам'яті: продовження бере наступний код з checkpoint
+    spider.settings = Settings({"CHECKPOINT_DIR": str(checkpoint_dir), "PRODUCT_CODES_ENABLED": False})
+    return spider
+
+
+def _pipeline(output_dir, spider):
+    pipeline = SuppliersPipeline()
+    pipeline.output_dir = output_dir
+    pipeline.open_spider(spider)
+    return pipeline
+
+
+def _write(pipeline, spider, items):
+    for item in items:
+        pipeline.process_item(item.copy(), spider)
+
+
+@pytest.mark.parametrize("interrupt_after", [1, 5])
+def test_resume_matches_uninterrupted_run(interrupt_after, tmp_path, monkeypatch):
+    items = _viatec_items(tmp_path, monkeypatch)
+    assert len(items) > interrupt_after + 2
+
+    full_dir, resumed_dir = tmp_path / "full", tmp_path / "resumed"
+    spider = _spider(tmp_path / "checkpoints_full")
+    pipeline = _pipeline(full_dir, spider)
+    _write(pipeline, spider, items)
+    pipeline.close_spider(spider)
+
+    # Перерваний прогін: checkpoint після interrupt_after товарів, далі ще два рядки
+    # та обірваний запис — усе після checkpoint має бути відкинуте
+    spider = _spider(tmp_path / "checkpoints")
+    pipeline = _pipeline(resumed_dir, spider)
+    _write(pipeline, spider, items[:interrupt_after])
+    get_checkpoint(spider).save()
+    _write(pipeline, spider, items[interrupt_after:interrupt_after + 2])
+    for f in pipeline.files.values():
+        f.write("200999;Обірваний рядок без кін")
+        f.close()
+
+    spider = _spider(tmp_path / "checkpoints", resume="1")
+    pipeline = _pipeline(resumed_dir, spider)
+    _write(pipeline, spider, items[interrupt_after:])
+    pipeline.close_spider(spider)
+
+    filename = spider.output_filename
+    resumed = (resumed_dir / filename).read_bytes()
+    assert resumed == (full_dir / filename).read_bytes()
+    # Один BOM на початку файлу, жодного — на місці продовження
+    assert resumed.count(codecs.BOM_UTF8) == 1
+
+
+def test_offset_is_row_boundary(tmp_path, monkeypatch):
+    items = _viatec_items(tmp_path, monkeypatch)
+    spider = _spider(tmp_path / "checkpoints")
+    pipeline = _pipeline(tmp_path, spider)
+    _write(pipeline, spider, items[:3])
+
+    state = pipeline.checkpoint_state()[spider.output_filename]
+    pipeline.close_spider(spider)
+
+    content = (tmp_path / spider.output_filename).read_bytes()
+    assert state["offset"] == len(content)
+    assert content[:state["offset"]].endswith(b"\n")
+    assert content.count(b"\n") == 1 + state["count"] == 4
@@ -0,0 +1,70 @@
+"""
+ProductCodeAllocator (suppliers/product_codes.py): два процеси на одному SQLite не видають однакових кодів.
+
+    python -m pytest -q tests/test_product_codes.py
+"""
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from suppliers.product_codes import ProductCodeAllocator
+
+
+def _take(allocator, count):
+    return [allocator.next() for _ in range(count)]
+
+
+def test_interleaved_allocators_are_disjoint(tmp_path):
+    path = tmp_path / "codes.sqlite"
+    first = ProductCodeAllocator(path, "viatec", initial_code=1000, block_size=5)
+    second = ProductCodeAllocator(path, "viatec", initial_code=1000, block_size=5)
+
+    codes = _take(first, 3) + _take(second, 7) + _take(first, 4)
+    first.close()
+    # Залишок блоку first повертається і дістається наступному
+    codes += _take(second, 6)
+    second.close()
+
+    assert len(codes) == len(set(codes))
+    assert min(codes) == 1000
+
+    # Лічильник зберігається між прогонами: новий процес продовжує вище за всі видані коди
+    third = ProductCodeAllocator(path, "viatec", initial_code=1000, block_size=5)
+    high_water_mark = third.high_water_mark()
+    assert high_water_mark > max(codes)
+    later = _take(third, 12)
+    third.close()
+    assert not set(later) & set(codes)
+
+
+def test_suppliers_have_separate_counters(tmp_path):
+    path = tmp_path / "codes.sqlite"
+    viatec = ProductCodeAllocator(path, "viatec", initial_code=1000, block_size=5)
+    secur = ProductCodeAllocator(path, "secur", initial_code=1000, block_size=5)
+    assert viatec.next() == 1000
+    assert secur.next() == 1000
+    viatec.close()
+    secur.close()
+
+
+def test_raised_initial_code_skips_returned_blocks(tmp_path):
+    path = tmp_path / "codes.sqlite"
+    first = ProductCodeAllocator(path, "viatec", initial_code=1000, block_size=10)
+    second = ProductCodeAllocator(path, "viatec", initial_code=1000, block_size=10)
+    _take(first, 2)
+    _take(second, 3)
+    first.close()
+    second.close()
+    # Повернуто залишки 1002–1009 (блок first) та 1013–1019 (блок second)
+
+    # Лічильник у CSV піднято вручну всередину другого залишку
+    raised = ProductCodeAllocator(path, "viatec", initial_code=1015, block_size=10)
+    codes = _take(raised, 8)
+    raised.close()
+
+    assert min(codes) >= 1015
+    assert codes == list(range(1015, 1023))
+    assert len(codes) == len(set(codes))
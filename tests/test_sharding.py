@@ -0,0 +1,133 @@
+"""
+Шардований прогін (suppliers/sharding.py): злиття файлів шардів, застовплення товарів, shard=i/N.
+
+    python -m pytest -q tests/test_sharding.py
+"""
+import codecs
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from suppliers.sharding import SqliteShardStore, merge_shards, parse_shard, shard_filename
+
+HEADER = "Код_товару;Назва_позиції;Ціна;Продукт_на_сайті\n"
+
+
+def _row(code, name, url):
+    return f"{code};{name};100,00;{url}\n"
+
+
+def _write_shard(output_dir, index, count, rows):
+    path = output_dir / shard_filename("viatec_retail.csv", (index, count))
+    path.write_text(HEADER + "".join(rows), encoding="utf-8-sig", newline="")
+    return path
+
+
+def test_merge_keeps_shard_order_and_drops_duplicates(tmp_path):
+    _write_shard(tmp_path, 0, 3, [
+        _row(1, "Камера A", "https://viatec.ua/product/a"),
+        _row(2, "Камера B", "https://viatec.ua/product/b"),
+    ])
+    _write_shard(tmp_path, 1, 3, [
+        _row(3, "Камера C", "https://viatec.ua/product/c"),
+        "\n",
+        # Той самий товар з категорії іншого шарду — лишається перший рядок
+        _row(4, "Камера B (дубль)", "https://viatec.ua/product/b"),
+    ])
+    _write_shard(tmp_path, 2, 3, [
+        _row(5, "Камера A (дубль)", "https://viatec.ua/product/a"),
+        _row(6, "Камера D", "https://viatec.ua/product/d"),
+    ])
+
+    assert merge_shards(tmp_path, "viatec_retail.csv", 3) == (4, 2)
+
+    content = (tmp_path / "viatec_retail.csv").read_bytes()
+    assert content.startswith(codecs.BOM_UTF8) and content.count(codecs.BOM_UTF8) == 1
+    lines = content.decode("utf-8-sig").splitlines(keepends=True)
+    assert lines == [
+        HEADER,
+        _row(1, "Камера A", "https://viatec.ua/product/a"),
+        _row(2, "Камера B", "https://viatec.ua/product/b"),
+        _row(3, "Камера C", "https://viatec.ua/product/c"),
+        _row(6, "Камера D", "https://viatec.ua/product/d"),
+    ]
+    assert not (tmp_path / "viatec_retail.csv.tmp").exists()
+
+
+def test_merge_requires_all_shards(tmp_path):
+    _write_shard(tmp_path, 0, 2, [_row(1, "Камера A", "https://viatec.ua/product/a")])
+    with pytest.raises(FileNotFoundError):
+        merge_shards(tmp_path, "viatec_retail.csv", 2)
+    assert not (tmp_path / "viatec_retail.csv").exists()
+
+
+def test_claim_is_exclusive_across_shards(tmp_path):
+    path = tmp_path / "shards.sqlite"
+    first = SqliteShardStore(path, "run1", "viatec_retail", 0)
+    second = SqliteShardStore(path, "run1", "viatec_retail", 1)
+    assert first.claim(-42)
+    assert not second.claim(-42)
+    assert second.claim(7)
+    # Повторне застовплення своїм шардом (продовження після -a resume=1) — товар лишається його
+    assert first.claim(-42)
+    assert second.claim(7)
+    # Інший прогін або паук — окремий простір
+    other_run = SqliteShardStore(path, "run2", "viatec_retail", 1)
+    assert other_run.claim(-42)
+    for store in (first, second, other_run):
+        store.close()
+
+
+def _shard_spider(tmp_path, shard, **kwargs):
+    from scrapy.settings import Settings
+    from suppliers.spiders.viatec.retail import ViatecRetailSpider
+
+    spider = ViatecRetailSpider(shard=shard, run_id="run1", **kwargs)
+    spider.settings = Settings({
+        "SHARD_STORE": str(tmp_path / "shards.sqlite"),
+        "FRONTIER_DIR": str(tmp_path / "frontier"),
+    })
+    return spider
+
+
+def test_resumed_shard_keeps_its_products(tmp_path):
+    product_url = "https://viatec.ua/product/ip-kamera-hikvision"
+    first = _shard_spider(tmp_path, "0/2")
+    category_url = first.category_urls[0]
+    first._enter_category(0)
+    first._queue_product(product_url, category_url)
+    assert len(first.product_frontier) == 1
+
+    # Зупинка посеред пагінації: товари категорії не вважаються обробленими
+    state = first.checkpoint_state()
+    assert state["phase"] == "pagination"
+    first.closed("shutdown")
+
+    resumed = _shard_spider(tmp_path, "0/2", resume="1")
+    list(resumed._resume_requests(state))
+    resumed._queue_product(product_url, category_url)
+    assert len(resumed.product_frontier) == 1
+    assert resumed.shard_skipped == 0
+
+    other = _shard_spider(tmp_path, "1/2")
+    other._queue_product(product_url, category_url)
+    assert len(other.product_frontier) == 0
+    assert other.shard_skipped == 1
+    for spider in (resumed, other):
+        spider.closed("finished")
+
+
+@pytest.mark.parametrize("value, expected", [("0/4", (0, 4)), ("3/4", (3, 4)), ("", None), (None, None)])
+def test_parse_shard(value, expected):
+    assert parse_shard(value) == expected
+
+
+@pytest.mark.parametrize("value", ["4/4", "-1/4", "1/0", "1", "a/b"])
+def test_parse_shard_rejects_invalid(value):
+    with pytest.raises(ValueError):
+        parse_shard(value)
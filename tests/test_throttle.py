@@ -0,0 +1,67 @@
+"""
+AdaptiveConcurrencyMiddleware (suppliers/throttle.py): стан контролера переживає перестворення слоту.
+
+    python -m pytest -q tests/test_throttle.py
+"""
+import logging
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from scrapy.core.downloader import Slot
+from scrapy.http import Request, Response
+from scrapy.settings import Settings
+
+PROJECT_ROOT = Path(__file__).parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from suppliers.throttle import AdaptiveConcurrencyMiddleware
+
+KEY = "viatec.ua"
+SPIDER = SimpleNamespace(logger=logging.getLogger("test_throttle"))
+
+
+def _middleware(slots, **settings):
+    crawler = SimpleNamespace(
+        settings=Settings({"ADAPTIVE_THROTTLE_MAX_CONCURRENCY": 8, **settings}),
+        engine=SimpleNamespace(downloader=SimpleNamespace(slots=slots)),
+    )
+    return AdaptiveConcurrencyMiddleware(crawler)
+
+
+def _respond(mw, status=200, headers=None):
+    request = Request(f"https://{KEY}/product/x", meta={"download_slot": KEY, "download_latency": 0.1})
+    mw.process_response(request, Response(request.url, status=status, headers=headers), SPIDER)
+
+
+def test_rebuilt_slot_gets_controller_values():
+    slots = {KEY: Slot(4, 0.5)}
+    mw = _middleware(slots, ADAPTIVE_THROTTLE_WINDOW=2)
+    _respond(mw)
+    _respond(mw)
+    state = mw.states[KEY]
+    assert state.delay < 0.5
+    assert (slots[KEY].concurrency, slots[KEY].delay) == (state.concurrency, state.delay)
+
+    # Scrapy прибрав неактивний слот і створив новий із налаштувань
+    slots[KEY] = Slot(4, 0.5)
+    _respond(mw)
+    assert (slots[KEY].concurrency, slots[KEY].delay) == (state.concurrency, state.delay)
+
+
+def test_rebuilt_slot_keeps_retry_after_pause():
+    slots = {KEY: Slot(4, 0.0)}
+    mw = _middleware(slots)
+    _respond(mw, status=429, headers={"Retry-After": "120"})
+    state = mw.states[KEY]
+    assert slots[KEY].delay == 120 and slots[KEY].concurrency == state.concurrency == 2
+
+    slots[KEY] = Slot(4, 0.0)
+    _respond(mw)
+    slot = slots[KEY]
+    assert slot.concurrency == state.concurrency
+    # Наступний запит нового слоту — не раніше кінця паузи
+    assert slot.lastseen + slot.delay >= state.cooldown_until - 0.01
+    assert state.cooldown_until > time.monotonic() + 100